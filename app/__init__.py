@@ -3,4 +3,10 @@ FastAPI AWS Integration Tutorial
 Progetto didattico per imparare l'integrazione con servizi AWS.
 """
 
+import time
+
 __version__ = "1.0.0"
+
+# Inizio dell'avvio (importato prima di ogni modulo dell'app): la fase
+# "import" dei tempi di avvio parte da qui
+IMPORT_STARTED = time.perf_counter()
@@ -0,0 +1,249 @@
+"""
+Client per AWS Secrets Manager con cache in memoria.
+I secrets vengono letti da AWS solo al primo accesso e poi aggiornati
+in background: le richieste leggono sempre dalla cache.
+"""
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CachedSecret:
+    data: dict
+    version_id: Optional[str]
+    fetched_at: float
+
+
+class SecretsClient:
+    """
+    Client per Secrets Manager con cache TTL e aggiornamento in background.
+
+    - Primo accesso a un secret: lettura sincrona da AWS (una sola per
+      secret anche con richieste concorrenti)
+    - Entro ttl_seconds: valore dalla cache
+    - Oltre ttl_seconds: restituisce subito il valore in cache e avvia un
+      aggiornamento in background (stale-while-revalidate)
+    - Aggiornamento: DescribeSecret per conoscere la versione AWSCURRENT;
+      GetSecretValue solo se la versione è cambiata (rotazione). In quel
+      caso vengono chiamati i listener registrati con subscribe()
+
+    Thread-safe: può essere usato da più thread e richieste contemporanee.
+    """
+
+    def __init__(self, region: str, ttl_seconds: float = 300.0):
+        """
+        Inizializza il client.
+
+        Args:
+            region: AWS region (es. 'eu-west-1')
+            ttl_seconds: Età oltre la quale un secret in cache viene aggiornato
+        """
+        # Import qui: boto3 è lento da importare e serve solo da questo punto
+        import boto3
+        self.client = boto3.client('secretsmanager', region_name=region)
+        self.ttl_seconds = ttl_seconds
+
+        self._cache: Dict[str, _CachedSecret] = {}
+        self._listeners: Dict[str, List[Callable[[dict], None]]] = {}
+        self._lock = threading.Lock()
+        # Un lock per secret: una sola lettura da AWS alla volta per secret
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        self._refreshing: set = set()
+
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+
+        logger.info(f"SecretsClient inizializzato in region: {region}")
+
+    def get_secret(self, secret_name: str, use_cache: bool = True) -> dict:
+        """
+        Recupera un secret (JSON) come dizionario.
+
+        Args:
+            secret_name: Nome o ARN del secret
+            use_cache: Se False legge sempre da AWS e aggiorna la cache
+
+        Returns:
+            Dizionario con i valori del secret (da non modificare)
+
+        Raises:
+            ClientError: Se il secret non esiste o non è accessibile
+            ValueError: Se il secret non è JSON
+        """
+        cached = self._cache.get(secret_name)
+        if use_cache and cached is not None:
+            if time.monotonic() - cached.fetched_at >= self.ttl_seconds:
+                self._refresh_in_background(secret_name)
+            return cached.data
+
+        with self._fetch_lock(secret_name):
+            # Un'altra richiesta potrebbe averlo appena caricato
+            cached = self._cache.get(secret_name)
+            if use_cache and cached is not None:
+                return cached.data
+            return self._load(secret_name).data
+
+    def get_secret_value(self, secret_name: str, key: str, default: Any = None) -> Any:
+        """
+        Recupera un singolo valore di un secret.
+
+        Args:
+            secret_name: Nome o ARN del secret
+            key: Chiave del valore nel JSON del secret
+            default: Valore se la chiave non esiste
+
+        Returns:
+            Il valore, o default
+        """
+        return self.get_secret(secret_name).get(key, default)
+
+    def subscribe(self, secret_name: str, callback: Callable[[dict], None]):
+        """
+        Registra una funzione chiamata con i nuovi valori quando il secret
+        cambia versione (es. dopo una rotazione). Viene chiamata dal thread
+        di aggiornamento.
+        """
+        with self._lock:
+            self._listeners.setdefault(secret_name, []).append(callback)
+
+    def refresh(self, secret_name: str) -> bool:
+        """
+        Controlla subito se il secret ha una nuova versione e in quel caso
+        la carica.
+
+        Args:
+            secret_name: Nome o ARN del secret
+
+        Returns:
+            True se è stata caricata una nuova versione
+
+        Raises:
+            ClientError: Se Secrets Manager non è raggiungibile
+        """
+        with self._fetch_lock(secret_name):
+            cached = self._cache.get(secret_name)
+            if cached is None:
+                self._load(secret_name)
+                return True
+
+            response = self.client.describe_secret(SecretId=secret_name)
+            current = next(
+                (
+                    version_id
+                    for version_id, stages in response.get('VersionIdsToStages', {}).items()
+                    if 'AWSCURRENT' in stages
+                ),
+                None
+            )
+
+            if current is not None and current == cached.version_id:
+                cached.fetched_at = time.monotonic()
+                return False
+
+            old_version = cached.version_id
+            entry = self._load(secret_name)
+
+        if entry.version_id == old_version:
+            return False
+
+        logger.info(f"Secret '{secret_name}' aggiornato alla versione {entry.version_id}")
+        with self._lock:
+            listeners = list(self._listeners.get(secret_name, []))
+        for callback in listeners:
+            try:
+                callback(entry.data)
+            except Exception as e:
+                logger.error(f"Errore nel listener del secret '{secret_name}': {e}")
+        return True
+
+    def start_refresh(self, interval_seconds: float):
+        """
+        Avvia un thread che controlla periodicamente la versione di tutti
+        i secrets in cache, così le richieste non trovano mai valori scaduti.
+
+        Args:
+            interval_seconds: Intervallo tra due controlli (0 = disattivato)
+        """
+        if interval_seconds <= 0 or self._refresher is not None:
+            return
+        self._stop.clear()
+        self._refresher = threading.Thread(
+            target=self._run, args=(interval_seconds,), name="secrets-refresh", daemon=True
+        )
+        self._refresher.start()
+        logger.info(f"Aggiornamento secrets in background ogni {interval_seconds}s")
+
+    def close(self):
+        """Ferma il thread di aggiornamento."""
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=5)
+            self._refresher = None
+
+    def _run(self, interval_seconds: float):
+        while not self._stop.wait(interval_seconds):
+            for secret_name in list(self._cache):
+                self._safe_refresh(secret_name)
+
+    def _refresh_in_background(self, secret_name: str):
+        with self._lock:
+            if secret_name in self._refreshing:
+                return
+            self._refreshing.add(secret_name)
+        threading.Thread(
+            target=self._safe_refresh, args=(secret_name,), name="secrets-refresh-once", daemon=True
+        ).start()
+
+    def _safe_refresh(self, secret_name: str):
+        try:
+            self.refresh(secret_name)
+        except Exception as e:
+            # Si continua a usare il valore in cache; nuovo tentativo al prossimo giro
+            logger.warning(f"Aggiornamento del secret '{secret_name}' fallito: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(secret_name)
+
+    def _fetch_lock(self, secret_name: str) -> threading.Lock:
+        with self._lock:
+            return self._fetch_locks.setdefault(secret_name, threading.Lock())
+
+    def _load(self, secret_name: str) -> _CachedSecret:
+        """Legge il secret da AWS e lo salva in cache (chiamare con il fetch lock)."""
+        try:
+            response = self.client.get_secret_value(SecretId=secret_name)
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+
+            if error_code == 'ResourceNotFoundException':
+                logger.error(f"Secret '{secret_name}' non trovato")
+            elif error_code == 'AccessDeniedException':
+                logger.error("Accesso negato. Verifica IAM permissions")
+            else:
+                logger.error(f"Errore nel recupero del secret '{secret_name}': {error_code}")
+            raise
+
+        if 'SecretString' not in response:
+            raise ValueError(f"Il secret '{secret_name}' non è in formato JSON")
+        try:
+            data = json.loads(response['SecretString'])
+        except json.JSONDecodeError:
+            raise ValueError(f"Il secret '{secret_name}' non è in formato JSON")
+
+        entry = _CachedSecret(
+            data=data,
+            version_id=response.get('VersionId'),
+            fetched_at=time.monotonic()
+        )
+        self._cache[secret_name] = entry
+        logger.info(f"Secret '{secret_name}' caricato (versione {entry.version_id})")
+        return entry
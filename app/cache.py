@@ -0,0 +1,180 @@
+"""
+Cache in-process per le letture degli items.
+Cache LRU con TTL, usata davanti a DynamoDBClient.get_item.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Valore salvato per gli items che non esistono (cache negativa)
+_MISSING = object()
+
+
+class ItemCache:
+    """
+    Cache LRU con scadenza (TTL) per gli items.
+
+    - Quando la cache è piena viene eliminato l'item usato meno di recente
+    - Gli items inesistenti vengono ricordati per un tempo più breve
+      (cache negativa), così le richieste ripetute per ID inesistenti
+      non arrivano alla tabella
+    - Le letture iniziate prima di una scrittura sullo stesso item non
+      possono salvare in cache il valore vecchio (vedi generation/fill)
+
+    La cache è locale al processo: istanze diverse possono vedere
+    lo stesso item con un ritardo massimo pari al TTL.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 30.0,
+                 negative_ttl_seconds: float = 5.0):
+        """
+        Inizializza la cache.
+
+        Args:
+            max_size: Numero massimo di items in cache
+            ttl_seconds: Durata in cache di un item
+            negative_ttl_seconds: Durata in cache di un item inesistente
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+
+        self._entries: "OrderedDict[Hashable, Tuple[float, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Generazione incrementata a ogni scrittura; per ogni chiave
+        # ricorda la generazione dell'ultima scrittura
+        self._generation = 0
+        self._last_write: "OrderedDict[Hashable, int]" = OrderedDict()
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        logger.info(
+            f"ItemCache inizializzata: max {max_size} items, TTL {ttl_seconds}s, "
+            f"TTL negativo {negative_ttl_seconds}s"
+        )
+
+    def get(self, key: Hashable) -> Tuple[bool, Optional[Dict]]:
+        """
+        Cerca un item in cache.
+
+        Returns:
+            Tupla (hit, item): se hit è True e item è None,
+            l'item è noto come inesistente
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            if value is _MISSING:
+                self.negative_hits += 1
+                return True, None
+
+            self.hits += 1
+            return True, value
+
+    def generation(self) -> int:
+        """Generazione corrente, da leggere prima di iniziare una lettura dalla tabella."""
+        with self._lock:
+            return self._generation
+
+    def fill(self, key: Hashable, item: Optional[Dict], generation: int):
+        """
+        Salva in cache il risultato di una lettura dalla tabella.
+        Se l'item è stato scritto o eliminato dopo l'inizio della lettura,
+        il risultato è già vecchio e non viene salvato.
+
+        Args:
+            key: ID dell'item
+            item: Item letto, o None se non esiste
+            generation: Valore di generation() letto prima della lettura
+        """
+        with self._lock:
+            if self._last_write.get(key, 0) > generation:
+                return
+            if item is None:
+                self._store(key, _MISSING, self.negative_ttl_seconds)
+            else:
+                self._store(key, item, self.ttl_seconds)
+
+    def put(self, key: Hashable, item: Dict):
+        """Salva in cache un item appena scritto (write-through)."""
+        with self._lock:
+            self._record_write(key)
+            self._store(key, item, self.ttl_seconds)
+
+    def update(self, key: Hashable, item: Dict):
+        """
+        Registra la scrittura di un item: il valore in cache viene aggiornato
+        solo se l'item è già in cache, altrimenti sarà la prima lettura a
+        salvarlo. Così le creazioni in blocco non spingono fuori dalla cache
+        gli items letti di frequente.
+        """
+        with self._lock:
+            self._record_write(key)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not _MISSING:
+                self._store(key, item, self.ttl_seconds)
+            else:
+                self._entries.pop(key, None)
+
+    def invalidate(self, key: Hashable):
+        """Rimuove un item dalla cache (es. dopo un'eliminazione)."""
+        with self._lock:
+            self._record_write(key)
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Svuota la cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Contatori della cache, per dimensionarla."""
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def _store(self, key: Hashable, value: object, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _record_write(self, key: Hashable):
+        self._generation += 1
+        self._last_write[key] = self._generation
+        self._last_write.move_to_end(key)
+        # Basta ricordare le scritture recenti: le letture durano pochi secondi
+        while len(self._last_write) > self.max_size:
+            self._last_write.popitem(last=False)
@@ -0,0 +1,70 @@
+"""
+Coalescing delle richieste concorrenti (single-flight).
+Più richieste contemporanee per la stessa chiave condividono
+un'unica chiamata al database.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Esegue una sola chiamata per chiave alla volta.
+
+    La prima richiesta per una chiave avvia la chiamata; le richieste che
+    arrivano mentre è in corso ne attendono il risultato (o l'errore)
+    invece di avviarne un'altra. Da usare solo dall'event loop.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Esegue func() per la chiave, o si unisce alla chiamata già in corso.
+
+        Args:
+            key: Chiave della richiesta (es. item_id)
+            func: Funzione async che esegue la chiamata vera e propria
+
+        Returns:
+            Risultato di func() (lo stesso oggetto per tutte le richieste unite)
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+        else:
+            self.shared += 1
+
+        # shield: se una richiesta viene cancellata (es. client disconnesso)
+        # la chiamata continua per le altre richieste in attesa
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable):
+        """
+        Dimentica la chiamata in corso per la chiave (es. dopo una scrittura):
+        le richieste successive ne avviano una nuova.
+        """
+        self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        """Chiamate eseguite e richieste servite da una chiamata già in corso."""
+        return {"calls": self.calls, "shared": self.shared, "inflight": len(self._inflight)}
+
+    def _done(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Segna l'eccezione come letta anche se nessuno era più in attesa
+        if not task.cancelled():
+            task.exception()
@@ -3,7 +3,7 @@ Configurazione centralizzata dell'applicazione.
 Gestisce variabili d'ambiente e secrets AWS.
 """
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -15,12 +15,121 @@ class Settings(BaseSettings):
     # AWS Configuration
     aws_region: str = "eu-west-1"
     dynamodb_table_name: str = "fastapi-tutorial-items"
+    # Indice dei tag per GET /items?tag=... (None = ricerca con scansione)
+    dynamodb_tag_table_name: Optional[str] = None
+    # GSI per data di creazione (None = query con scansione) e numero di
+    # partizioni del GSI (non ridurlo dopo aver scritto items)
+    dynamodb_created_index_name: Optional[str] = None
+    created_index_shards: int = 4
     secret_name: str = "fastapi-tutorial-secrets"
+    # Cache dei secrets: età massima e controllo delle nuove versioni (0 = mai)
+    secret_cache_ttl_seconds: float = 300.0
+    secret_refresh_interval_seconds: float = 60.0
+    
+    # Storage degli items: dynamodb, memory (in memoria) o sqlite (file locale)
+    storage_backend: Literal["dynamodb", "memory", "sqlite"] = "dynamodb"
+    sqlite_path: str = "items.db"
+    
+    # DynamoDB Performance
+    # Chiamate DynamoDB eseguite in parallelo da ogni worker
+    dynamodb_max_workers: int = 16
+    # Segmenti letti in parallelo nelle scansioni (1 = scansione sequenziale).
+    # Ogni segmento è una chiamata Scan con il proprio costo minimo in RCU:
+    # conviene solo su tabelle grandi
+    scan_segments: int = 1
+    # Items letti per pagina durante l'export
+    export_page_size: int = 1000
+    # Richieste batch: items massimi per richiesta e tentativi per UnprocessedItems
+    batch_max_items: int = 1000
+    batch_max_retries: int = 5
+    
+    # Cache in-process delle letture per ID: con più worker (WEB_CONCURRENCY)
+    # ognuno ha la propria cache e le invalidazioni non sono condivise
+    item_cache_enabled: bool = False
+    item_cache_max_size: int = 10000
+    item_cache_ttl_seconds: float = 30.0
+    # Durata in cache degli ID inesistenti (404)
+    item_cache_negative_ttl_seconds: float = 5.0
+    # Letture concorrenti dello stesso ID condividono una sola chiamata DynamoDB
+    item_coalescing_enabled: bool = True
+    
+    # Micro-batching delle creazioni (POST /items) con BatchWriteItem
+    write_coalescing_enabled: bool = False
+    write_flush_interval_ms: float = 10.0
+    write_max_batch_size: int = 25
+    write_queue_max_size: int = 1000
+    
+    # Paginazione
+    max_page_size: int = 1000
+    # Chiave HMAC dei token di paginazione (uguale su tutte le istanze)
+    pagination_token_secret: Optional[str] = None
+    # Tag massimi in una ricerca GET /items?tag=...
+    max_query_tags: int = 10
+    # Serializzazione delle risposte con items: off (modelli Pydantic),
+    # validate (una validazione per risposta) o trust (nessuna validazione)
+    fast_serialization: Literal["off", "validate", "trust"] = "off"
+    
+    # Health check in background (secondi)
+    health_check_interval_seconds: float = 10.0
+    # Oltre questa età l'ultimo risultato non è più considerato valido
+    health_check_max_staleness_seconds: float = 30.0
+    health_check_timeout_seconds: float = 5.0
+    
+    # Avvio: attesa massima dei secrets (poi l'avvio continua e i secrets sono
+    # applicati quando arrivano) e della creazione del backend di storage
+    startup_secrets_timeout_seconds: float = 5.0
+    startup_storage_timeout_seconds: float = 30.0
+    
+    # Metriche Prometheus su GET /metrics
+    metrics_enabled: bool = True
+    # Label worker="<pid>" su ogni serie (attivata da app.server con più
+    # worker: i contatori sono per processo)
+    metrics_worker_label: bool = False
+    
+    # Compressione delle risposte (gzip, brotli se installato) oltre
+    # compression_min_size byte
+    compression_enabled: bool = True
+    compression_min_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    
+    # Server di produzione (python -m app.server)
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    # Processi worker (0 = uno per CPU disponibile nel container)
+    web_concurrency: int = 0
+    # Keep-alive delle connessioni inattive: maggiore dell'idle timeout
+    # del proxy davanti all'app, altrimenti il proxy riusa connessioni chiuse
+    server_keepalive_seconds: int = 75
+    # Attesa massima delle richieste in corso all'arresto di un worker
+    server_graceful_timeout_seconds: int = 30
+    # Riciclo dei worker dopo N richieste (0 = mai), con jitter casuale
+    # perché non si riavviino tutti insieme
+    server_max_requests: int = 0
+    server_max_requests_jitter: int = 0
+    # Chiave dei token di paginazione condivisa dai worker dello stesso
+    # container, generata da app/server.py se non c'è una chiave configurata
+    server_shared_secret: Optional[str] = None
     
     # Application Configuration
     app_name: str = "FastAPI AWS Tutorial"
     debug: bool = False
     
+    # Logging delle richieste: frazione delle richieste riuscite da loggare
+    # (errori e richieste lente sono sempre loggati)
+    log_sample_rate: float = 1.0
+    slow_request_threshold_ms: float = 1000.0
+    # Logging asincrono: i record passano da una coda limitata
+    # e vengono scritti da un thread dedicato
+    log_async: bool = False
+    log_queue_size: int = 10000
+    log_queue_overflow: Literal["drop_newest", "drop_oldest", "block"] = "drop_newest"
+    # Formatter JSON veloce (stesso output di quello standard)
+    log_fast_formatter: bool = False
+    # Con il formatter veloce: JSON compatto e caratteri non ASCII non
+    # escapati (formato diverso), serializzato con orjson se installato
+    log_compact_json: bool = False
+    
     # Secret values (caricati a runtime da Secrets Manager)
     api_key: Optional[str] = None
     database_encryption_key: Optional[str] = None
@@ -42,6 +151,7 @@ class Settings(BaseSettings):
             "debug": self.debug,
             "api_key": "***" if self.api_key else None,
             "database_encryption_key": "***" if self.database_encryption_key else None,
+            "pagination_token_secret": "***" if self.pagination_token_secret else None,
         }
         return config
 
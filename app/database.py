@@ -1,87 +1,355 @@
 """
 Client per AWS DynamoDB.
 Gestisce operazioni CRUD sulla tabella items.
+AsyncDynamoDBClient espone in modo asincrono qualsiasi backend di storage
+(vedi app.storage).
 """
+import asyncio
+import functools
 import logging
-from datetime import datetime
-from typing import Optional, List, Dict
-from uuid import uuid4
-import boto3
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+# boto3 e botocore.config sono importati solo quando servono (vedi
+# DynamoDBClient): importarli costa più di 100 ms all'avvio
 from botocore.exceptions import ClientError
 
+from app.cache import ItemCache
+from app.coalescing import SingleFlight
+from app.metrics import record_consumed_capacity, track_operation
+from app.storage.base import (
+    BATCH_GET_MAX_KEYS,
+    BATCH_WRITE_MAX_ITEMS,
+    ItemAlreadyExistsException,
+    ItemNotFoundException,
+    SegmentScanResult,
+    StorageBackend,
+    created_filter,
+    created_key,
+    created_page,
+    project,
+    segment_of,
+    with_fields,
+)
+from app.write_queue import WriteBehindQueue
+
 
 logger = logging.getLogger(__name__)
 
+# Stato di un segmento in una scansione parallela a pagine:
+# None = non ancora iniziato, dict = LastEvaluatedKey da cui riprendere,
+# SEGMENT_DONE = segmento letto completamente
+SEGMENT_DONE = False
 
-class ItemNotFoundException(Exception):
-    """Eccezione sollevata quando un item non viene trovato."""
-    pass
 
+def _projection(fields: Optional[List[str]]) -> Dict:
+    """
+    Parametri ProjectionExpression per leggere solo alcuni attributi
+    (sempre incluso item_id). I nomi passano da ExpressionAttributeNames
+    perché alcuni sono parole riservate di DynamoDB (es. name).
+    """
+    fields = with_fields(fields, 'item_id')
+    if fields is None:
+        return {}
+    # Prefisso diverso da quello usato da boto3 per le condizioni (#n0...)
+    names = {f'#p{i}': name for i, name in enumerate(fields)}
+    return {
+        'ProjectionExpression': ', '.join(names),
+        'ExpressionAttributeNames': names,
+    }
 
-class DynamoDBClient:
+
+def _retry_unprocessed(
+    call: Callable[[List], List],
+    pending: List,
+    max_retries: int,
+    operation: str = "BatchWriteItem"
+) -> List:
+    """
+    Invia le richieste di un batch e ritenta quelle non processate da
+    DynamoDB (es. per throttling) con backoff esponenziale e jitter:
+    50ms, 100ms, 200ms... (max 2s).
+    
+    Args:
+        call: Invia una lista di richieste e restituisce quelle non processate
+        pending: Richieste da inviare
+        max_retries: Numero massimo di nuovi tentativi
+        operation: Nome dell'operazione per i log
+    
+    Returns:
+        Richieste non processate dopo tutti i tentativi (vuota se tutto ok)
+    """
+    attempt = 0
+    while pending:
+        pending = call(pending)
+        if not pending or attempt >= max_retries:
+            break
+        
+        delay = random.uniform(0, min(2.0, 0.05 * 2 ** attempt))
+        attempt += 1
+        logger.warning(
+            f"{operation}: {len(pending)} richieste non processate, "
+            f"nuovo tentativo {attempt}/{max_retries} tra {delay:.2f}s"
+        )
+        time.sleep(delay)
+    return pending
+
+
+@dataclass
+class ParallelScanResult:
+    """Risultato di una scansione parallela (items di tutti i segmenti)."""
+    items: List[Dict]
+    positions: List
+    segments: List[SegmentScanResult] = field(default_factory=list)
+    duration_ms: float = 0.0
+    
+    @property
+    def done(self) -> bool:
+        """True se tutti i segmenti sono stati letti completamente."""
+        return all(position is SEGMENT_DONE for position in self.positions)
+
+
+class DynamoDBClient(StorageBackend):
     """
     Client per operazioni CRUD su DynamoDB.
     Gestisce la tabella degli items con retry logic e error handling.
+    
+    I metodi sono sincroni (boto3) ma thread-safe: ogni thread usa la propria
+    resource boto3, quindi il client può essere condiviso da un pool di thread
+    (vedi AsyncDynamoDBClient).
     """
     
-    def __init__(self, table_name: str, region: str):
+    def __init__(
+        self,
+        table_name: str,
+        region: str,
+        max_pool_connections: int = 10,
+        tag_table_name: Optional[str] = None,
+        created_index_name: Optional[str] = None,
+        created_index_shards: int = 4
+    ):
         """
         Inizializza il client DynamoDB.
         
         Args:
             table_name: Nome della tabella DynamoDB
             region: AWS region (es. 'eu-west-1')
+            max_pool_connections: Connessioni HTTP massime verso DynamoDB per thread
+            tag_table_name: Tabella dell'indice dei tag (chiave tag + item_id);
+                se None le ricerche per tag scansionano la tabella degli items
+            created_index_name: GSI per data di creazione (chiave created_shard
+                + created_at); se None le query per data scansionano la tabella
+            created_index_shards: Partizioni del GSI: ogni item va in una
+                partizione in base all'ID, così le scritture non si
+                concentrano su una sola chiave. Non va ridotto dopo aver
+                scritto items (quelli nelle partizioni oltre il nuovo numero
+                non verrebbero più letti)
         """
         self.table_name = table_name
+        self.tag_table_name = tag_table_name
+        self.created_index_name = created_index_name
+        self.created_index_shards = max(1, created_index_shards)
         self.region = region
+        from botocore.config import Config
+        self._config = Config(max_pool_connections=max_pool_connections)
         
-        # Usa boto3 resource per operazioni semplificate
-        dynamodb = boto3.resource('dynamodb', region_name=region)
-        self.table = dynamodb.Table(table_name)
+        # Le resource boto3 non sono thread-safe: ne creiamo una per thread
+        self._local = threading.local()
         
         logger.info(f"DynamoDBClient inizializzato per tabella: {table_name} in region: {region}")
+        if not tag_table_name:
+            logger.warning("Indice dei tag non configurato: le ricerche per tag scansionano la tabella")
+    
+    @property
+    def has_tag_index(self) -> bool:
+        return bool(self.tag_table_name)
+    
+    def _resource(self):
+        """Resource boto3 DynamoDB del thread corrente."""
+        dynamodb = getattr(self._local, 'dynamodb', None)
+        if dynamodb is None:
+            # Usa boto3 resource per operazioni semplificate
+            import boto3
+            session = boto3.session.Session(region_name=self.region)
+            dynamodb = session.resource('dynamodb', config=self._config)
+            self._local.dynamodb = dynamodb
+        return dynamodb
     
-    def create_item(self, item_data: dict) -> str:
+    @property
+    def table(self):
+        """
+        Tabella DynamoDB (boto3 resource) del thread corrente.
+        Creata alla prima richiesta del thread e poi riutilizzata.
+        """
+        table = getattr(self._local, 'table', None)
+        if table is None:
+            table = self._resource().Table(self.table_name)
+            self._local.table = table
+        return table
+    
+    @property
+    def tag_table(self):
+        """Tabella dell'indice dei tag del thread corrente."""
+        tag_table = getattr(self._local, 'tag_table', None)
+        if tag_table is None:
+            tag_table = self._resource().Table(self.tag_table_name)
+            self._local.tag_table = tag_table
+        return tag_table
+    
+    def _with_shard(self, item: Dict) -> Dict:
+        """
+        Record da scrivere: l'item più la partizione del GSI per data di
+        creazione (scritta sempre, così il GSI può essere aggiunto in seguito).
+        L'attributo non fa parte delle risposte (vedi ItemResponse).
+        """
+        return {**item, 'created_shard': segment_of(item['item_id'], self.created_index_shards)}
+    
+    @track_operation("create_item")
+    def create_item(self, item_data: dict) -> Dict:
         """
         Crea un nuovo item nella tabella DynamoDB.
         
+        La scrittura è condizionata a attribute_not_exists(item_id), quindi
+        non sovrascrive mai un item esistente; l'item scritto viene restituito
+        direttamente, senza una seconda lettura. Con l'indice dei tag, item e
+        voci dell'indice sono scritti insieme da una TransactWriteItems.
+        
         Args:
             item_data: Dizionario con i dati dell'item (name, description, tags)
         
         Returns:
-            ID univoco dell'item creato
+            Dizionario con i dati dell'item creato (incluso item_id)
         
         Raises:
+            ItemAlreadyExistsException: Se esiste già un item con lo stesso ID
             ClientError: Se si verifica un errore durante la scrittura
         """
-        item_id = str(uuid4())
-        timestamp = datetime.utcnow().isoformat()
-        
-        item = {
-            'item_id': item_id,
-            'name': item_data['name'],
-            'description': item_data.get('description'),
-            'tags': item_data.get('tags', []),
-            'created_at': timestamp,
-            'updated_at': timestamp
-        }
+        item = self.build_item(item_data)
+        item_id = item['item_id']
         
         try:
-            self.table.put_item(Item=item)
+            if self.tag_table_name and item['tags']:
+                response = self._put_with_tags(item)
+            else:
+                response = self.table.put_item(
+                    Item=self._with_shard(item),
+                    ConditionExpression='attribute_not_exists(item_id)',
+                    ReturnConsumedCapacity='TOTAL'
+                )
+            record_consumed_capacity('create_item', response.get('ConsumedCapacity'), write=True)
             logger.info(f"Item creato con successo: {item_id}")
-            return item_id
-            
+            return item
+        
         except ClientError as e:
             error_code = e.response['Error']['Code']
+            if error_code == 'TransactionCanceledException':
+                # Il motivo è quello della prima azione (la Put dell'item)
+                reasons = e.response.get('CancellationReasons') or [{}]
+                if reasons[0].get('Code') == 'ConditionalCheckFailed':
+                    error_code = 'ConditionalCheckFailedException'
+            
+            if error_code == 'ConditionalCheckFailedException':
+                logger.error(f"Item già esistente: {item_id}")
+                raise ItemAlreadyExistsException(f"Item con ID '{item_id}' già esistente")
+            
             logger.error(f"Errore nella creazione dell'item: {error_code} - {e}")
             raise
     
-    def get_item(self, item_id: str) -> Optional[Dict]:
+    def _put_with_tags(self, item: Dict) -> Dict:
+        """
+        Scrive l'item (se non esiste) e le sue voci dell'indice dei tag con
+        una sola TransactWriteItems: una chiamata, e nessuna voce dell'indice
+        resta senza item se la scrittura fallisce. Una transazione consuma il
+        doppio delle WCU di una PutItem.
+        
+        Returns:
+            Risposta di TransactWriteItems
+        
+        Raises:
+            ClientError: TransactionCanceledException se una condizione fallisce
+        """
+        # Il client della resource converte i valori Python nel formato DynamoDB
+        actions = [{'Put': {
+            'TableName': self.table_name,
+            'Item': self._with_shard(item),
+            'ConditionExpression': 'attribute_not_exists(item_id)',
+        }}]
+        actions.extend(
+            {'Put': {'TableName': self.tag_table_name, 'Item': {'tag': tag, 'item_id': item['item_id']}}}
+            for tag in sorted(set(item['tags']))
+        )
+        return self.table.meta.client.transact_write_items(
+            TransactItems=actions,
+            ReturnConsumedCapacity='TOTAL'
+        )
+    
+    @track_operation("write_batch")
+    def write_batch(self, items: List[Dict], max_retries: int = 5) -> List[Dict]:
+        """
+        Scrive fino a 25 items con una richiesta BatchWriteItem.
+        Gli UnprocessedItems (es. per throttling) vengono ritentati con
+        backoff esponenziale e jitter.
+        
+        Args:
+            items: Record completi da scrivere (vedi build_item)
+            max_retries: Numero massimo di tentativi per gli items non processati
+        
+        Returns:
+            Lista degli items non scritti dopo tutti i tentativi (vuota se tutto ok)
+        
+        Raises:
+            ValueError: Se gli items sono più di 25
+            ClientError: Se la richiesta BatchWriteItem fallisce
+        """
+        if len(items) > BATCH_WRITE_MAX_ITEMS:
+            raise ValueError(f"Massimo {BATCH_WRITE_MAX_ITEMS} items per BatchWriteItem")
+        
+        not_indexed = []
+        if self.tag_table_name:
+            # Gli items il cui indice dei tag non è stato scritto non vengono
+            # scritti e sono restituiti come non processati
+            failed_ids = self._write_tag_index(items, max_retries)
+            not_indexed = [item for item in items if item['item_id'] in failed_ids]
+            items = [item for item in items if item['item_id'] not in failed_ids]
+        
+        def send(requests: List[Dict]) -> List[Dict]:
+            response = self.table.meta.client.batch_write_item(
+                RequestItems={self.table_name: requests},
+                ReturnConsumedCapacity='TOTAL'
+            )
+            record_consumed_capacity('write_batch', response.get('ConsumedCapacity'), write=True)
+            return response.get('UnprocessedItems', {}).get(self.table_name, [])
+        
+        try:
+            requests = _retry_unprocessed(
+                send,
+                [{'PutRequest': {'Item': self._with_shard(item)}} for item in items],
+                max_retries
+            )
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            logger.error(f"Errore nella scrittura batch: {error_code} - {e}")
+            raise
+        
+        unprocessed_ids = {request['PutRequest']['Item']['item_id'] for request in requests}
+        unprocessed = not_indexed + [item for item in items if item['item_id'] in unprocessed_ids]
+        logger.info(
+            f"Batch scritto: {len(items) + len(not_indexed) - len(unprocessed)} items creati, "
+            f"{len(unprocessed)} non processati"
+        )
+        return unprocessed
+    
+    @track_operation("get_item")
+    def get_item(self, item_id: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
         """
         Recupera un item dalla tabella per ID.
         
         Args:
             item_id: ID dell'item da recuperare
+            fields: Attributi da leggere (None = tutti)
         
         Returns:
             Dizionario con i dati dell'item, o None se non trovato
@@ -91,7 +359,12 @@ class DynamoDBClient:
             ClientError: Se si verifica un errore durante la lettura
         """
         try:
-            response = self.table.get_item(Key={'item_id': item_id})
+            response = self.table.get_item(
+                Key={'item_id': item_id},
+                ReturnConsumedCapacity='TOTAL',
+                **_projection(fields)
+            )
+            record_consumed_capacity('get_item', response.get('ConsumedCapacity'))
             
             if 'Item' not in response:
                 logger.warning(f"Item non trovato: {item_id}")
@@ -99,7 +372,7 @@ class DynamoDBClient:
             
             logger.info(f"Item recuperato con successo: {item_id}")
             return response['Item']
-            
+        
         except ClientError as e:
             error_code = e.response['Error']['Code']
             
@@ -110,26 +383,96 @@ class DynamoDBClient:
                 logger.error(f"Errore nel recupero dell'item {item_id}: {error_code} - {e}")
                 raise
     
-    def list_items(self, limit: int = 100) -> List[Dict]:
+    @track_operation("get_batch")
+    def get_batch(
+        self,
+        item_ids: List[str],
+        max_retries: int = 5,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, Dict], List[str]]:
         """
-        Lista tutti gli items nella tabella.
+        Recupera fino a 100 items con una richiesta BatchGetItem.
+        Le UnprocessedKeys vengono ritentate con backoff esponenziale e jitter.
+        
+        Args:
+            item_ids: ID degli items da recuperare (senza duplicati)
+            max_retries: Numero massimo di tentativi per le chiavi non processate
+            fields: Attributi da leggere (None = tutti)
+        
+        Returns:
+            Tupla (found, unprocessed): found mappa item_id -> item per gli
+            items trovati; unprocessed contiene gli ID non letti dopo tutti
+            i tentativi. Gli ID assenti da entrambi non esistono.
+        
+        Raises:
+            ValueError: Se gli ID sono più di 100
+            ClientError: Se la richiesta BatchGetItem fallisce
+        """
+        if len(item_ids) > BATCH_GET_MAX_KEYS:
+            raise ValueError(f"Massimo {BATCH_GET_MAX_KEYS} chiavi per BatchGetItem")
+        
+        found = {}
+        projection = _projection(fields)
+        
+        def send(keys: List[Dict]) -> List[Dict]:
+            # La proiezione va ripetuta a ogni tentativo
+            response = self.table.meta.client.batch_get_item(
+                RequestItems={self.table_name: {'Keys': keys, **projection}},
+                ReturnConsumedCapacity='TOTAL'
+            )
+            record_consumed_capacity('get_batch', response.get('ConsumedCapacity'))
+            for item in response.get('Responses', {}).get(self.table_name, []):
+                found[item['item_id']] = item
+            return response.get('UnprocessedKeys', {}).get(self.table_name, {}).get('Keys', [])
+        
+        try:
+            keys = _retry_unprocessed(
+                send, [{'item_id': item_id} for item_id in item_ids], max_retries, "BatchGetItem"
+            )
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            logger.error(f"Errore nella lettura batch: {error_code} - {e}")
+            raise
+        
+        unprocessed = [key['item_id'] for key in keys]
+        logger.info(f"Batch letto: {len(found)} items trovati su {len(item_ids)} richiesti")
+        return found, unprocessed
+    
+    @track_operation("list_items")
+    def list_items(
+        self,
+        limit: int = 100,
+        exclusive_start_key: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], Optional[Dict]]:
+        """
+        Lista una pagina di items della tabella.
         
         Args:
             limit: Numero massimo di items da restituire
+            exclusive_start_key: Chiave da cui riprendere la scansione
+                (LastEvaluatedKey della pagina precedente)
+            fields: Attributi da leggere (None = tutti)
         
         Returns:
-            Lista di dizionari con i dati degli items
+            Tupla (items, last_evaluated_key); last_evaluated_key è None
+            se la tabella è stata letta completamente
         
         Raises:
             ClientError: Se si verifica un errore durante la scansione
         """
+        scan_kwargs = {'Limit': limit, 'ReturnConsumedCapacity': 'TOTAL', **_projection(fields)}
+        if exclusive_start_key:
+            scan_kwargs['ExclusiveStartKey'] = exclusive_start_key
+        
         try:
-            response = self.table.scan(Limit=limit)
+            response = self.table.scan(**scan_kwargs)
+            record_consumed_capacity('list_items', response.get('ConsumedCapacity'))
             items = response.get('Items', [])
             
             logger.info(f"Recuperati {len(items)} items dalla tabella")
-            return items
-            
+            return items, response.get('LastEvaluatedKey')
+        
         except ClientError as e:
             error_code = e.response['Error']['Code']
             
@@ -140,35 +483,374 @@ class DynamoDBClient:
                 logger.error(f"Errore nella scansione della tabella: {error_code} - {e}")
                 raise
     
-    def delete_item(self, item_id: str) -> bool:
+    @track_operation("scan_segment")
+    def scan_segment(
+        self,
+        segment: int,
+        total_segments: int,
+        limit: Optional[int] = None,
+        exclusive_start_key: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> SegmentScanResult:
+        """
+        Legge un segmento della tabella (Scan con Segment/TotalSegments).
+        Continua a leggere pagine finché non raccoglie `limit` items
+        o finché il segmento non è finito.
+        
+        Args:
+            segment: Indice del segmento (0 .. total_segments - 1)
+            total_segments: Numero totale di segmenti della scansione
+            limit: Numero massimo di items da leggere (None = tutto il segmento)
+            exclusive_start_key: Chiave da cui riprendere la scansione del segmento
+            fields: Attributi da leggere (None = tutti)
+        
+        Returns:
+            SegmentScanResult con items, chiave di ripresa e tempi
+        
+        Raises:
+            ClientError: Se si verifica un errore durante la scansione
+        """
+        start_time = time.perf_counter()
+        items = []
+        pages = 0
+        last_key = exclusive_start_key
+        
+        scan_kwargs = {'ReturnConsumedCapacity': 'TOTAL', **_projection(fields)}
+        if total_segments > 1:
+            scan_kwargs['Segment'] = segment
+            scan_kwargs['TotalSegments'] = total_segments
+        
+        try:
+            while True:
+                if limit is not None:
+                    scan_kwargs['Limit'] = limit - len(items)
+                if last_key:
+                    scan_kwargs['ExclusiveStartKey'] = last_key
+                
+                response = self.table.scan(**scan_kwargs)
+                record_consumed_capacity('scan_segment', response.get('ConsumedCapacity'))
+                pages += 1
+                items.extend(response.get('Items', []))
+                last_key = response.get('LastEvaluatedKey')
+                
+                if not last_key or (limit is not None and len(items) >= limit):
+                    break
+        
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            logger.error(
+                f"Errore nella scansione del segmento {segment}/{total_segments}: {error_code} - {e}"
+            )
+            raise
+        
+        return SegmentScanResult(
+            segment=segment,
+            items=items,
+            last_evaluated_key=last_key,
+            pages=pages,
+            duration_ms=round((time.perf_counter() - start_time) * 1000, 2)
+        )
+    
+    @track_operation("delete_item")
+    def delete_item(self, item_id: str) -> Dict:
         """
         Elimina un item dalla tabella.
         
+        Una sola chiamata DeleteItem: la condizione attribute_exists(item_id)
+        rileva gli items inesistenti e ReturnValues=ALL_OLD restituisce
+        l'item eliminato.
+        
         Args:
             item_id: ID dell'item da eliminare
         
         Returns:
-            True se l'eliminazione ha successo
+            Dizionario con i dati dell'item eliminato
         
         Raises:
             ItemNotFoundException: Se l'item non esiste
             ClientError: Se si verifica un errore durante l'eliminazione
         """
         try:
-            # Verifica che l'item esista prima di eliminarlo
-            self.get_item(item_id)
-            
-            self.table.delete_item(Key={'item_id': item_id})
+            response = self.table.delete_item(
+                Key={'item_id': item_id},
+                ConditionExpression='attribute_exists(item_id)',
+                ReturnValues='ALL_OLD',
+                ReturnConsumedCapacity='TOTAL'
+            )
+            record_consumed_capacity('delete_item', response.get('ConsumedCapacity'), write=True)
             logger.info(f"Item eliminato con successo: {item_id}")
-            return True
+        
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
             
-        except ItemNotFoundException:
+            if error_code == 'ConditionalCheckFailedException':
+                logger.warning(f"Item non trovato: {item_id}")
+                raise ItemNotFoundException(f"Item con ID '{item_id}' non trovato")
+            
+            logger.error(f"Errore nell'eliminazione dell'item {item_id}: {error_code} - {e}")
             raise
+        
+        item = response['Attributes']
+        if self.tag_table_name and item.get('tags'):
+            # Prima l'item, poi l'indice: se la pulizia fallisce restano solo
+            # voci dell'indice senza item, ignorate dalle ricerche
+            requests = [
+                {'DeleteRequest': {'Key': {'tag': tag, 'item_id': item_id}}}
+                for tag in set(item['tags'])
+            ]
+            try:
+                if self._batch_write_tags(requests):
+                    logger.warning(f"Indice dei tag non ripulito per l'item {item_id}")
+            except ClientError as e:
+                logger.warning(f"Indice dei tag non ripulito per l'item {item_id}: {e}")
+        return item
+    
+    def _write_tag_index(self, items: List[Dict], max_retries: int = 5) -> set:
+        """
+        Scrive le voci dell'indice dei tag (una per coppia tag, item_id).
+        
+        Returns:
+            ID degli items con voci non scritte dopo tutti i tentativi
+        """
+        requests = [
+            {'PutRequest': {'Item': {'tag': tag, 'item_id': item['item_id']}}}
+            for item in items
+            for tag in set(item.get('tags') or [])
+        ]
+        unprocessed = self._batch_write_tags(requests, max_retries)
+        return {request['PutRequest']['Item']['item_id'] for request in unprocessed}
+    
+    @track_operation("write_tag_index")
+    def _batch_write_tags(self, requests: List[Dict], max_retries: int = 5) -> List[Dict]:
+        """
+        Esegue richieste Put/Delete sulla tabella dei tag con BatchWriteItem
+        (blocchi da 25), ritentando gli UnprocessedItems con backoff.
+        
+        Returns:
+            Richieste non processate dopo tutti i tentativi
+        
+        Raises:
+            ClientError: Se una richiesta BatchWriteItem fallisce
+        """
+        client = self.tag_table.meta.client
+        
+        def send(chunk: List[Dict]) -> List[Dict]:
+            response = client.batch_write_item(
+                RequestItems={self.tag_table_name: chunk},
+                ReturnConsumedCapacity='TOTAL'
+            )
+            record_consumed_capacity('write_tag_index', response.get('ConsumedCapacity'), write=True)
+            return response.get('UnprocessedItems', {}).get(self.tag_table_name, [])
+        
+        unprocessed = []
+        for i in range(0, len(requests), BATCH_WRITE_MAX_ITEMS):
+            unprocessed.extend(
+                _retry_unprocessed(send, requests[i:i + BATCH_WRITE_MAX_ITEMS], max_retries)
+            )
+        return unprocessed
+    
+    @track_operation("tag_index_page")
+    def tag_index_page(self, tag: str, after_id: str, limit: int) -> List[str]:
+        """
+        Legge fino a `limit` ID con il tag dalla tabella dei tag (Query sulla
+        partizione del tag, ordinata per item_id): il costo dipende dagli
+        ID letti, non dalla dimensione della tabella degli items.
+        
+        Raises:
+            ValueError: Se la tabella dei tag non è configurata
+            ClientError: Se si verifica un errore durante la query
+        """
+        if not self.tag_table_name:
+            raise ValueError("Tabella dell'indice dei tag non configurata")
+        
+        from boto3.dynamodb.conditions import Key
+        condition = Key('tag').eq(tag)
+        if after_id:
+            condition = condition & Key('item_id').gt(after_id)
+        query_kwargs = {
+            'KeyConditionExpression': condition,
+            'ProjectionExpression': 'item_id',
+            'ReturnConsumedCapacity': 'TOTAL',
+        }
+        
+        item_ids = []
+        try:
+            while len(item_ids) < limit:
+                query_kwargs['Limit'] = limit - len(item_ids)
+                response = self.tag_table.query(**query_kwargs)
+                record_consumed_capacity('tag_index_page', response.get('ConsumedCapacity'))
+                item_ids.extend(row['item_id'] for row in response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        
         except ClientError as e:
             error_code = e.response['Error']['Code']
-            logger.error(f"Errore nell'eliminazione dell'item {item_id}: {error_code} - {e}")
+            logger.error(f"Errore nella lettura dell'indice del tag '{tag}': {error_code} - {e}")
+            raise
+        
+        return item_ids
+    
+    @track_operation("query_by_created")
+    def query_by_created(
+        self,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        descending: bool = True,
+        limit: int = 100,
+        exclusive_start_key: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], Optional[Dict]]:
+        """
+        Pagina di items in ordine di creazione dal GSI created_index_name.
+        
+        Ogni partizione del GSI (created_shard) è letta con una Query sul
+        solo intervallo richiesto, nell'ordine richiesto e per al massimo
+        una pagina; i risultati sono uniti e ordinati per (created_at,
+        item_id). Il costo dipende dalla dimensione della pagina e dal
+        numero di partizioni, non dalla dimensione della tabella.
+        Senza GSI configurato usa la scansione di StorageBackend.
+        
+        Raises:
+            ClientError: Se si verifica un errore durante la query
+        """
+        if not self.created_index_name:
+            return super().query_by_created(
+                created_after, created_before, descending, limit, exclusive_start_key, fields
+            )
+        
+        accept = created_filter(created_after, created_before, descending, exclusive_start_key)
+        # Estremi inclusivi della KeyConditionExpression; le condizioni
+        # strette (e la chiave di partenza) sono applicate da accept
+        lower, upper = created_after, created_before
+        if exclusive_start_key:
+            start_created = exclusive_start_key['created_at']
+            if descending:
+                upper = min(upper, start_created) if upper else start_created
+            else:
+                lower = max(lower, start_created) if lower else start_created
+        
+        candidates = []
+        more = False
+        for shard in range(self.created_index_shards):
+            items, shard_more = self._query_created_shard(
+                shard, lower, upper, descending, limit, accept, fields
+            )
+            candidates.extend(items)
+            more = more or shard_more
+        
+        candidates.sort(key=created_key, reverse=descending)
+        return created_page(candidates, limit, more=more)
+    
+    def _query_created_shard(
+        self,
+        shard: int,
+        lower: Optional[str],
+        upper: Optional[str],
+        descending: bool,
+        limit: int,
+        accept,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], bool]:
+        """
+        Legge da una partizione del GSI fino a `limit` + 1 items accettati.
+        
+        Returns:
+            Tupla (items, more): more è True se la partizione ha altri items
+        """
+        from boto3.dynamodb.conditions import Key
+        condition = Key('created_shard').eq(shard)
+        if lower and upper:
+            condition = condition & Key('created_at').between(lower, upper)
+        elif lower:
+            condition = condition & Key('created_at').gte(lower)
+        elif upper:
+            condition = condition & Key('created_at').lte(upper)
+        query_kwargs = {
+            'IndexName': self.created_index_name,
+            'KeyConditionExpression': condition,
+            'ScanIndexForward': not descending,
+            'Limit': limit + 1,
+            'ReturnConsumedCapacity': 'TOTAL',
+            # created_at serve per l'ordinamento e la chiave di ripresa
+            **_projection(with_fields(fields, 'created_at')),
+        }
+        
+        items = []
+        try:
+            while True:
+                response = self.table.query(**query_kwargs)
+                record_consumed_capacity('query_by_created', response.get('ConsumedCapacity'))
+                items.extend(item for item in response.get('Items', []) if accept(item))
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key or len(items) > limit:
+                    return items, bool(last_key)
+                query_kwargs['ExclusiveStartKey'] = last_key
+        
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            logger.error(
+                f"Errore nella query per data di creazione (partizione {shard}): {error_code} - {e}"
+            )
             raise
     
+    def backfill_created_shards(self, page_size: int = 1000) -> int:
+        """
+        Aggiunge created_shard agli items scritti senza (es. prima di questa
+        versione), così entrano nel GSI per data di creazione.
+        Operazione di manutenzione da eseguire una tantum con credenziali
+        amministrative: richiede dynamodb:UpdateItem, che il ruolo
+        dell'istanza (setup-aws.sh, test-policy.json) non concede.
+        
+        Returns:
+            Numero di items aggiornati
+        """
+        count = 0
+        for page in self.iter_pages(page_size=page_size):
+            for item in page:
+                if 'created_shard' in item or not item.get('created_at'):
+                    continue
+                try:
+                    self.table.update_item(
+                        Key={'item_id': item['item_id']},
+                        UpdateExpression='SET created_shard = :shard',
+                        ConditionExpression='attribute_exists(item_id)',
+                        ExpressionAttributeValues={
+                            ':shard': segment_of(item['item_id'], self.created_index_shards)
+                        }
+                    )
+                    count += 1
+                except ClientError as e:
+                    if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                        raise
+        logger.info(f"Partizione del GSI per data di creazione aggiunta a {count} items")
+        return count
+    
+    def rebuild_tag_index(self, page_size: int = 1000) -> int:
+        """
+        Scrive l'indice dei tag per tutti gli items della tabella, ad esempio
+        dopo aver configurato DYNAMODB_TAG_TABLE_NAME su una tabella esistente.
+        Le voci già presenti vengono sovrascritte con gli stessi valori.
+        
+        Returns:
+            Numero di items indicizzati
+        
+        Raises:
+            ValueError: Se la tabella dei tag non è configurata
+        """
+        if not self.tag_table_name:
+            raise ValueError("Tabella dell'indice dei tag non configurata")
+        
+        count = 0
+        for page in self.iter_pages(page_size=page_size):
+            failed_ids = self._write_tag_index(page)
+            if failed_ids:
+                logger.warning(f"Indice dei tag non scritto per {len(failed_ids)} items")
+            count += len(page) - len(failed_ids)
+        logger.info(f"Indice dei tag ricostruito: {count} items")
+        return count
+    
+    @track_operation("health_check")
     def health_check(self) -> bool:
         """
         Verifica la connessione a DynamoDB.
@@ -190,7 +872,7 @@ class DynamoDBClient:
             else:
                 logger.warning(f"Health check: tabella '{self.table_name}' in stato {table_status}")
                 return False
-                
+        
         except ClientError as e:
             error_code = e.response['Error']['Code']
             
@@ -200,3 +882,471 @@ class DynamoDBClient:
             else:
                 logger.error(f"Health check FAILED: {error_code} - {e}")
                 raise
+
+
+class AsyncDynamoDBClient:
+    """
+    Variante asincrona di DynamoDBClient, da usare negli endpoint async.
+    Accetta qualsiasi StorageBackend (DynamoDB, memoria, SQLite).
+    
+    I backend sono sincroni: ogni chiamata viene eseguita su un pool di thread
+    di dimensione limitata, così l'event loop resta libero mentre attende
+    DynamoDB e può servire altre richieste nel frattempo.
+    """
+    
+    def __init__(
+        self,
+        client: StorageBackend,
+        max_workers: int = 16,
+        scan_segments: int = 1,
+        batch_max_retries: int = 5,
+        cache: Optional[ItemCache] = None,
+        coalesce_reads: bool = False,
+        write_queue: Optional[dict] = None
+    ):
+        """
+        Inizializza il client asincrono.
+        
+        Args:
+            client: Backend sincrono da usare per le chiamate (es. DynamoDBClient)
+            max_workers: Numero massimo di chiamate DynamoDB in parallelo
+            scan_segments: Numero di segmenti letti in parallelo nelle scansioni
+            batch_max_retries: Tentativi per items/chiavi non processati nei batch
+            cache: Cache opzionale per le letture per ID (get_item, batch_get_items)
+            coalesce_reads: Se True, le get_item concorrenti per lo stesso ID
+                condividono una sola chiamata a DynamoDB
+            write_queue: Se indicato, abilita il micro-batching delle creazioni;
+                contiene i parametri di WriteBehindQueue (max_batch_size,
+                flush_interval_ms, max_queue_size)
+        """
+        self.client = client
+        self.scan_segments = scan_segments
+        self.batch_max_retries = batch_max_retries
+        self.cache = cache
+        self.coalescer = SingleFlight() if coalesce_reads else None
+        self.write_queue = None
+        if write_queue is not None:
+            self.write_queue = WriteBehindQueue(
+                self._write_batch,
+                max_concurrent_flushes=max_workers,
+                **write_queue
+            )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="dynamodb"
+        )
+        
+        logger.info(f"AsyncDynamoDBClient inizializzato con {max_workers} worker")
+    
+    async def _run(self, func, *args, **kwargs):
+        """Esegue una chiamata sincrona sul pool di thread senza bloccare l'event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+    
+    async def create_item(self, item_data: dict) -> Dict:
+        """
+        Versione asincrona di DynamoDBClient.create_item.
+        
+        Con la coda di scrittura attiva, l'item viene scritto insieme ad altre
+        creazioni concorrenti in un'unica BatchWriteItem. BatchWriteItem non
+        supporta condizioni: in questa modalità non c'è il controllo
+        attribute_not_exists (gli ID sono UUID generati dal server).
+        """
+        if self.write_queue:
+            item = await self.write_queue.submit(self.client.build_item(item_data))
+        else:
+            item = await self._run(self.client.create_item, item_data)
+        self._written(item['item_id'], item)
+        return item
+    
+    async def _write_batch(self, items: List[Dict]) -> List[Dict]:
+        """Scrive un batch (max 25 items) sul pool di thread; usato dalla coda di scrittura."""
+        return await self._run(self.client.write_batch, items, self.batch_max_retries)
+    
+    async def batch_create_items(
+        self,
+        items_data: List[dict]
+    ) -> Tuple[List[Dict], List[Tuple[int, str]]]:
+        """
+        Crea molti items con BatchWriteItem.
+        Gli items sono divisi in blocchi da 25, scritti in parallelo.
+        
+        Args:
+            items_data: Lista di dizionari con i dati degli items
+        
+        Returns:
+            Tupla (created, failed): created contiene i record creati,
+            nell'ordine della richiesta; failed contiene coppie
+            (indice nella richiesta, codice errore)
+        """
+        items = [self.client.build_item(item_data) for item_data in items_data]
+        chunks = [
+            items[i:i + BATCH_WRITE_MAX_ITEMS]
+            for i in range(0, len(items), BATCH_WRITE_MAX_ITEMS)
+        ]
+        
+        results = await asyncio.gather(
+            *(
+                self._run(self.client.write_batch, chunk, self.batch_max_retries)
+                for chunk in chunks
+            ),
+            return_exceptions=True
+        )
+        
+        errors = {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, ClientError):
+                error_code = result.response['Error']['Code']
+                errors.update({item['item_id']: error_code for item in chunk})
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                errors.update({item['item_id']: 'UnprocessedItem' for item in result})
+        
+        created = [item for item in items if item['item_id'] not in errors]
+        for item in created:
+            self._written(item['item_id'], item)
+        failed = [
+            (index, errors[item['item_id']])
+            for index, item in enumerate(items)
+            if item['item_id'] in errors
+        ]
+        return created, failed
+    
+    async def get_item(self, item_id: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
+        """
+        Versione asincrona di DynamoDBClient.get_item.
+        Se la cache è attiva, la tabella viene letta solo in caso di miss;
+        con il coalescing, le letture concorrenti dello stesso ID condividono
+        una sola chiamata. L'item restituito può essere condiviso con altre
+        richieste: non va modificato.
+        
+        Con `fields` un hit della cache viene proiettato; in caso di miss
+        viene letta solo la proiezione, che non entra in cache.
+        """
+        if self.cache:
+            hit, item = self.cache.get(item_id)
+            if hit:
+                if item is None:
+                    raise ItemNotFoundException(f"Item con ID '{item_id}' non trovato")
+                return project(item, with_fields(fields, 'item_id'))
+        
+        if fields is not None:
+            return await self._run(self.client.get_item, item_id, fields)
+        
+        if self.coalescer:
+            return await self.coalescer.do(item_id, lambda: self._fetch_item(item_id))
+        return await self._fetch_item(item_id)
+    
+    async def _fetch_item(self, item_id: str) -> Dict:
+        """Legge un item dalla tabella e aggiorna la cache (se attiva)."""
+        if not self.cache:
+            return await self._run(self.client.get_item, item_id)
+        
+        generation = self.cache.generation()
+        try:
+            item = await self._run(self.client.get_item, item_id)
+        except ItemNotFoundException:
+            self.cache.fill(item_id, None, generation)
+            raise
+        self.cache.fill(item_id, item, generation)
+        return item
+    
+    async def batch_get_items(
+        self,
+        item_ids: List[str]
+    ) -> Tuple[List[Dict], List[str], List[str]]:
+        """
+        Recupera molti items per ID con BatchGetItem.
+        Gli ID sono divisi in blocchi da 100, letti in parallelo.
+        
+        Args:
+            item_ids: ID degli items da recuperare
+        
+        Returns:
+            Tupla (items, missing, unprocessed): items trovati nell'ordine
+            della richiesta, ID inesistenti e ID non letti per throttling
+        
+        Raises:
+            ClientError: Se una richiesta BatchGetItem fallisce
+        """
+        # Elimina i duplicati mantenendo l'ordine (BatchGetItem li rifiuta)
+        unique_ids = list(dict.fromkeys(item_ids))
+        
+        found = {}
+        known_missing = set()
+        to_fetch = unique_ids
+        if self.cache:
+            to_fetch = []
+            for item_id in unique_ids:
+                hit, item = self.cache.get(item_id)
+                if not hit:
+                    to_fetch.append(item_id)
+                elif item is None:
+                    known_missing.add(item_id)
+                else:
+                    found[item_id] = item
+            generation = self.cache.generation()
+        
+        chunks = [
+            to_fetch[i:i + BATCH_GET_MAX_KEYS]
+            for i in range(0, len(to_fetch), BATCH_GET_MAX_KEYS)
+        ]
+        
+        results = await asyncio.gather(*(
+            self._run(self.client.get_batch, chunk, self.batch_max_retries)
+            for chunk in chunks
+        ))
+        
+        unprocessed = []
+        for chunk_found, chunk_unprocessed in results:
+            found.update(chunk_found)
+            unprocessed.extend(chunk_unprocessed)
+        
+        pending = set(unprocessed)
+        items = [found[item_id] for item_id in unique_ids if item_id in found]
+        missing = [
+            item_id for item_id in unique_ids
+            if item_id not in found and item_id not in pending
+        ]
+        
+        if self.cache:
+            for item_id in to_fetch:
+                if item_id not in pending:
+                    self.cache.fill(item_id, found.get(item_id), generation)
+        return items, missing, unprocessed
+    
+    async def list_items(
+        self,
+        limit: int = 100,
+        exclusive_start_key: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], Optional[Dict]]:
+        """Versione asincrona di DynamoDBClient.list_items."""
+        return await self._run(
+            self.client.list_items,
+            limit=limit,
+            exclusive_start_key=exclusive_start_key,
+            fields=fields
+        )
+    
+    async def query_by_tags(
+        self,
+        tags: List[str],
+        match_all: bool = True,
+        limit: int = 100,
+        exclusive_start_key: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], Optional[Dict]]:
+        """Versione asincrona di StorageBackend.query_by_tags."""
+        return await self._run(
+            self.client.query_by_tags,
+            tags,
+            match_all=match_all,
+            limit=limit,
+            exclusive_start_key=exclusive_start_key,
+            fields=fields
+        )
+    
+    async def query_by_created(
+        self,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        descending: bool = True,
+        limit: int = 100,
+        exclusive_start_key: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], Optional[Dict]]:
+        """Versione asincrona di StorageBackend.query_by_created."""
+        return await self._run(
+            self.client.query_by_created,
+            created_after=created_after,
+            created_before=created_before,
+            descending=descending,
+            limit=limit,
+            exclusive_start_key=exclusive_start_key,
+            fields=fields
+        )
+    
+    async def parallel_scan(
+        self,
+        limit: Optional[int] = None,
+        positions: Optional[List] = None,
+        fields: Optional[List[str]] = None
+    ) -> ParallelScanResult:
+        """
+        Scansione parallela della tabella: ogni segmento viene letto
+        da un thread diverso e i risultati vengono uniti.
+        
+        Con `limit` restituisce una pagina (il limite è diviso tra i segmenti
+        ancora da leggere); le `positions` del risultato permettono di
+        riprendere dalla pagina successiva. Senza `limit` legge tutta la tabella.
+        
+        Args:
+            limit: Numero massimo di items da restituire (None = tutta la tabella)
+            positions: Stato dei segmenti restituito dalla pagina precedente
+            fields: Attributi da leggere (None = tutti)
+        
+        Returns:
+            ParallelScanResult con items, nuove posizioni e tempi per segmento
+        
+        Raises:
+            ValueError: Se le posizioni non corrispondono al numero di segmenti
+            ClientError: Se si verifica un errore durante la scansione
+        """
+        total_segments = self.scan_segments
+        if positions is None:
+            positions = [None] * total_segments
+        elif len(positions) != total_segments:
+            raise ValueError(
+                f"Attese {total_segments} posizioni di segmento, ricevute {len(positions)}"
+            )
+        
+        active = [i for i, position in enumerate(positions) if position is not SEGMENT_DONE]
+        quotas = {i: None for i in active}
+        if limit is not None and active:
+            # Divide il limite tra i segmenti attivi (la somma è esattamente limit)
+            base, extra = divmod(limit, len(active))
+            quotas = {i: base + (1 if n < extra else 0) for n, i in enumerate(active)}
+            quotas = {i: quota for i, quota in quotas.items() if quota > 0}
+        
+        start_time = time.perf_counter()
+        results = await asyncio.gather(*(
+            self._run(
+                self.client.scan_segment,
+                segment,
+                total_segments,
+                limit=quota,
+                exclusive_start_key=positions[segment],
+                fields=fields
+            )
+            for segment, quota in quotas.items()
+        ))
+        duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+        
+        new_positions = list(positions)
+        items = []
+        for result in results:
+            items.extend(result.items)
+            new_positions[result.segment] = result.last_evaluated_key or SEGMENT_DONE
+        
+        logger.info(
+            f"Scansione parallela completata: {len(items)} items da {len(results)} segmenti",
+            extra={
+                "total_segments": total_segments,
+                "duration_ms": duration_ms,
+                "segments": [result.stats() for result in results],
+            }
+        )
+        return ParallelScanResult(
+            items=items,
+            positions=new_positions,
+            segments=results,
+            duration_ms=duration_ms
+        )
+    
+    async def iter_pages(self, page_size: int = 1000) -> AsyncIterator[List[Dict]]:
+        """
+        Generatore asincrono sulle pagine di una scansione completa.
+        
+        I segmenti vengono letti in parallelo; le pagine passano da una coda
+        limitata, quindi se il consumatore è lento (es. client HTTP lento)
+        la lettura da DynamoDB si ferma invece di accumulare dati in memoria.
+        
+        Args:
+            page_size: Numero massimo di items per pagina
+        
+        Yields:
+            Liste di items, una per pagina (l'ordine tra segmenti non è garantito)
+        
+        Raises:
+            ClientError: Se si verifica un errore durante la scansione
+        """
+        total_segments = self.scan_segments
+        queue = asyncio.Queue(maxsize=total_segments)
+        end_of_segment = object()
+        
+        async def produce(segment: int):
+            last_key = None
+            try:
+                while True:
+                    result = await self._run(
+                        self.client.scan_segment,
+                        segment,
+                        total_segments,
+                        limit=page_size,
+                        exclusive_start_key=last_key
+                    )
+                    if result.items:
+                        await queue.put(result.items)
+                    last_key = result.last_evaluated_key
+                    if not last_key:
+                        break
+                await queue.put(end_of_segment)
+            except Exception as e:
+                # L'errore viene rilanciato dal consumatore
+                await queue.put(e)
+        
+        producers = [
+            asyncio.create_task(produce(segment)) for segment in range(total_segments)
+        ]
+        try:
+            remaining = total_segments
+            while remaining:
+                page = await queue.get()
+                if page is end_of_segment:
+                    remaining -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    yield page
+        finally:
+            for producer in producers:
+                producer.cancel()
+    
+    async def delete_item(self, item_id: str) -> Dict:
+        """Versione asincrona di DynamoDBClient.delete_item."""
+        try:
+            return await self._run(self.client.delete_item, item_id)
+        finally:
+            # Invalida anche in caso di errore: lo stato dell'item è incerto
+            self._written(item_id)
+    
+    async def health_check(self) -> bool:
+        """Versione asincrona di DynamoDBClient.health_check."""
+        return await self._run(self.client.health_check)
+    
+    def _written(self, item_id: str, item: Optional[Dict] = None):
+        """
+        Aggiorna cache e coalescing dopo una scrittura:
+        le letture iniziate prima non devono restituire il valore vecchio.
+        
+        Args:
+            item_id: ID dell'item scritto o eliminato
+            item: Nuovo valore dell'item (None se eliminato o incerto)
+        """
+        if self.coalescer:
+            self.coalescer.forget(item_id)
+        if self.cache:
+            if item is None:
+                self.cache.invalidate(item_id)
+            else:
+                # Aggiorna solo un item già in cache: un item appena creato
+                # entra in cache alla prima lettura
+                self.cache.update(item_id, item)
+    
+    async def drain(self):
+        """Scrive le creazioni ancora in coda (da chiamare allo shutdown, prima di close)."""
+        if self.write_queue:
+            await self.write_queue.drain()
+    
+    def close(self):
+        """
+        Chiude il pool di thread e il backend.
+        Le chiamate già in corso vengono completate.
+        """
+        self._executor.shutdown(wait=True)
+        self.client.close()
+        logger.info("AsyncDynamoDBClient chiuso")
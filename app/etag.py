@@ -0,0 +1,90 @@
+"""
+ETag e richieste condizionali (If-None-Match) per le risposte con items.
+
+Gli ETag sono calcolati dai dati letti (item_id e updated_at), prima della
+serializzazione: se il client ha già la rappresentazione l'endpoint
+risponde 304 senza costruire il corpo.
+"""
+import hashlib
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+# Suffissi aggiunti all'ETag da CompressionMiddleware: rappresentazioni con
+# codifiche diverse devono avere ETag forti diversi (come Apache httpd)
+ENCODING_SUFFIXES = ("-gzip", "-br")
+
+
+def _digest(parts: Iterable[str]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return f'"{digest.hexdigest()}"'
+
+
+def _fields_key(fields: Optional[Sequence[str]]) -> str:
+    # I campi sono serializzati sempre nell'ordine di ItemResponse:
+    # l'ordine della richiesta non cambia la rappresentazione
+    return "*" if fields is None else ",".join(sorted(fields))
+
+
+def item_etag(item: Dict, fields: Optional[Sequence[str]] = None) -> str:
+    """
+    ETag forte di un item: cambia quando cambia updated_at.
+
+    Args:
+        item: Item letto dallo storage (con item_id e updated_at)
+        fields: Campi richiesti con `fields` (None = tutti)
+    """
+    return _digest((item["item_id"], item.get("updated_at") or "", _fields_key(fields)))
+
+
+def page_etag(
+    items: List[Dict],
+    next_token: Optional[str],
+    fields: Optional[Sequence[str]] = None
+) -> str:
+    """
+    ETag forte di una pagina di items: digest di ID e updated_at degli
+    items e del token della pagina successiva, senza serializzare la pagina.
+    """
+    parts = [_fields_key(fields), next_token or ""]
+    for item in items:
+        parts.append(item["item_id"])
+        parts.append(item.get("updated_at") or "")
+    return _digest(parts)
+
+
+def encoded_etag(etag: str, suffix: str) -> str:
+    """ETag della rappresentazione compressa (gli ETag deboli restano uguali)."""
+    if etag.startswith("W/") or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}{suffix}"'
+
+
+def if_none_match(header: Optional[str], etag: str) -> Optional[str]:
+    """
+    Cerca l'ETag nell'header If-None-Match (confronto debole, RFC 9110),
+    anche nella forma con il suffisso di compressione.
+
+    Returns:
+        L'ETag della rappresentazione che il client ha già (con l'eventuale
+        suffisso, da rimandare nella risposta 304), None se nessuno corrisponde
+    """
+    if not header:
+        return None
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return etag
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        for suffix in ENCODING_SUFFIXES:
+            if candidate.endswith(f'{suffix}"'):
+                if f'{candidate[:-len(suffix) - 1]}"' == etag:
+                    return candidate
+                break
+        else:
+            if candidate == etag:
+                return candidate
+    return None
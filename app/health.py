@@ -0,0 +1,135 @@
+"""
+Monitoraggio in background dello stato di DynamoDB.
+Gli endpoint di health check leggono lo stato in memoria invece di
+chiamare DescribeTable a ogni richiesta.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """
+    Esegue periodicamente un health check e ne memorizza il risultato.
+
+    Stati del database:
+    - "connected": ultimo check riuscito
+    - "disconnected": tabella raggiungibile ma non ACTIVE
+    - "error": ultimo check fallito
+    - "unknown": nessun check ancora eseguito
+    - "stale": ultimo risultato più vecchio di max_staleness_seconds
+    """
+
+    def __init__(
+        self,
+        check: Callable[[], Awaitable[bool]],
+        interval_seconds: float = 10.0,
+        max_staleness_seconds: float = 30.0,
+        timeout_seconds: float = 5.0
+    ):
+        """
+        Inizializza il monitor.
+
+        Args:
+            check: Funzione async che restituisce True se il database è pronto
+            interval_seconds: Intervallo tra due check
+            max_staleness_seconds: Età massima di un risultato ancora valido
+            timeout_seconds: Tempo massimo per un singolo check
+        """
+        self._check = check
+        self.interval_seconds = interval_seconds
+        self.max_staleness_seconds = max_staleness_seconds
+        self.timeout_seconds = timeout_seconds
+
+        self._status = "unknown"
+        self._checked_at: Optional[datetime] = None
+        self._checked_monotonic: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._checked = asyncio.Event()
+
+    async def refresh(self) -> str:
+        """
+        Esegue subito un health check e aggiorna lo stato.
+
+        Returns:
+            Nuovo stato del database
+        """
+        try:
+            ok = await asyncio.wait_for(self._check(), timeout=self.timeout_seconds)
+            status = "connected" if ok else "disconnected"
+        except asyncio.TimeoutError:
+            logger.warning(f"Health check in timeout dopo {self.timeout_seconds}s")
+            status = "error"
+        except Exception as e:
+            logger.warning(f"Health check fallito: {e}")
+            status = "error"
+
+        if status != self._status:
+            logger.info(f"Stato database: {self._status} -> {status}")
+
+        self._status = status
+        self._checked_at = datetime.utcnow()
+        self._checked_monotonic = time.monotonic()
+        self._checked.set()
+        return status
+
+    def start(self):
+        """
+        Avvia il check periodico in background. Se non è ancora stato
+        eseguito nessun check, il primo parte subito: fino al risultato
+        il database è "unknown" (readiness non pronta).
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Health check in background ogni {self.interval_seconds}s")
+
+    async def stop(self):
+        """Ferma il check periodico."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def wait_checked(self):
+        """Attende il primo health check (riuscito o no)."""
+        await self._checked.wait()
+
+    async def _run(self):
+        if self._checked_monotonic is None:
+            await self.refresh()
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.refresh()
+
+    @property
+    def age_seconds(self) -> Optional[float]:
+        """Secondi trascorsi dall'ultimo check (None se mai eseguito)."""
+        if self._checked_monotonic is None:
+            return None
+        return time.monotonic() - self._checked_monotonic
+
+    @property
+    def database_status(self) -> str:
+        """Stato del database secondo l'ultimo check."""
+        age = self.age_seconds
+        if age is not None and age > self.max_staleness_seconds:
+            return "stale"
+        return self._status
+
+    @property
+    def checked_at(self) -> Optional[datetime]:
+        """Momento dell'ultimo check."""
+        return self._checked_at
+
+    @property
+    def ready(self) -> bool:
+        """True se l'ultimo check è riuscito e non è troppo vecchio."""
+        return self.database_status == "connected"
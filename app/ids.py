@@ -0,0 +1,61 @@
+"""
+Generazione degli ID degli items.
+Gli ID sono UUID versione 7 (RFC 9562): i primi 48 bit sono il timestamp
+in millisecondi, quindi l'ordine lessicografico degli ID segue l'ordine
+di creazione.
+"""
+import os
+import threading
+import time
+import uuid
+from typing import Optional
+
+
+_lock = threading.Lock()
+_last_ms = 0
+_last_counter = 0
+
+
+def uuid7(timestamp_ms: Optional[int] = None) -> str:
+    """
+    Genera un UUIDv7 come stringa (stesso formato di str(uuid4())).
+
+    Nello stesso millisecondo i 12 bit rand_a fanno da contatore
+    (RFC 9562, metodo 1), quindi gli ID generati da questo processo sono
+    strettamente crescenti; il resto è casuale (62 bit).
+
+    Args:
+        timestamp_ms: Timestamp Unix in millisecondi (default: adesso)
+
+    Returns:
+        UUID in forma canonica, es. '01929b3c-5f2e-7a41-8c3d-4e5f6a7b8c9d'
+    """
+    global _last_ms, _last_counter
+
+    if timestamp_ms is None:
+        timestamp_ms = time.time_ns() // 1_000_000
+    random_bits = int.from_bytes(os.urandom(10), "big")
+
+    with _lock:
+        if timestamp_ms > _last_ms:
+            # Nuovo millisecondo: contatore casuale nella metà bassa,
+            # così resta spazio per gli ID successivi
+            _last_ms = timestamp_ms
+            _last_counter = random_bits >> 69
+        else:
+            # Stesso millisecondo (o orologio indietro): continua dal precedente
+            timestamp_ms = _last_ms
+            _last_counter += 1
+            if _last_counter > 0xFFF:
+                # Contatore esaurito: passa al millisecondo successivo
+                _last_ms += 1
+                timestamp_ms = _last_ms
+                _last_counter = 0
+        counter = _last_counter
+
+    value = (timestamp_ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76
+    value |= counter << 64
+    value |= 0x2 << 62
+    value |= random_bits & 0x3FFFFFFFFFFFFFFF
+    return str(uuid.UUID(int=value))
@@ -2,9 +2,29 @@
 Configurazione logging strutturato per CloudWatch.
 Usa JSON formatter per facilitare il parsing dei log.
 """
+import atexit
+import itertools
 import logging
+import logging.handlers
+import math
+import queue
 import sys
+import threading
+from datetime import datetime, timezone
+from typing import List, Optional
 from pythonjsonlogger import jsonlogger
+from pythonjsonlogger.core import RESERVED_ATTRS
+from pythonjsonlogger.json import JsonEncoder
+
+try:
+    import orjson
+except ImportError:  # dipendenza opzionale
+    orjson = None
+
+
+# Campi sensibili sostituiti nei log
+SENSITIVE_KEYS = ('password', 'token', 'secret', 'api_key', 'authorization')
+REDACTED = '***REDACTED***'
 
 
 class CustomJsonFormatter(jsonlogger.JsonFormatter):
@@ -21,36 +41,318 @@ class CustomJsonFormatter(jsonlogger.JsonFormatter):
         log_record['function'] = record.funcName
         
         # Rimuovi campi sensibili se presenti
-        sensitive_keys = ['password', 'token', 'secret', 'api_key', 'authorization']
-        for key in sensitive_keys:
+        for key in SENSITIVE_KEYS:
             if key in log_record:
-                log_record[key] = '***REDACTED***'
+                log_record[key] = REDACTED
 
 
-def setup_logging(debug: bool = False):
+class FastJsonFormatter(logging.Formatter):
+    """
+    Formatter JSON veloce con lo stesso output di CustomJsonFormatter.
+    
+    Costruisce il record direttamente, con l'elenco dei campi riservati e
+    l'insieme dei campi sensibili calcolati una sola volta. La parte del
+    timestamp fino ai secondi è riusata tra record dello stesso secondo e i
+    campi extra sono cercati solo dopo gli attributi standard del LogRecord.
+    Di default serializza con json della libreria standard (output identico
+    byte per byte). In modalità compatta il formato è diverso (nessuno
+    spazio tra i campi, caratteri non ASCII non escapati) e la
+    serializzazione usa orjson se installato.
+    """
+    
+    # Campi del formato '%(timestamp)s %(level)s %(name)s %(message)s'
+    REQUIRED_FIELDS = ('timestamp', 'level', 'name', 'message')
+    # Attributi impostati da LogRecord.__init__: gli extra vengono dopo
+    RECORD_ATTRS = len(logging.LogRecord('', 0, '', 0, '', (), None).__dict__)
+    
+    def __init__(self, compact: bool = False):
+        """
+        Args:
+            compact: Se True, JSON compatto senza escape dei caratteri non
+                ASCII (formato diverso da CustomJsonFormatter, con orjson
+                se installato)
+        """
+        super().__init__()
+        self.compact = compact
+        self.use_orjson = compact and orjson is not None
+        self._skip = frozenset(RESERVED_ATTRS) | frozenset(self.REQUIRED_FIELDS)
+        self._sensitive = frozenset(SENSITIVE_KEYS)
+        if compact:
+            # Stesso formato di orjson, anche per i record che orjson rifiuta
+            self._encoder = JsonEncoder(ensure_ascii=False, separators=(",", ":"))
+        else:
+            self._encoder = JsonEncoder(ensure_ascii=True)
+        # (secondo, "YYYY-MM-DDTHH:MM:SS") dell'ultimo timestamp formattato
+        self._second = (None, "")
+    
+    def _timestamp(self, created: float) -> str:
+        # Come datetime.fromtimestamp(created, tz=timezone.utc).isoformat():
+        # microsecondi arrotondati half-even, frazione omessa se zero
+        fraction, whole = math.modf(created)
+        second, micro = int(whole), round(fraction * 1e6)
+        if micro >= 1000000:
+            second, micro = second + 1, micro - 1000000
+        cached_second, prefix = self._second
+        if second != cached_second:
+            prefix = datetime.fromtimestamp(second, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+            self._second = (second, prefix)
+        if micro:
+            return f"{prefix}.{micro:06d}+00:00"
+        return f"{prefix}+00:00"
+    
+    def format(self, record):
+        message_dict = {}
+        if isinstance(record.msg, dict):
+            message_dict = record.msg.copy()
+            record.message = ""
+        else:
+            record.message = record.getMessage()
+        
+        if record.exc_info and not message_dict.get("exc_info"):
+            message_dict["exc_info"] = self.formatException(record.exc_info)
+        if not message_dict.get("exc_info") and record.exc_text:
+            message_dict["exc_info"] = record.exc_text
+        if record.stack_info and not message_dict.get("stack_info"):
+            message_dict["stack_info"] = self.formatStack(record.stack_info)
+        
+        timestamp = self._timestamp(record.created)
+        log_record = {
+            'timestamp': timestamp,
+            'level': record.levelname,
+            'name': record.name,
+            'message': record.message,
+        }
+        if message_dict:
+            log_record.update(message_dict)
+        
+        skip = self._skip
+        for key, value in itertools.islice(record.__dict__.items(), self.RECORD_ATTRS, None):
+            if key not in skip and not (hasattr(key, "startswith") and key.startswith("_")):
+                log_record[key] = value
+        
+        # Come CustomJsonFormatter: questi campi vincono su extra e message_dict
+        log_record['timestamp'] = timestamp
+        log_record['level'] = record.levelname
+        log_record['logger'] = record.name
+        log_record['module'] = record.module
+        log_record['function'] = record.funcName
+        
+        if not self._sensitive.isdisjoint(log_record):
+            for key in self._sensitive.intersection(log_record):
+                log_record[key] = REDACTED
+        
+        if self.use_orjson:
+            try:
+                return orjson.dumps(
+                    log_record,
+                    default=self._encoder.default,
+                    option=orjson.OPT_NON_STR_KEYS
+                ).decode()
+            except TypeError:
+                # Es. interi oltre 64 bit: la libreria standard, con lo
+                # stesso formato compatto
+                pass
+        return self._encoder.encode(log_record)
+
+
+# Politiche quando la coda dei log è piena
+OVERFLOW_POLICIES = ("drop_newest", "drop_oldest", "block")
+
+# Segnale di chiusura per il thread del listener
+_STOP = object()
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Handler che mette i record in una coda limitata invece di scriverli.
+    
+    Politiche per la coda piena:
+    - drop_newest: scarta il nuovo record
+    - drop_oldest: scarta il record più vecchio in coda
+    - block: attende che si liberi spazio (il chiamante si blocca)
+    """
+    
+    def __init__(self, log_queue: queue.Queue, overflow: str = "drop_newest"):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Politica di overflow non valida: {overflow}")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+    
+    def prepare(self, record):
+        # Risolve il messaggio nel thread chiamante (gli argomenti potrebbero
+        # cambiare dopo); la formattazione JSON avviene nel thread del listener.
+        # Un messaggio dict resta un dict (i formatter ne fanno campi del JSON)
+        if isinstance(record.msg, dict):
+            record.msg = record.msg.copy()
+        else:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+    
+    def enqueue(self, record):
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self.overflow == "drop_oldest":
+                try:
+                    self.queue.get_nowait()
+                    self.queue.put_nowait(record)
+                except (queue.Empty, queue.Full):
+                    pass
+            self.dropped += 1
+
+
+class BatchingQueueListener:
+    """
+    Thread dedicato che legge i record dalla coda, li formatta
+    e li scrive sullo stream a blocchi (una write e un flush per blocco).
+    """
+    
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        formatter: logging.Formatter,
+        handler: BoundedQueueHandler,
+        stream=None,
+        max_batch_size: int = 512
+    ):
+        self.queue = log_queue
+        self.formatter = formatter
+        self.handler = handler
+        self.stream = stream or sys.stdout
+        self.max_batch_size = max_batch_size
+        self._thread: Optional[threading.Thread] = None
+        self._reported_drops = 0
+    
+    def start(self):
+        """Avvia il thread del listener."""
+        self._thread = threading.Thread(target=self._run, name="log-listener", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 5.0):
+        """Scrive i record ancora in coda e ferma il thread."""
+        if self._thread is None:
+            return
+        self.queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+    
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = _STOP in batch
+            self._write([record for record in batch if record is not _STOP])
+            if stop:
+                return
+    
+    def _write(self, records: List[logging.LogRecord]):
+        lines = []
+        
+        dropped = self.handler.dropped
+        if dropped > self._reported_drops:
+            lines.append(self.formatter.format(logging.LogRecord(
+                __name__, logging.WARNING, __file__, 0,
+                "Log scartati per coda piena: %d", (dropped - self._reported_drops,), None
+            )))
+            self._reported_drops = dropped
+        
+        for record in records:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                self.handler.handleError(record)
+        
+        if not lines:
+            return
+        try:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        except Exception:
+            # Come logging.Handler: un errore di scrittura non deve fermare il thread
+            pass
+
+
+# Listener attivo in modalità asincrona (None in modalità sincrona)
+_listener: Optional[BatchingQueueListener] = None
+# Handler aggiunto al root logger dall'ultima setup_logging
+_handler: Optional[logging.Handler] = None
+
+
+def _create_formatter(fast: bool = False, compact: bool = False) -> logging.Formatter:
+    if fast:
+        return FastJsonFormatter(compact=compact)
+    return CustomJsonFormatter(
+        '%(timestamp)s %(level)s %(name)s %(message)s',
+        timestamp=True
+    )
+
+
+def setup_logging(
+    debug: bool = False,
+    async_mode: bool = False,
+    queue_size: int = 10000,
+    overflow: str = "drop_newest",
+    fast_formatter: bool = False,
+    compact_json: bool = False
+):
     """
     Configura il logging strutturato per l'applicazione.
     
     Args:
         debug: Se True, imposta il livello a DEBUG
+        async_mode: Se True, i record passano da una coda in memoria e vengono
+            formattati e scritti da un thread dedicato (nessuna I/O nel thread
+            che logga)
+        queue_size: Record massimi in coda (solo async_mode)
+        overflow: Politica con la coda piena: drop_newest, drop_oldest o block
+        fast_formatter: Se True, usa FastJsonFormatter (stesso output)
+        compact_json: Con fast_formatter, JSON compatto senza escape dei
+            caratteri non ASCII (formato diverso; orjson se installato)
+    
+    Può essere chiamata più volte nello stesso processo (es. da app.server
+    e poi da app.main): l'handler precedente viene sostituito.
     """
+    global _listener, _handler
+    
     # Determina il livello di log
     log_level = logging.DEBUG if debug else logging.INFO
     
-    # Crea handler per stdout
-    handler = logging.StreamHandler(sys.stdout)
-    
     # Usa JSON formatter
-    formatter = CustomJsonFormatter(
-        '%(timestamp)s %(level)s %(name)s %(message)s',
-        timestamp=True
-    )
-    handler.setFormatter(formatter)
+    formatter = _create_formatter(fast_formatter, compact_json)
+    
+    # Ferma l'eventuale listener di una configurazione precedente
+    shutdown_logging()
+    
+    if async_mode:
+        # Handler che accoda i record; il listener li scrive su stdout
+        log_queue = queue.Queue(maxsize=queue_size)
+        handler = BoundedQueueHandler(log_queue, overflow=overflow)
+        _listener = BatchingQueueListener(log_queue, formatter, handler)
+        _listener.start()
+        atexit.register(shutdown_logging)
+    else:
+        # Crea handler per stdout
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(formatter)
     
     # Configura root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
+    if _handler is not None:
+        root_logger.removeHandler(_handler)
     root_logger.addHandler(handler)
+    _handler = handler
     
     # Riduci verbosità di alcuni logger di terze parti
     logging.getLogger('boto3').setLevel(logging.WARNING)
@@ -59,10 +361,35 @@ def setup_logging(debug: bool = False):
     
     logging.info("Logging strutturato configurato", extra={
         "log_level": logging.getLevelName(log_level),
-        "format": "JSON"
+        "format": "JSON",
+        "async": async_mode
     })
 
 
+def shutdown_logging():
+    """
+    Scrive i log ancora in coda e ferma il thread del listener.
+    I log successivi vengono scritti direttamente su stdout.
+    Non fa nulla in modalità sincrona.
+    """
+    global _listener, _handler
+    
+    listener, _listener = _listener, None
+    if listener is None:
+        return
+    
+    root_logger = logging.getLogger()
+    root_logger.removeHandler(listener.handler)
+    
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(listener.formatter)
+    root_logger.addHandler(handler)
+    # Sostituito dalla prossima setup_logging
+    _handler = handler
+    
+    listener.stop()
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Ottiene un logger configurato.
@@ -3,81 +3,214 @@
 FastAPI application con integrazione AWS DynamoDB e Secrets Manager.
 Progetto didattico per insegnare best practices AWS.
 """
+import asyncio
 import logging
-from datetime import datetime
+import os
+from datetime import datetime, timezone
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, status
-from fastapi.responses import JSONResponse
-from botocore.exceptions import ClientError, NoCredentialsError
+from typing import List, Literal, Optional
+from fastapi import Body, FastAPI, Header, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from botocore.exceptions import BotoCoreError, ClientError
 
+from app import IMPORT_STARTED, metrics
+from app.cache import ItemCache
 from app.config import settings
-from app.database import DynamoDBClient, ItemNotFoundException
+from app.health import HealthMonitor
+from app.database import AsyncDynamoDBClient
+from app.etag import if_none_match as etag_matches, item_etag, page_etag
+from app.storage import (
+    ItemAlreadyExistsException,
+    ItemNotFoundException,
+    create_backend,
+)
 from app.aws_secrets import SecretsClient
+from app.pagination import InvalidPageTokenError, PageTokenCodec
+from app.serialization import ItemSerializer
+from app.startup import StartupTimer
 from app.models import (
+    BatchCreateResponse,
+    BatchGetRequest,
+    BatchGetResponse,
+    BatchItemError,
+    CacheStatsResponse,
     ItemCreate,
     ItemResponse,
     ItemsListResponse,
     HealthResponse,
+    ProbeResponse,
     ConfigResponse,
     ErrorResponse,
 )
-from app.logging_config import setup_logging, get_logger
-from app.middleware import RequestLoggingMiddleware
+from app.logging_config import setup_logging, shutdown_logging, get_logger
+from app.middleware import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+    RequestLoggingMiddleware,
+)
 
 # Configurazione logging strutturato
-setup_logging(debug=settings.debug)
+setup_logging(
+    debug=settings.debug,
+    async_mode=settings.log_async,
+    queue_size=settings.log_queue_size,
+    overflow=settings.log_queue_overflow,
+    fast_formatter=settings.log_fast_formatter,
+    compact_json=settings.log_compact_json,
+)
 logger = get_logger(__name__)
 
 # Client globali (inizializzati al startup)
-db_client: DynamoDBClient = None
+db_client: AsyncDynamoDBClient = None
 secrets_client: SecretsClient = None
+page_tokens: PageTokenCodec = None
+health_monitor: HealthMonitor = None
 
+# Serializzazione delle risposte con items (FAST_SERIALIZATION)
+serializer = ItemSerializer(settings.fast_serialization)
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """
-    Gestisce il ciclo di vita dell'applicazione.
-    Inizializza i client AWS all'avvio.
+
+def apply_secrets(secret_data: dict):
+    """Aggiorna la configurazione con i valori del secret (anche dopo una rotazione)."""
+    settings.api_key = secret_data.get("api_key")
+    settings.database_encryption_key = secret_data.get("database_encryption_key")
+
+
+def _load_secrets() -> bool:
     """
-    global db_client, secrets_client
+    Crea il SecretsClient e carica i secrets (chiamata in un thread).
+    Se termina dopo il timeout di avvio i secrets vengono applicati comunque,
+    appena arrivano.
 
-    logger.info("=== Avvio applicazione FastAPI AWS Tutorial ===")
+    Returns:
+        True se i secrets sono stati caricati
+    """
+    global secrets_client
 
+    secrets_client = SecretsClient(
+        region=settings.aws_region,
+        ttl_seconds=settings.secret_cache_ttl_seconds,
+    )
     try:
-        # Inizializza Secrets Manager client
-        logger.info("Inizializzazione SecretsClient...")
-        secrets_client = SecretsClient(region=settings.aws_region)
-
-        # Carica secrets (opzionale, solo se il secret esiste)
+        secret_data = secrets_client.get_secret(settings.secret_name)
+    except (ClientError, BotoCoreError) as e:
+        # In sviluppo locale, le credenziali AWS potrebbero non essere configurate
+        logger.warning(f"Impossibile caricare secrets: {e}. Continuo senza secrets.")
+        return False
+    except ValueError as e:
+        # Secret non JSON: errore di configurazione, ma non blocca l'avvio
+        logger.error(f"Impossibile caricare secrets: {e}. Continuo senza secrets.")
+        return False
+
+    apply_secrets(secret_data)
+    # Poi le nuove versioni arrivano in background
+    secrets_client.subscribe(settings.secret_name, apply_secrets)
+    secrets_client.start_refresh(settings.secret_refresh_interval_seconds)
+    logger.info("Secrets caricati con successo")
+    return True
+
+
+async def _start_secrets(startup: StartupTimer):
+    """Carica i secrets, senza attendere oltre STARTUP_SECRETS_TIMEOUT_SECONDS."""
+    with startup.phase("secrets"):
+        # shield: allo scadere del timeout il caricamento continua nel thread
+        loading = asyncio.ensure_future(asyncio.to_thread(_load_secrets))
         try:
-            secret_data = secrets_client.get_secret(settings.secret_name)
-            settings.api_key = secret_data.get("api_key")
-            settings.database_encryption_key = secret_data.get(
-                "database_encryption_key"
+            await asyncio.wait_for(
+                asyncio.shield(loading), timeout=settings.startup_secrets_timeout_seconds
             )
-            logger.info("Secrets caricati con successo")
-        except (ClientError, NoCredentialsError) as e:
-            # In sviluppo locale, le credenziali AWS potrebbero non essere configurate
+        except asyncio.TimeoutError:
             logger.warning(
-                f"Impossibile caricare secrets: {e}. Continuo senza secrets."
+                f"Secrets non caricati entro {settings.startup_secrets_timeout_seconds}s: "
+                "continuo, verranno applicati appena disponibili"
             )
 
-        # Inizializza DynamoDB client
-        logger.info("Inizializzazione DynamoDBClient...")
-        db_client = DynamoDBClient(
-            table_name=settings.dynamodb_table_name, region=settings.aws_region
-        )
 
-        # Verifica connessione
-        try:
-            if db_client.health_check():
-                logger.info("Connessione a DynamoDB verificata con successo")
-        except (ClientError, NoCredentialsError) as e:
-            # In sviluppo locale, potrebbe non esserci connessione a DynamoDB
-            logger.warning(
-                f"Impossibile verificare connessione DynamoDB: {e}. Continuo comunque."
+async def _start_storage(startup: StartupTimer) -> AsyncDynamoDBClient:
+    """Crea il client dello storage: senza storage l'avvio fallisce."""
+    with startup.phase("storage"):
+        logger.info(f"Inizializzazione storage backend: {settings.storage_backend}...")
+        # In un thread: SQLite apre il database, DynamoDB importa boto3
+        # (nessuna chiamata ad AWS, le resource sono create alla prima richiesta)
+        backend = await asyncio.wait_for(
+            asyncio.to_thread(create_backend, settings),
+            timeout=settings.startup_storage_timeout_seconds,
+        )
+        return AsyncDynamoDBClient(
+            backend,
+            max_workers=settings.dynamodb_max_workers,
+            scan_segments=settings.scan_segments,
+            batch_max_retries=settings.batch_max_retries,
+            cache=ItemCache(
+                max_size=settings.item_cache_max_size,
+                ttl_seconds=settings.item_cache_ttl_seconds,
+                negative_ttl_seconds=settings.item_cache_negative_ttl_seconds,
             )
+            if settings.item_cache_enabled
+            else None,
+            coalesce_reads=settings.item_coalescing_enabled,
+            write_queue={
+                # BatchWriteItem accetta al massimo 25 items
+                "max_batch_size": min(settings.write_max_batch_size, 25),
+                "flush_interval_ms": settings.write_flush_interval_ms,
+                "max_queue_size": settings.write_queue_max_size,
+            }
+            if settings.write_coalescing_enabled
+            else None,
+        )
+
+
+async def _report_ready(startup: StartupTimer):
+    """Logga l'esito del primo health check e il tempo di avvio fino alla readiness."""
+    await health_monitor.wait_checked()
+    if health_monitor.ready:
+        metrics.STARTUP_READY_DURATION.set(value=round(startup.elapsed, 6))
+        logger.info(
+            f"Connessione a DynamoDB verificata con successo dopo {startup.elapsed * 1000:.0f} ms"
+        )
+    else:
+        # In sviluppo locale, potrebbe non esserci connessione a DynamoDB
+        logger.warning("Impossibile verificare connessione DynamoDB. Continuo comunque.")
+
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Gestisce il ciclo di vita dell'applicazione.
+    Inizializza i client AWS all'avvio: secrets e storage in parallelo,
+    verifica di DynamoDB in background dopo l'avvio.
+    """
+    global db_client, page_tokens, health_monitor
+
+    startup = StartupTimer(started=IMPORT_STARTED)
+    startup.record("import", startup.elapsed)
+    logger.info("=== Avvio applicazione FastAPI AWS Tutorial ===")
+
+    try:
+        # Secrets e storage sono indipendenti: inizializzati in parallelo
+        _, db_client = await asyncio.gather(_start_secrets(startup), _start_storage(startup))
+
+        # Token di paginazione firmati con una chiave condivisa tra le istanze
+        # (o almeno tra i worker di questa istanza, vedi app/server.py). Solo
+        # chiavi dalla configurazione: i secrets possono arrivare dopo il
+        # timeout di avvio, e a worker diversi in momenti diversi
+        page_tokens = PageTokenCodec(
+            settings.pagination_token_secret or settings.server_shared_secret
+        )
+
+        # Monitoraggio in background di DynamoDB: il primo check parte subito
+        # senza ritardare l'avvio (fino al risultato /readyz risponde 503);
+        # gli endpoint di health check useranno lo stato in memoria
+        health_monitor = HealthMonitor(
+            db_client.health_check,
+            interval_seconds=settings.health_check_interval_seconds,
+            max_staleness_seconds=settings.health_check_max_staleness_seconds,
+            timeout_seconds=settings.health_check_timeout_seconds,
+        )
+        health_monitor.start()
+        ready_report = asyncio.create_task(_report_ready(startup))
+
+        startup.finish()
         logger.info("=== Applicazione avviata con successo ===")
 
     except Exception as e:
@@ -86,8 +219,19 @@ async def lifespan(app: FastAPI):
 
     yield
 
-    # Cleanup (se necessario)
+    # Cleanup
     logger.info("=== Shutdown applicazione ===")
+    ready_report.cancel()
+    if health_monitor:
+        await health_monitor.stop()
+    if db_client:
+        await db_client.drain()
+        db_client.close()
+    if secrets_client:
+        secrets_client.close()
+
+    # Scrive i log ancora in coda (solo con logging asincrono)
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -97,8 +241,51 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Compressione (il middleware aggiunto per primo è il più interno)
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+    )
+
 # Aggiungi middleware per logging
-app.add_middleware(RequestLoggingMiddleware)
+app.add_middleware(
+    RequestLoggingMiddleware,
+    sample_rate=settings.log_sample_rate,
+    slow_request_ms=settings.slow_request_threshold_ms,
+)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    if settings.metrics_worker_label:
+        metrics.REGISTRY.set_constant_labels(worker=os.getpid())
+
+
+def _client_stat(component: str, key: str):
+    """Callback per le metriche lette dalle statistiche di cache e coalescing."""
+
+    def read():
+        source = getattr(db_client, component, None) if db_client else None
+        return source.stats()[key] if source else None
+
+    return read
+
+
+for _name, _type, _component, _key, _doc in (
+    ("item_cache_size", "gauge", "cache", "size", "Items in cache"),
+    ("item_cache_hits_total", "counter", "cache", "hits", "Letture servite dalla cache"),
+    ("item_cache_negative_hits_total", "counter", "cache", "negative_hits",
+     "Letture di ID inesistenti servite dalla cache"),
+    ("item_cache_misses_total", "counter", "cache", "misses", "Letture che hanno richiesto DynamoDB"),
+    ("item_cache_evictions_total", "counter", "cache", "evictions", "Items rimossi con la cache piena"),
+    ("item_cache_expirations_total", "counter", "cache", "expirations", "Items rimossi perché scaduti"),
+    ("item_coalescing_calls_total", "counter", "coalescer", "calls", "Letture per ID eseguite su DynamoDB"),
+    ("item_coalescing_shared_total", "counter", "coalescer", "shared",
+     "Letture per ID servite da una chiamata già in corso"),
+    ("item_coalescing_inflight", "gauge", "coalescer", "inflight", "Letture per ID in corso"),
+):
+    metrics.register_callback(_name, _doc, _type, _client_stat(_component, _key))
 
 
 @app.get(
@@ -108,14 +295,7 @@ app.add_middleware(RequestLoggingMiddleware)
 )
 async def read_root():
     """Endpoint di benvenuto con informazioni sullo stato del sistema."""
-    db_status = "disconnected"
-
-    if db_client:
-        try:
-            if db_client.health_check():
-                db_status = "connected"
-        except Exception:
-            db_status = "error"
+    db_status = health_monitor.database_status if health_monitor else "disconnected"
 
     return {
         "message": "Benvenuto al FastAPI AWS Tutorial!",
@@ -124,7 +304,10 @@ async def read_root():
         "endpoints": {
             "docs": "/docs",
             "health": "/health",
+            "liveness": "/livez",
+            "readiness": "/readyz",
             "config": "/config",
+            "metrics": "/metrics",
             "items": "/items",
         },
     }
@@ -134,25 +317,55 @@ async def read_root():
     "/health",
     response_model=HealthResponse,
     summary="Health check",
-    description="Verifica lo stato di salute dell'applicazione e della connessione a DynamoDB",
+    description="Stato di salute dell'applicazione e della connessione a DynamoDB "
+    "(dall'ultimo check in background, senza chiamate a AWS)",
 )
 async def health_check():
     """Endpoint per health check dell'applicazione."""
-    db_status = "disconnected"
-    overall_status = "unhealthy"
-
-    try:
-        if db_client and db_client.health_check():
-            db_status = "connected"
-            overall_status = "healthy"
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        db_status = "error"
+    if not health_monitor:
+        return HealthResponse(
+            status="unhealthy",
+            database="disconnected",
+            timestamp=datetime.utcnow().isoformat(),
+        )
 
+    checked_at = health_monitor.checked_at or datetime.utcnow()
     return HealthResponse(
-        status=overall_status,
-        database=db_status,
-        timestamp=datetime.utcnow().isoformat(),
+        status="healthy" if health_monitor.ready else "unhealthy",
+        database=health_monitor.database_status,
+        timestamp=checked_at.isoformat(),
+    )
+
+
+@app.get(
+    "/livez",
+    response_model=ProbeResponse,
+    summary="Liveness probe",
+    description="Risponde 200 finché il processo è attivo. Non verifica le dipendenze.",
+)
+async def liveness():
+    """Liveness probe: nessuna chiamata esterna."""
+    return ProbeResponse(status="alive")
+
+
+@app.get(
+    "/readyz",
+    response_model=ProbeResponse,
+    summary="Readiness probe",
+    description="Risponde 200 se l'ultimo check di DynamoDB è riuscito e recente, 503 altrimenti",
+    responses={503: {"model": ProbeResponse}},
+)
+async def readiness():
+    """Readiness probe basata sullo stato in memoria del database."""
+    if health_monitor and health_monitor.ready:
+        return ProbeResponse(status="ready", database=health_monitor.database_status)
+
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=ProbeResponse(
+            status="not_ready",
+            database=health_monitor.database_status if health_monitor else "disconnected",
+        ).model_dump(),
     )
 
 
@@ -176,6 +389,36 @@ async def get_config():
     )
 
 
+@app.get(
+    "/cache/stats",
+    response_model=CacheStatsResponse,
+    summary="Statistiche cache",
+    description="Contatori della cache degli items (hit, miss, eviction) per dimensionarla",
+)
+async def cache_stats():
+    """Endpoint con le statistiche della cache degli items."""
+    if not db_client or not db_client.cache:
+        return CacheStatsResponse(enabled=False)
+
+    return CacheStatsResponse(enabled=True, **db_client.cache.stats())
+
+
+@app.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Metriche",
+    description="Metriche dell'applicazione in formato testo Prometheus: richieste e latenze "
+    "per route, richieste in corso, latenze e capacità consumata per operazione DynamoDB, "
+    "cache e coalescing",
+)
+async def get_metrics():
+    """Endpoint con le metriche in formato Prometheus."""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.post(
     "/items",
     response_model=ItemResponse,
@@ -186,8 +429,7 @@ async def get_config():
 async def create_item(item: ItemCreate):
     """Crea un nuovo item."""
     try:
-        item_id = db_client.create_item(item.model_dump())
-        created_item = db_client.get_item(item_id)
+        created_item = await db_client.create_item(item.model_dump())
 
         return ItemResponse(**created_item)
 
@@ -199,21 +441,157 @@ async def create_item(item: ItemCreate):
         )
 
 
+@app.post(
+    "/items/batch",
+    response_model=BatchCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Crea items in batch",
+    description="Crea molti items con una sola richiesta (DynamoDB BatchWriteItem). "
+    "Risponde 201 se tutti gli items sono stati creati, 207 se alcuni sono falliti.",
+    responses={207: {"model": BatchCreateResponse}},
+)
+async def batch_create_items(
+    response: Response,
+    items: List[ItemCreate] = Body(
+        ..., min_length=1, max_length=settings.batch_max_items
+    ),
+):
+    """Crea molti items in una sola richiesta."""
+    created, failed = await db_client.batch_create_items(
+        [item.model_dump() for item in items]
+    )
+
+    if failed:
+        logger.warning(f"Creazione batch: {len(failed)} items non creati")
+        response.status_code = status.HTTP_207_MULTI_STATUS
+
+    return BatchCreateResponse(
+        items=[ItemResponse(**item) for item in created],
+        failed=[BatchItemError(index=index, error=error) for index, error in failed],
+        created_count=len(created),
+        failed_count=len(failed),
+    )
+
+
+@app.post(
+    "/items/batch-get",
+    response_model=BatchGetResponse,
+    summary="Recupera items in batch",
+    description="Recupera molti items per ID con una sola richiesta (DynamoDB BatchGetItem). "
+    "Gli ID inesistenti sono elencati in `missing` invece di restituire 404.",
+)
+async def batch_get_items(request: BatchGetRequest):
+    """Recupera molti items per ID."""
+    if len(request.ids) > settings.batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Massimo {settings.batch_max_items} ID per richiesta",
+        )
+
+    items, missing, unprocessed = await db_client.batch_get_items(request.ids)
+
+    return serializer.page(
+        BatchGetResponse,
+        items,
+        missing=missing,
+        unprocessed=unprocessed,
+        count=len(items),
+    )
+
+
 @app.get(
     "/items",
     response_model=ItemsListResponse,
     summary="Lista items",
-    description="Recupera tutti gli items dal database",
+    description="Recupera gli items dal database, una pagina alla volta. "
+    "Per la pagina successiva passare il `next_token` della risposta. "
+    "Con `tag` (ripetibile) restituisce solo gli items con tutti i tag "
+    "(`tag_mode=and`) o con almeno uno (`tag_mode=or`), letti dall'indice dei tag. "
+    "Con `created_after`, `created_before` o `order` restituisce gli items in ordine "
+    "di creazione (default dal più recente), letti dall'indice per data di creazione. "
+    "Con `fields` (es. `fields=name,tags`) ogni item contiene solo i campi indicati "
+    "più `item_id`. La risposta ha un `ETag`: con `If-None-Match` uguale restituisce 304.",
+    responses={304: {"description": "La pagina non è cambiata"}},
 )
-async def list_items(limit: int = 100):
-    """Lista tutti gli items."""
+async def list_items(
+    response: Response,
+    limit: int = Query(100, ge=1, le=settings.max_page_size),
+    next_token: Optional[str] = Query(
+        None, description="Token restituito dalla pagina precedente"
+    ),
+    tag: Optional[List[str]] = Query(
+        None, description="Filtra per tag (ripetibile: ?tag=a&tag=b)"
+    ),
+    tag_mode: Literal["and", "or"] = Query(
+        "and", description="and = items con tutti i tag, or = con almeno uno"
+    ),
+    created_after: Optional[datetime] = Query(
+        None, description="Solo items creati dopo questo istante (ISO-8601, default UTC)"
+    ),
+    created_before: Optional[datetime] = Query(
+        None, description="Solo items creati prima di questo istante (ISO-8601, default UTC)"
+    ),
+    order: Optional[Literal["asc", "desc"]] = Query(
+        None, description="Ordine di creazione: desc = dal più recente, asc = dal più vecchio"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Campi da restituire, separati da virgola (default: tutti)"
+    ),
+    if_none_match: Optional[str] = Header(None),
+):
+    """Lista una pagina di items."""
+    selected = _parse_fields(fields)
+    by_created = created_after is not None or created_before is not None or order is not None
+    if tag and by_created:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="I filtri per tag e per data di creazione non sono combinabili",
+        )
+    if tag:
+        items, token = await _list_items_by_tags(tag, tag_mode, limit, next_token, selected)
+    elif by_created:
+        items, token = await _list_items_by_created(
+            created_after, created_before, order or "desc", limit, next_token, selected
+        )
+    else:
+        items, token = await _list_items_by_scan(limit, next_token, selected)
+
+    etag = page_etag(items, token, selected)
+    matched = etag_matches(if_none_match, etag)
+    if matched:
+        return _not_modified(matched)
+    return _with_etag(
+        serializer.page(
+            ItemsListResponse, items, fields=selected, count=len(items), next_token=token
+        ),
+        response,
+        etag,
+    )
+
+
+async def _list_items_by_scan(
+    limit: int, next_token: Optional[str], fields: Optional[List[str]]
+):
+    """Pagina di GET /items senza filtri (scansione parallela)."""
     try:
-        items = db_client.list_items(limit=limit)
+        positions = None
+        if next_token:
+            positions = page_tokens.decode(next_token).get("segments")
+            if not isinstance(positions, list):
+                raise InvalidPageTokenError("Token di paginazione non valido")
+    except InvalidPageTokenError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-        return ItemsListResponse(
-            items=[ItemResponse(**item) for item in items], count=len(items)
+    try:
+        result = await db_client.parallel_scan(
+            limit=limit, positions=positions, fields=_read_fields(fields)
+        )
+    except ValueError:
+        # Token generato con un numero di segmenti diverso da quello attuale
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token di paginazione non più valido, ricominciare dalla prima pagina",
         )
-
     except ClientError as e:
         logger.error(f"Errore nel recupero degli items: {e}")
         raise HTTPException(
@@ -221,18 +599,205 @@ async def list_items(limit: int = 100):
             detail="Errore nella comunicazione con il database",
         )
 
+    next_token = None if result.done else page_tokens.encode({"segments": result.positions})
+    return result.items, next_token
+
+
+async def _list_items_by_tags(
+    tags: List[str],
+    tag_mode: str,
+    limit: int,
+    next_token: Optional[str],
+    fields: Optional[List[str]],
+):
+    """Pagina di GET /items filtrata per tag (vedi StorageBackend.query_by_tags)."""
+    tags = list(dict.fromkeys(tags))
+    if len(tags) > settings.max_query_tags:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Massimo {settings.max_query_tags} tag per ricerca",
+        )
+
+    # Il token vale solo per la stessa ricerca
+    query = {"tags": tags, "mode": tag_mode}
+    start_key = None
+    try:
+        if next_token:
+            state = page_tokens.decode(next_token)
+            if state.get("query") != query or not isinstance(state.get("key"), dict):
+                raise InvalidPageTokenError("Token di paginazione non valido")
+            start_key = state["key"]
+    except InvalidPageTokenError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    try:
+        items, last_key = await db_client.query_by_tags(
+            tags,
+            match_all=tag_mode == "and",
+            limit=limit,
+            exclusive_start_key=start_key,
+            fields=_read_fields(fields),
+        )
+    except ClientError as e:
+        logger.error(f"Errore nella ricerca per tag: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Errore nella comunicazione con il database",
+        )
+
+    return items, page_tokens.encode({"query": query, "key": last_key}) if last_key else None
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Campi del parametro `fields` (separati da virgola), validati su ItemResponse."""
+    if fields is None:
+        return None
+    selected = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in selected if name not in ItemResponse.model_fields]
+    if not selected or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Parametro fields non valido: {fields!r}. "
+            f"Campi disponibili: {', '.join(ItemResponse.model_fields)}",
+        )
+    return selected
+
+
+def _read_fields(fields: Optional[List[str]]) -> Optional[List[str]]:
+    """Attributi da leggere per `fields`: anche updated_at, che serve per l'ETag."""
+    return None if fields is None else [*fields, "updated_at"]
+
+
+def _not_modified(etag: str) -> Response:
+    """
+    Risposta 304: il client ha già questa rappresentazione. L'ETag è quello
+    della rappresentazione in cache, con l'eventuale suffisso della codifica
+    (CompressionMiddleware non modifica le risposte 304).
+    """
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Vary": "Accept-Encoding"},
+    )
+
+
+def _with_etag(result, response: Response, etag: str):
+    """Aggiunge l'ETag alla risposta, sia essa una Response o un modello."""
+    if isinstance(result, Response):
+        result.headers["ETag"] = etag
+    else:
+        response.headers["ETag"] = etag
+    return result
+
+
+def _iso_utc(value: Optional[datetime]) -> Optional[str]:
+    """Istante nel formato di created_at (ISO-8601 UTC senza fuso, microsecondi)."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec="microseconds")
+
+
+async def _list_items_by_created(
+    created_after: Optional[datetime],
+    created_before: Optional[datetime],
+    order: str,
+    limit: int,
+    next_token: Optional[str],
+    fields: Optional[List[str]],
+):
+    """Pagina di GET /items in ordine di creazione (vedi StorageBackend.query_by_created)."""
+    # Il token vale solo per la stessa query
+    query = {
+        "after": _iso_utc(created_after),
+        "before": _iso_utc(created_before),
+        "order": order,
+    }
+    start_key = None
+    try:
+        if next_token:
+            state = page_tokens.decode(next_token)
+            if state.get("created") != query or not isinstance(state.get("key"), dict):
+                raise InvalidPageTokenError("Token di paginazione non valido")
+            start_key = state["key"]
+    except InvalidPageTokenError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    try:
+        items, last_key = await db_client.query_by_created(
+            created_after=query["after"],
+            created_before=query["before"],
+            descending=order == "desc",
+            limit=limit,
+            exclusive_start_key=start_key,
+            fields=_read_fields(fields),
+        )
+    except ClientError as e:
+        logger.error(f"Errore nella query per data di creazione: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Errore nella comunicazione con il database",
+        )
+
+    return items, page_tokens.encode({"created": query, "key": last_key}) if last_key else None
+
+
+@app.get(
+    "/items/export",
+    response_class=StreamingResponse,
+    summary="Esporta items",
+    description="Esporta tutti gli items in formato NDJSON (un oggetto JSON per riga), "
+    "in streaming: la memoria usata non dipende dalla dimensione della tabella",
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def export_items():
+    """Esporta tutti gli items in streaming (NDJSON)."""
+    pages = db_client.iter_pages(page_size=settings.export_page_size)
+
+    # Legge la prima pagina prima di rispondere: se DynamoDB non è
+    # raggiungibile il client riceve un 503 invece di uno stream troncato
+    try:
+        first_page = await anext(pages, [])
+    except ClientError as e:
+        await pages.aclose()
+        logger.error(f"Errore nell'export degli items: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Errore nella comunicazione con il database",
+        )
+
+    async def stream():
+        try:
+            yield serializer.ndjson(first_page)
+            async for page in pages:
+                yield serializer.ndjson(page)
+        finally:
+            await pages.aclose()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
 
 @app.get(
     "/items/{item_id}",
     response_model=ItemResponse,
     summary="Recupera item",
-    description="Recupera un item specifico per ID",
+    description="Recupera un item specifico per ID. "
+    "Con `fields` (es. `fields=name,tags`) restituisce solo i campi indicati più `item_id`. "
+    "La risposta ha un `ETag` (da `updated_at`): con `If-None-Match` uguale restituisce 304.",
+    responses={304: {"description": "L'item non è cambiato"}},
 )
-async def get_item(item_id: str):
+async def get_item(
+    item_id: str,
+    response: Response,
+    fields: Optional[str] = Query(
+        None, description="Campi da restituire, separati da virgola (default: tutti)"
+    ),
+    if_none_match: Optional[str] = Header(None),
+):
     """Recupera un item per ID."""
+    selected = _parse_fields(fields)
     try:
-        item = db_client.get_item(item_id)
-        return ItemResponse(**item)
+        item = await db_client.get_item(item_id, fields=_read_fields(selected))
 
     except ItemNotFoundException:
         raise HTTPException(
@@ -246,6 +811,12 @@ async def get_item(item_id: str):
             detail="Errore nella comunicazione con il database",
         )
 
+    etag = item_etag(item, selected)
+    matched = etag_matches(if_none_match, etag)
+    if matched:
+        return _not_modified(matched)
+    return _with_etag(serializer.item(item, fields=selected), response, etag)
+
 
 @app.delete(
     "/items/{item_id}",
@@ -256,7 +827,7 @@ async def get_item(item_id: str):
 async def delete_item(item_id: str):
     """Elimina un item."""
     try:
-        db_client.delete_item(item_id)
+        await db_client.delete_item(item_id)
         return None
 
     except ItemNotFoundException:
@@ -289,6 +860,15 @@ async def aws_client_error_handler(request, exc: ClientError):
     )
 
 
+@app.exception_handler(ItemAlreadyExistsException)
+async def item_already_exists_handler(request, exc: ItemAlreadyExistsException):
+    """Gestisce errori di item già esistente."""
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"error": "ItemAlreadyExists", "message": str(exc), "detail": None},
+    )
+
+
 @app.exception_handler(ItemNotFoundException)
 async def item_not_found_handler(request, exc: ItemNotFoundException):
     """Gestisce errori di item non trovato."""
@@ -0,0 +1,316 @@
+"""
+Metriche dell'applicazione in formato testo Prometheus.
+Implementazione minima senza dipendenze: contatori, gauge e istogrammi
+con label, aggiornati in memoria ed esposti da GET /metrics.
+"""
+import bisect
+import functools
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from botocore.exceptions import ClientError
+
+from app.storage.base import ItemAlreadyExistsException, ItemNotFoundException
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bucket (secondi) per la latenza delle richieste HTTP e delle chiamate DynamoDB
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DYNAMODB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric(ABC):
+    """
+    Metrica con label. I valori sono tenuti per combinazione di label;
+    gli aggiornamenti sono protetti da un lock (chiamate anche dai thread
+    del pool DynamoDB).
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple, object] = {}
+
+    @abstractmethod
+    def _samples(self) -> Iterable[str]:
+        """Righe dei campioni (senza HELP e TYPE)."""
+
+    def render(self) -> List[str]:
+        """Righe HELP, TYPE e campioni nel formato testo Prometheus."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        lines.extend(self._samples())
+        return lines
+
+
+class Counter(Metric):
+    """Contatore monotono."""
+
+    type = "counter"
+
+    def inc(self, *labels, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def _samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """Valore che può salire e scendere (es. richieste in corso)."""
+
+    type = "gauge"
+
+    def dec(self, *labels, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value: float):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    """
+    Istogramma a bucket fissi. observe() incrementa un solo bucket
+    (ricerca binaria); i conteggi cumulativi sono calcolati solo in render().
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = HTTP_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, *labels, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # [conteggi per bucket (+Inf in fondo), somma]
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def _samples(self):
+        with self._lock:
+            values = [(labels, list(counts), total) for labels, (counts, total) in self._values.items()]
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+
+class CallbackMetric(Metric):
+    """
+    Metrica letta al momento dell'export da una funzione (es. statistiche
+    della cache): nessun costo sul percorso delle richieste.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        type: str,
+        callback: Callable[[], Optional[float]]
+    ):
+        super().__init__(name, documentation)
+        self.type = type
+        self.callback = callback
+
+    def _samples(self):
+        value = self.callback()
+        if value is not None:
+            yield f"{self.name} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    """Insieme delle metriche esportate da /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+        # Label aggiunte a ogni campione (es. worker="<pid>" con più worker)
+        self._constant_labels = ""
+
+    def set_constant_labels(self, **labels):
+        """Label aggiunte a tutti i campioni esportati."""
+        self._constant_labels = ",".join(
+            f'{name}="{_escape(value)}"' for name, value in labels.items()
+        )
+
+    def _with_constant_labels(self, line: str) -> str:
+        # Il nome della metrica termina al primo "{" o spazio
+        brace, space = line.find("{"), line.find(" ")
+        if 0 <= brace < space:
+            return f"{line[:brace + 1]}{self._constant_labels},{line[brace + 1:]}"
+        return f"{line[:space]}{{{self._constant_labels}}}{line[space:]}"
+
+    def register(self, metric: Metric) -> Metric:
+        """Registra una metrica (sostituisce quella con lo stesso nome)."""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Tutte le metriche nel formato testo Prometheus."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        if self._constant_labels:
+            lines = [
+                line if line.startswith("#") else self._with_constant_labels(line)
+                for line in lines
+            ]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Richieste HTTP (route = template del path, es. /items/{item_id})
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "Richieste HTTP completate", ("method", "route", "status")
+))
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Durata delle richieste HTTP", ("method", "route")
+))
+HTTP_REQUESTS_IN_PROGRESS = REGISTRY.register(Gauge(
+    "http_requests_in_progress", "Richieste HTTP in corso", ("method",)
+))
+# Compressione delle risposte (byte prima e dopo, per codifica)
+HTTP_COMPRESSION_INPUT_BYTES = REGISTRY.register(Counter(
+    "http_compression_input_bytes_total", "Byte dei corpi compressi prima della compressione",
+    ("encoding",)
+))
+HTTP_COMPRESSION_OUTPUT_BYTES = REGISTRY.register(Counter(
+    "http_compression_output_bytes_total", "Byte dei corpi compressi inviati", ("encoding",)
+))
+
+# Chiamate DynamoDB (un'operazione = un metodo di DynamoDBClient, retry inclusi)
+DYNAMODB_OPERATION_DURATION = REGISTRY.register(Histogram(
+    "dynamodb_operation_duration_seconds", "Durata delle operazioni DynamoDB",
+    ("operation",), buckets=DYNAMODB_BUCKETS
+))
+DYNAMODB_OPERATION_ERRORS = REGISTRY.register(Counter(
+    "dynamodb_operation_errors_total", "Operazioni DynamoDB fallite", ("operation", "error")
+))
+DYNAMODB_CONSUMED_READ = REGISTRY.register(Counter(
+    "dynamodb_consumed_read_capacity_units_total",
+    "Read capacity units consumate (ReturnConsumedCapacity)", ("operation",)
+))
+DYNAMODB_CONSUMED_WRITE = REGISTRY.register(Counter(
+    "dynamodb_consumed_write_capacity_units_total",
+    "Write capacity units consumate (ReturnConsumedCapacity)", ("operation",)
+))
+
+# Avvio dell'applicazione (vedi app/startup.py): durata di ogni fase, totale
+# fino all'inizio del servizio e fino al primo health check (readiness)
+STARTUP_PHASE_DURATION = REGISTRY.register(Gauge(
+    "app_startup_phase_seconds", "Durata delle fasi di avvio", ("phase",)
+))
+STARTUP_DURATION = REGISTRY.register(Gauge(
+    "app_startup_seconds", "Durata dell'avvio fino all'inizio del servizio"
+))
+STARTUP_READY_DURATION = REGISTRY.register(Gauge(
+    "app_startup_ready_seconds", "Durata dell'avvio fino al primo health check riuscito"
+))
+
+
+def track_operation(operation: str):
+    """
+    Decoratore per i metodi di DynamoDBClient: misura la durata di ogni
+    chiamata e conta gli errori per tipo (codice AWS per i ClientError).
+    Le eccezioni di dominio (item non trovato, item già esistente) sono
+    esiti attesi e non vengono contate come errori.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except (ItemNotFoundException, ItemAlreadyExistsException):
+                raise
+            except ClientError as e:
+                DYNAMODB_OPERATION_ERRORS.inc(operation, e.response['Error']['Code'])
+                raise
+            except Exception as e:
+                # BotoCoreError (rete, credenziali, timeout) ed errori inattesi
+                DYNAMODB_OPERATION_ERRORS.inc(operation, type(e).__name__)
+                raise
+            finally:
+                DYNAMODB_OPERATION_DURATION.observe(
+                    operation, value=time.perf_counter() - start_time
+                )
+        return wrapper
+    return decorator
+
+
+def record_consumed_capacity(operation: str, consumed, write: bool = False):
+    """
+    Somma la capacità consumata riportata da DynamoDB.
+
+    Args:
+        operation: Nome dell'operazione (label)
+        consumed: Campo ConsumedCapacity della risposta (dict o lista per i batch)
+        write: True per le operazioni di scrittura
+    """
+    if not consumed:
+        return
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    units = sum(float(entry.get('CapacityUnits', 0)) for entry in consumed)
+    if units:
+        (DYNAMODB_CONSUMED_WRITE if write else DYNAMODB_CONSUMED_READ).inc(operation, amount=units)
+
+
+def register_callback(name: str, documentation: str, type: str, callback: Callable[[], Optional[float]]):
+    """Registra una metrica letta da callback al momento dell'export."""
+    REGISTRY.register(CallbackMetric(name, documentation, type, callback))
+
+
+def render() -> str:
+    """Testo esposto da GET /metrics."""
+    return REGISTRY.render()
@@ -1,64 +1,335 @@
 """
-Middleware per logging delle richieste/risposte.
+Middleware per logging delle richieste/risposte, metriche HTTP e
+compressione delle risposte.
 """
 import time
+import random
 import logging
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+import zlib
+from typing import Dict, Optional
+
+from app import metrics
+from app.etag import encoded_etag
+
+try:
+    import brotli
+except ImportError:  # dipendenza opzionale
+    brotli = None
 
 
 logger = logging.getLogger(__name__)
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """
-    Middleware che logga informazioni su ogni richiesta HTTP.
+    Middleware ASGI che logga informazioni su ogni richiesta HTTP.
+    
+    Scrive una sola riga di log a fine richiesta. Le richieste riuscite
+    possono essere campionate (sample_rate); errori e richieste lente
+    vengono sempre loggati.
     """
     
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app, sample_rate: float = 1.0, slow_request_ms: float = 1000.0):
+        """
+        Args:
+            app: Applicazione ASGI da avvolgere
+            sample_rate: Frazione delle richieste riuscite da loggare (0.0 - 1.0)
+            slow_request_ms: Oltre questa durata la richiesta è sempre loggata
+        """
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_request_ms = slow_request_ms
+    
+    async def __call__(self, scope, receive, send):
         """
         Processa la richiesta e logga informazioni.
         """
-        # Timestamp inizio
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Informazioni richiesta
-        request_info = {
-            "method": request.method,
-            "path": request.url.path,
-            "query_params": str(request.query_params),
-            "client_host": request.client.host if request.client else None,
-        }
+        # Timestamp inizio (clock monotono, non influenzato da cambi d'ora)
+        start_time = time.perf_counter()
+        status_code = 500
         
-        logger.info("Richiesta ricevuta", extra=request_info)
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
         
         # Processa la richiesta
         try:
-            response = await call_next(request)
-            
-            # Calcola durata
-            duration = time.time() - start_time
-            
-            # Log risposta
-            response_info = {
-                **request_info,
-                "status_code": response.status_code,
-                "duration_ms": round(duration * 1000, 2)
-            }
-            
-            logger.info("Richiesta completata", extra=response_info)
-            
-            return response
-            
+            await self.app(scope, receive, send_with_status)
+        
         except Exception as e:
             # Log errore
-            duration = time.time() - start_time
+            duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
             error_info = {
-                **request_info,
+                **self._request_info(scope),
                 "error": str(e),
                 "error_type": type(e).__name__,
-                "duration_ms": round(duration * 1000, 2)
+                "duration_ms": duration_ms
             }
             
             logger.error("Errore durante la richiesta", extra=error_info)
             raise
+        
+        duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+        is_error = status_code >= 400
+        is_slow = duration_ms >= self.slow_request_ms
+        
+        if not is_error and not is_slow and random.random() >= self.sample_rate:
+            return
+        
+        # Log risposta
+        response_info = {
+            **self._request_info(scope),
+            "status_code": status_code,
+            "duration_ms": duration_ms
+        }
+        
+        if status_code >= 500:
+            logger.error("Richiesta completata", extra=response_info)
+        elif is_error or is_slow:
+            logger.warning("Richiesta completata", extra=response_info)
+        else:
+            logger.info("Richiesta completata", extra=response_info)
+    
+    @staticmethod
+    def _request_info(scope) -> dict:
+        """Informazioni richiesta."""
+        client = scope.get("client")
+        return {
+            "method": scope["method"],
+            "path": scope["path"],
+            "query_params": scope.get("query_string", b"").decode("latin-1"),
+            "client_host": client[0] if client else None,
+        }
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI che aggiorna le metriche HTTP: richieste per route e
+    status, istogramma delle durate e richieste in corso.
+    
+    La route è il template del path (es. /items/{item_id}), non il path
+    richiesto, così il numero di serie resta limitato.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope["method"]
+        start_time = time.perf_counter()
+        status_code = 500
+        
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        metrics.HTTP_REQUESTS_IN_PROGRESS.inc(method)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.HTTP_REQUESTS_IN_PROGRESS.dec(method)
+            # Il router salva la route trovata nello scope
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            metrics.HTTP_REQUESTS.inc(method, route, str(status_code))
+            metrics.HTTP_REQUEST_DURATION.observe(
+                method, route, value=time.perf_counter() - start_time
+            )
+
+
+# Tipi di contenuto compressi (testo e JSON; le immagini sono già compresse)
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        # wbits=31: formato gzip (header e CRC)
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    
+    def chunk(self, data: bytes) -> bytes:
+        # Z_SYNC_FLUSH: ogni chunk di uno stream arriva subito al client
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+    
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+    
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    """Codifiche di Accept-Encoding con il loro peso q."""
+    encodings = {}
+    for part in header.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[name] = quality
+    return encodings
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI che comprime le risposte JSON e di testo con brotli
+    (se il pacchetto è installato) o gzip, in base ad Accept-Encoding.
+    
+    I corpi più piccoli di minimum_size non vengono compressi (il guadagno
+    non compensa la CPU); le risposte in streaming (es. export NDJSON) sono
+    compresse un chunk alla volta. L'ETag della risposta compressa riceve
+    il suffisso della codifica (es. "...-gzip"), riconosciuto da
+    app.etag.if_none_match.
+    """
+    
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4
+    ):
+        """
+        Args:
+            app: Applicazione ASGI da avvolgere
+            minimum_size: Dimensione minima del corpo da comprimere (byte)
+            gzip_level: Livello di compressione gzip (1-9)
+            brotli_quality: Qualità di compressione brotli (0-11; 4 è un buon
+                compromesso per risposte generate a ogni richiesta)
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        # In ordine di preferenza a parità di peso
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+    
+    def _choose_encoding(self, scope) -> Optional[str]:
+        header = b",".join(
+            value for name, value in scope["headers"] if name == b"accept-encoding"
+        ).decode("latin-1")
+        if not header:
+            return None
+        accepted = _accepted_encodings(header)
+        best, best_quality = None, 0.0
+        for encoding in self.encodings:
+            quality = accepted.get(encoding, accepted.get("*", 0.0))
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+    
+    def _encoder(self, encoding: str):
+        if encoding == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        encoding = self._choose_encoding(scope)
+        start_message = None
+        encoder = None
+        passthrough = False
+        
+        async def send_compressed(message):
+            nonlocal start_message, encoder, passthrough
+            
+            if passthrough or message["type"] not in ("http.response.start", "http.response.body"):
+                await send(message)
+                return
+            
+            if message["type"] == "http.response.start":
+                # Rimandato al primo chunk: gli header dipendono dal corpo
+                start_message = message
+                return
+            
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            
+            if encoder is None:
+                headers = dict(start_message["headers"])
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                compressible = (
+                    content_type.startswith(COMPRESSIBLE_TYPES)
+                    and b"content-encoding" not in headers
+                    and start_message["status"] not in (204, 304)
+                )
+                if compressible:
+                    start_message = self._with_vary(start_message)
+                if (
+                    not compressible
+                    or encoding is None
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                
+                encoder = self._encoder(encoding)
+                data = encoder.chunk(body) if more_body else encoder.finish(body)
+                length = None if more_body else len(data)
+                await send(self._compressed_start(start_message, encoding, length))
+            else:
+                data = encoder.chunk(body) if more_body else encoder.finish(body)
+            
+            metrics.HTTP_COMPRESSION_INPUT_BYTES.inc(encoding, amount=len(body))
+            metrics.HTTP_COMPRESSION_OUTPUT_BYTES.inc(encoding, amount=len(data))
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+        
+        await self.app(scope, receive, send_compressed)
+    
+    @staticmethod
+    def _with_vary(start_message):
+        """La risposta dipende da Accept-Encoding (per le cache intermedie)."""
+        headers = list(start_message["headers"])
+        for index, (name, value) in enumerate(headers):
+            if name == b"vary":
+                if b"accept-encoding" not in value.lower():
+                    headers[index] = (name, value + b", Accept-Encoding")
+                break
+        else:
+            headers.append((b"vary", b"Accept-Encoding"))
+        return {**start_message, "headers": headers}
+    
+    @staticmethod
+    def _compressed_start(start_message, encoding: str, length: Optional[int]):
+        """Messaggio http.response.start della risposta compressa."""
+        headers = []
+        for name, value in start_message["headers"]:
+            if name == b"content-length":
+                continue
+            if name == b"etag":
+                value = encoded_etag(value.decode("latin-1"), f"-{encoding}").encode("latin-1")
+            headers.append((name, value))
+        headers.append((b"content-encoding", encoding.encode("latin-1")))
+        if length is not None:
+            headers.append((b"content-length", str(length).encode("latin-1")))
+        return {**start_message, "headers": headers}
@@ -2,8 +2,9 @@
 Modelli Pydantic per request/response dell'API.
 Forniscono validazione automatica e documentazione OpenAPI.
 """
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from functools import lru_cache
+from pydantic import BaseModel, Field, create_model
+from typing import FrozenSet, Optional, List, Type
 
 
 class ItemCreate(BaseModel):
@@ -23,9 +24,12 @@ class ItemCreate(BaseModel):
         max_length=500,
         examples=["Laptop per sviluppo con 16GB RAM"]
     )
+    # Massimo 99: su DynamoDB l'item e le voci dell'indice dei tag sono
+    # scritti da una transazione (al massimo 100 azioni)
     tags: List[str] = Field(
         default_factory=list,
         description="Lista di tag per categorizzare l'item",
+        max_length=99,
         examples=[["elettronica", "computer", "lavoro"]]
     )
     
@@ -45,8 +49,8 @@ class ItemResponse(BaseModel):
     """
     item_id: str = Field(
         ...,
-        description="ID univoco dell'item (UUID)",
-        examples=["123e4567-e89b-12d3-a456-426614174000"]
+        description="ID univoco dell'item (UUIDv7, ordinato per data di creazione)",
+        examples=["0194f9b5-5c40-7a1b-9c2d-3e4f5a6b7c8d"]
     )
     name: str = Field(
         ...,
@@ -77,7 +81,7 @@ class ItemResponse(BaseModel):
     class Config:
         json_schema_extra = {
             "example": {
-                "item_id": "123e4567-e89b-12d3-a456-426614174000",
+                "item_id": "0194f9b5-5c40-7a1b-9c2d-3e4f5a6b7c8d",
                 "name": "Laptop Dell XPS",
                 "description": "Laptop per sviluppo con 16GB RAM",
                 "tags": ["elettronica", "computer", "lavoro"],
@@ -87,6 +91,23 @@ class ItemResponse(BaseModel):
         }
 
 
+@lru_cache(maxsize=None)
+def item_projection_model(fields: FrozenSet[str]) -> Type[BaseModel]:
+    """
+    Modello con solo alcuni campi di ItemResponse (parametro `fields`),
+    con gli stessi tipi e lo stesso ordine: serializza solo quei campi.
+    Un modello per combinazione di campi, creato al primo utilizzo.
+    """
+    return create_model(
+        "ItemProjection",
+        **{
+            name: (info.annotation, info)
+            for name, info in ItemResponse.model_fields.items()
+            if name in fields
+        }
+    )
+
+
 class ItemsListResponse(BaseModel):
     """
     Modello per la risposta con lista di items.
@@ -99,6 +120,81 @@ class ItemsListResponse(BaseModel):
         ...,
         description="Numero di items restituiti"
     )
+    next_token: Optional[str] = Field(
+        None,
+        description="Token per la pagina successiva (null se non ci sono altre pagine)"
+    )
+
+
+class BatchItemError(BaseModel):
+    """
+    Modello per un item non creato in una richiesta batch.
+    """
+    index: int = Field(
+        ...,
+        description="Posizione dell'item nella richiesta (da 0)"
+    )
+    error: str = Field(
+        ...,
+        description="Codice dell'errore",
+        examples=["ProvisionedThroughputExceededException"]
+    )
+
+
+class BatchCreateResponse(BaseModel):
+    """
+    Modello per la risposta della creazione batch.
+    """
+    items: List[ItemResponse] = Field(
+        ...,
+        description="Items creati, nell'ordine della richiesta"
+    )
+    failed: List[BatchItemError] = Field(
+        default_factory=list,
+        description="Items non creati"
+    )
+    created_count: int = Field(
+        ...,
+        description="Numero di items creati"
+    )
+    failed_count: int = Field(
+        ...,
+        description="Numero di items non creati"
+    )
+
+
+class BatchGetRequest(BaseModel):
+    """
+    Modello per la lettura di più items per ID.
+    """
+    ids: List[str] = Field(
+        ...,
+        description="ID degli items da recuperare",
+        min_length=1,
+        examples=[["0194f9b5-5c40-7a1b-9c2d-3e4f5a6b7c8d"]]
+    )
+
+
+class BatchGetResponse(BaseModel):
+    """
+    Modello per la risposta della lettura batch.
+    """
+    items: List[ItemResponse] = Field(
+        ...,
+        description="Items trovati, nell'ordine della richiesta"
+    )
+    missing: List[str] = Field(
+        default_factory=list,
+        description="ID degli items che non esistono"
+    )
+    unprocessed: List[str] = Field(
+        default_factory=list,
+        description="ID non letti per throttling di DynamoDB (da richiedere di nuovo)"
+    )
+    count: int = Field(
+        ...,
+        description="Numero di items restituiti"
+    )
 
 
 class HealthResponse(BaseModel):
@@ -131,6 +227,22 @@ class HealthResponse(BaseModel):
         }
 
 
+class ProbeResponse(BaseModel):
+    """
+    Modello per la risposta delle probe di liveness/readiness.
+    """
+    status: str = Field(
+        ...,
+        description="Esito della probe",
+        examples=["alive", "ready", "not_ready"]
+    )
+    database: Optional[str] = Field(
+        None,
+        description="Stato del database secondo l'ultimo check in background",
+        examples=["connected", "stale"]
+    )
+
+
 class ConfigResponse(BaseModel):
     """
     Modello per la risposta con la configurazione (valori safe).
@@ -155,6 +267,36 @@ class ConfigResponse(BaseModel):
         }
 
 
+class CacheStatsResponse(BaseModel):
+    """
+    Modello per la risposta con le statistiche della cache degli items.
+    """
+    enabled: bool = Field(..., description="Indica se la cache è attiva")
+    size: int = Field(0, description="Items attualmente in cache")
+    max_size: int = Field(0, description="Dimensione massima della cache")
+    hits: int = Field(0, description="Letture servite dalla cache")
+    negative_hits: int = Field(0, description="Letture di ID inesistenti servite dalla cache")
+    misses: int = Field(0, description="Letture che hanno richiesto DynamoDB")
+    evictions: int = Field(0, description="Items rimossi perché la cache era piena")
+    expirations: int = Field(0, description="Items rimossi perché scaduti")
+    hit_ratio: float = Field(0.0, description="Frazione di letture servite dalla cache")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "enabled": True,
+                "size": 420,
+                "max_size": 10000,
+                "hits": 9500,
+                "negative_hits": 120,
+                "misses": 480,
+                "evictions": 0,
+                "expirations": 60,
+                "hit_ratio": 0.9525
+            }
+        }
+
+
 class ErrorResponse(BaseModel):
     """
     Modello per le risposte di errore.
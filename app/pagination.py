@@ -0,0 +1,105 @@
+"""
+Token di paginazione per GET /items.
+Lo stato della scansione (LastEvaluatedKey di DynamoDB) viene restituito
+al client come token opaco e firmato (HMAC-SHA256), così il client non
+può alterarlo.
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+from typing import Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidPageTokenError(ValueError):
+    """Eccezione sollevata quando un token di paginazione non è valido."""
+    pass
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class PageTokenCodec:
+    """
+    Codifica e verifica i token di paginazione.
+
+    Formato del token: <payload base64url>.<firma base64url>
+    Il payload è lo stato della scansione in JSON compatto.
+    """
+
+    def __init__(self, secret: Optional[str] = None):
+        """
+        Inizializza il codec.
+
+        Args:
+            secret: Chiave per la firma HMAC. Deve essere uguale su tutte
+                le istanze, altrimenti i token sono validi solo sull'istanza
+                che li ha generati.
+        """
+        if not secret:
+            logger.warning(
+                "Nessuna chiave per i token di paginazione: uso una chiave casuale "
+                "valida solo per questo processo"
+            )
+            secret = secrets.token_hex(32)
+        self._key = secret.encode("utf-8")
+
+    def _sign(self, payload: bytes) -> bytes:
+        return hmac.new(self._key, payload, hashlib.sha256).digest()[:16]
+
+    def encode(self, state: Optional[Dict]) -> Optional[str]:
+        """
+        Crea il token per la pagina successiva.
+
+        Args:
+            state: Stato da cui riprendere (es. LastEvaluatedKey di DynamoDB)
+
+        Returns:
+            Token opaco, o None se non ci sono altre pagine
+        """
+        if not state:
+            return None
+
+        payload = json.dumps(
+            state, separators=(",", ":"), sort_keys=True
+        ).encode("utf-8")
+        return f"{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+
+    def decode(self, token: str) -> Dict:
+        """
+        Verifica il token e restituisce lo stato della scansione.
+
+        Args:
+            token: Token ricevuto dal client
+
+        Returns:
+            Stato da cui riprendere la scansione
+
+        Raises:
+            InvalidPageTokenError: Se il token è malformato o la firma non è valida
+        """
+        try:
+            payload_part, signature_part = token.split(".")
+            payload = _b64decode(payload_part)
+            signature = _b64decode(signature_part)
+        except (ValueError, binascii.Error):
+            raise InvalidPageTokenError("Token di paginazione malformato")
+
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise InvalidPageTokenError("Token di paginazione non valido")
+
+        state = json.loads(payload)
+        if not isinstance(state, dict):
+            raise InvalidPageTokenError("Token di paginazione non valido")
+        return state
@@ -0,0 +1,175 @@
+"""
+Serializzazione veloce delle risposte con items.
+Evita di costruire un modello Pydantic per ogni riga di DynamoDB e
+restituisce direttamente i byte JSON; lo schema OpenAPI resta quello
+dei response_model degli endpoint.
+"""
+import json
+from typing import Any, Dict, List, Literal, Optional, Sequence, Type
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.models import ItemResponse, item_projection_model
+
+try:
+    import orjson
+except ImportError:  # dipendenza opzionale
+    orjson = None
+
+
+SerializationMode = Literal["off", "validate", "trust"]
+SERIALIZATION_MODES = ("off", "validate", "trust")
+
+
+def _default(obj: Any):
+    # Le liste salvate come set DynamoDB tornano come set
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    raise TypeError(f"Tipo non serializzabile: {type(obj).__name__}")
+
+
+def _dumps(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, default=_default)
+    # Stesso formato di Pydantic: JSON compatto, UTF-8 senza escape
+    return json.dumps(
+        data, separators=(",", ":"), ensure_ascii=False, default=_default
+    ).encode("utf-8")
+
+
+def _field_defaults(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Campi del modello nell'ordine di serializzazione, con il valore di default."""
+    defaults = {}
+    for name, field in model.model_fields.items():
+        if field.default_factory is not None:
+            defaults[name] = field.default_factory()
+        elif field.is_required():
+            defaults[name] = None
+        else:
+            defaults[name] = field.default
+    return defaults
+
+
+class ItemSerializer:
+    """
+    Serializza gli items per le risposte degli endpoint.
+
+    Modalità:
+    - off: costruisce i modelli Pydantic (ItemResponse per ogni riga) e
+      lascia la serializzazione a FastAPI tramite response_model
+    - validate: valida tutta la risposta con una sola chiamata al validatore
+      compilato del modello e la serializza in JSON senza passare da FastAPI
+    - trust: nessuna validazione; le righe di DynamoDB (scritte da questa
+      applicazione) vengono ridotte ai campi di ItemResponse e serializzate
+      con orjson, se installato
+
+    Il JSON prodotto è lo stesso in tutte le modalità.
+
+    Con `fields` (sparse fieldset) ogni item contiene solo i campi
+    indicati: la risposta è sempre una Response JSON, perché non
+    corrisponde più al response_model dell'endpoint.
+    """
+
+    def __init__(self, mode: SerializationMode = "off"):
+        """
+        Args:
+            mode: off, validate o trust
+        """
+        if mode not in SERIALIZATION_MODES:
+            raise ValueError(f"Modalità di serializzazione non valida: {mode}")
+        self.mode = mode
+        # Layout precalcolato: campi in ordine e default dei campi opzionali
+        self._item_layout = tuple(_field_defaults(ItemResponse).items())
+        self._layouts: Dict[Type[BaseModel], tuple] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """True se la serializzazione veloce è attiva."""
+        return self.mode != "off"
+
+    def item(self, item: Dict, fields: Optional[Sequence[str]] = None) -> Any:
+        """
+        Risposta per un singolo item.
+
+        Args:
+            item: Riga letta da DynamoDB
+            fields: Campi da restituire (None = tutti)
+
+        Returns:
+            ItemResponse in modalità off senza fields, altrimenti una Response JSON
+        """
+        if fields is not None:
+            body = _dumps(self._partial(item, frozenset(fields)))
+        elif self.mode == "off":
+            return ItemResponse(**item)
+        elif self.mode == "validate":
+            body = ItemResponse.model_validate(item).model_dump_json().encode("utf-8")
+        else:
+            body = _dumps(self._project(item))
+        return Response(content=body, media_type="application/json")
+
+    def page(
+        self,
+        model: Type[BaseModel],
+        items: List[Dict],
+        fields: Optional[Sequence[str]] = None,
+        **extra
+    ) -> Any:
+        """
+        Risposta con una lista di items nel campo "items".
+
+        Args:
+            model: Modello della risposta (es. ItemsListResponse)
+            items: Righe lette da DynamoDB
+            fields: Campi degli items da restituire (None = tutti)
+            **extra: Altri campi della risposta (es. count, next_token)
+
+        Returns:
+            Istanza di model in modalità off senza fields, altrimenti una Response JSON
+        """
+        if fields is not None:
+            selected = frozenset(fields)
+            body = _dumps(self._envelope(
+                model, [self._partial(item, selected) for item in items], extra
+            ))
+        elif self.mode == "off":
+            return model(items=[ItemResponse(**item) for item in items], **extra)
+        elif self.mode == "validate":
+            body = model.model_validate({"items": items, **extra}).model_dump_json().encode("utf-8")
+        else:
+            body = _dumps(self._envelope(model, [self._project(item) for item in items], extra))
+        return Response(content=body, media_type="application/json")
+
+    def ndjson(self, items: List[Dict]) -> bytes:
+        """Items in formato NDJSON (una riga per item)."""
+        if self.mode == "trust":
+            return b"".join(_dumps(self._project(item)) + b"\n" for item in items)
+        return b"".join(
+            ItemResponse.model_validate(item).model_dump_json().encode("utf-8") + b"\n"
+            for item in items
+        )
+
+    def _envelope(self, model: Type[BaseModel], items: List[Dict], extra: Dict) -> Dict:
+        """Campi della risposta nell'ordine del modello, con gli items già pronti."""
+        layout = self._layouts.get(model)
+        if layout is None:
+            layout = self._layouts[model] = tuple(_field_defaults(model).items())
+        return {
+            name: items if name == "items" else extra.get(name, default)
+            for name, default in layout
+        }
+
+    def _project(self, item: Dict) -> Dict:
+        return {name: item.get(name, default) for name, default in self._item_layout}
+
+    def _partial(self, item: Dict, fields: frozenset) -> Dict:
+        """Solo i campi richiesti (item_id sempre incluso), validati tranne che in trust."""
+        fields = fields | {"item_id"}
+        if self.mode == "trust":
+            return {
+                name: item.get(name, default)
+                for name, default in self._item_layout
+                if name in fields
+            }
+        return item_projection_model(fields).model_validate(item).model_dump(mode="json")
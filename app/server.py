@@ -0,0 +1,132 @@
+"""
+Avvio dell'applicazione in produzione, con uno o più processi worker.
+
+    python -m app.server
+
+Ogni worker è un processo separato (uvicorn, avviato con spawn) che
+importa app.main ed esegue il proprio lifespan: client boto3, pool di
+thread, cache e task in background appartengono al worker e non sono mai
+condivisi. Il processo principale non importa l'applicazione: avvia i
+worker, riavvia quelli terminati (crash o riciclo dopo SERVER_MAX_REQUESTS
+richieste) senza toccare gli altri e all'arresto (SIGTERM) lascia a ogni
+worker fino a SERVER_GRACEFUL_TIMEOUT_SECONDS per completare le richieste
+in corso.
+"""
+import logging
+import math
+import os
+import secrets
+from typing import Optional
+
+import uvicorn
+
+from app.config import settings
+from app.logging_config import setup_logging
+
+
+logger = logging.getLogger(__name__)
+
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    """Limite di CPU del container (cgroup v2 o v1), None se non c'è."""
+    try:
+        # cgroup v2: "<quota> <periodo>" oppure "max <periodo>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        return None if quota <= 0 else quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus() -> int:
+    """
+    CPU utilizzabili dal processo: affinità e limite del container, che
+    os.cpu_count() non considera (restituisce le CPU dell'host).
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # non disponibile su macOS e Windows
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, max(1, math.ceil(limit)))
+    return cpus
+
+
+def worker_count() -> int:
+    """Numero di worker: WEB_CONCURRENCY, o uno per CPU se è 0."""
+    if settings.web_concurrency > 0:
+        return settings.web_concurrency
+    return available_cpus()
+
+
+def main():
+    setup_logging(
+        debug=settings.debug,
+        fast_formatter=settings.log_fast_formatter,
+        compact_json=settings.log_compact_json,
+    )
+
+    workers = worker_count()
+    max_requests = settings.server_max_requests or None
+    if workers > 1 and settings.storage_backend == "memory":
+        # Nessuno stato condiviso: un item creato da un worker non esisterebbe
+        # per gli altri (404 e liste diverse a seconda del worker)
+        logger.warning(
+            f"STORAGE_BACKEND=memory: avvio con 1 worker invece di {workers}"
+        )
+        workers = 1
+    if workers > 1:
+        if not settings.pagination_token_secret and not settings.server_shared_secret:
+            # Senza una chiave comune un token creato da un worker non
+            # sarebbe valido sugli altri; i worker ereditano l'ambiente
+            os.environ["SERVER_SHARED_SECRET"] = secrets.token_hex(32)
+        # Ogni worker ha i propri contatori e uno scrape di /metrics li legge
+        # da un solo worker: la label worker tiene separate le serie
+        os.environ.setdefault("METRICS_WORKER_LABEL", "true")
+        if settings.item_cache_enabled:
+            logger.warning(
+                "ITEM_CACHE_ENABLED con più worker: ogni worker ha la propria cache, "
+                "un item modificato può restare in cache sugli altri worker fino a "
+                "ITEM_CACHE_TTL_SECONDS"
+            )
+    elif max_requests:
+        # Con un solo worker non c'è un supervisore che lo riavvii
+        logger.warning("SERVER_MAX_REQUESTS ignorato: il riciclo richiede almeno 2 worker")
+        max_requests = None
+
+    logger.info(
+        f"Avvio server su {settings.server_host}:{settings.server_port} con {workers} worker",
+        extra={
+            "workers": workers,
+            "keepalive_seconds": settings.server_keepalive_seconds,
+            "graceful_timeout_seconds": settings.server_graceful_timeout_seconds,
+            "max_requests": max_requests,
+        }
+    )
+    uvicorn.run(
+        "app.main:app",
+        host=settings.server_host,
+        port=settings.server_port,
+        workers=workers,
+        timeout_keep_alive=settings.server_keepalive_seconds,
+        timeout_graceful_shutdown=settings.server_graceful_timeout_seconds,
+        limit_max_requests=max_requests,
+        limit_max_requests_jitter=settings.server_max_requests_jitter if max_requests else 0,
+        # Le richieste sono già loggate da RequestLoggingMiddleware
+        access_log=False,
+        # I log di uvicorn passano dalla configurazione dell'app (JSON)
+        log_config=None,
+    )
+
+
+if __name__ == "__main__":
+    main()
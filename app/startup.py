@@ -0,0 +1,70 @@
+"""
+Misura dei tempi di avvio dell'applicazione (cold start).
+Ogni fase del lifespan è cronometrata; alla fine il dettaglio viene
+loggato ed esposto da /metrics.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from app import metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """
+    Durata delle fasi di avvio. Le fasi possono essere eseguite in
+    parallelo: ognuna registra il proprio tempo, il totale è quello
+    trascorso da `started`.
+    """
+
+    def __init__(self, started: Optional[float] = None):
+        """
+        Args:
+            started: Inizio dell'avvio (time.perf_counter()), di default adesso
+        """
+        self.started = time.perf_counter() if started is None else started
+        self.phases: Dict[str, float] = {}
+
+    def record(self, name: str, seconds: float):
+        """Registra la durata di una fase misurata altrove."""
+        self.phases[name] = seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        """Cronometra il blocco come fase `name` (anche se fallisce)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    @property
+    def elapsed(self) -> float:
+        """Secondi trascorsi dall'inizio dell'avvio."""
+        return time.perf_counter() - self.started
+
+    def finish(self) -> float:
+        """
+        Logga il dettaglio delle fasi e aggiorna le metriche.
+
+        Returns:
+            Durata totale dell'avvio in secondi
+        """
+        total = self.elapsed
+        for name, seconds in self.phases.items():
+            metrics.STARTUP_PHASE_DURATION.set(name, value=round(seconds, 6))
+        metrics.STARTUP_DURATION.set(value=round(total, 6))
+        logger.info(
+            f"Avvio completato in {total * 1000:.0f} ms",
+            extra={
+                "startup_ms": round(total * 1000, 1),
+                "startup_phases_ms": {
+                    name: round(seconds * 1000, 1) for name, seconds in self.phases.items()
+                },
+            }
+        )
+        return total
@@ -0,0 +1,65 @@
+"""
+Backend di storage degli items, selezionato con STORAGE_BACKEND:
+- dynamodb: AWS DynamoDB (DynamoDBClient, default)
+- memory: in memoria nel processo (InMemoryBackend)
+- sqlite: file SQLite locale in modalità WAL (SQLiteBackend)
+"""
+from app.storage.base import (
+    BATCH_GET_MAX_KEYS,
+    BATCH_WRITE_MAX_ITEMS,
+    ItemAlreadyExistsException,
+    ItemNotFoundException,
+    SegmentScanResult,
+    StorageBackend,
+    segment_of,
+)
+from app.storage.memory import InMemoryBackend
+from app.storage.sqlite import SQLiteBackend
+
+
+STORAGE_BACKENDS = ("dynamodb", "memory", "sqlite")
+
+
+def create_backend(settings) -> StorageBackend:
+    """
+    Crea il backend indicato nella configurazione.
+
+    Args:
+        settings: Configurazione dell'applicazione (app.config.Settings)
+
+    Returns:
+        Backend pronto all'uso
+    """
+    if settings.storage_backend == "memory":
+        return InMemoryBackend()
+    if settings.storage_backend == "sqlite":
+        return SQLiteBackend(settings.sqlite_path)
+    if settings.storage_backend != "dynamodb":
+        raise ValueError(f"Backend di storage non valido: {settings.storage_backend}")
+
+    # Import qui: app.database importa a sua volta app.storage
+    from app.database import DynamoDBClient
+
+    return DynamoDBClient(
+        table_name=settings.dynamodb_table_name,
+        region=settings.aws_region,
+        max_pool_connections=settings.dynamodb_max_workers,
+        tag_table_name=settings.dynamodb_tag_table_name,
+        created_index_name=settings.dynamodb_created_index_name,
+        created_index_shards=settings.created_index_shards,
+    )
+
+
+__all__ = [
+    "BATCH_GET_MAX_KEYS",
+    "BATCH_WRITE_MAX_ITEMS",
+    "STORAGE_BACKENDS",
+    "InMemoryBackend",
+    "ItemAlreadyExistsException",
+    "ItemNotFoundException",
+    "SQLiteBackend",
+    "SegmentScanResult",
+    "StorageBackend",
+    "create_backend",
+    "segment_of",
+]
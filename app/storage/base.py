@@ -0,0 +1,478 @@
+"""
+Interfaccia comune dei backend di storage degli items.
+DynamoDBClient (app/database.py), InMemoryBackend e SQLiteBackend la
+implementano; AsyncDynamoDBClient funziona con qualsiasi backend.
+"""
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.ids import uuid7
+
+
+# Limiti di DynamoDB per una singola richiesta BatchWriteItem / BatchGetItem,
+# rispettati da tutti i backend
+BATCH_WRITE_MAX_ITEMS = 25
+BATCH_GET_MAX_KEYS = 100
+
+
+class ItemNotFoundException(Exception):
+    """Eccezione sollevata quando un item non viene trovato."""
+    pass
+
+
+class ItemAlreadyExistsException(Exception):
+    """Eccezione sollevata quando si crea un item con un ID già esistente."""
+    pass
+
+
+@dataclass
+class SegmentScanResult:
+    """Risultato della scansione di un segmento della tabella."""
+    segment: int
+    items: List[Dict]
+    last_evaluated_key: Optional[Dict]
+    pages: int
+    duration_ms: float
+
+    def stats(self) -> dict:
+        """Statistiche del segmento (senza items), per log e metriche."""
+        return {
+            "segment": self.segment,
+            "items": len(self.items),
+            "pages": self.pages,
+            "duration_ms": self.duration_ms,
+        }
+
+
+def segment_of(item_id: str, total_segments: int) -> int:
+    """
+    Segmento di un item nelle scansioni parallele dei backend locali
+    (hash stabile dell'ID, come la partizione di DynamoDB).
+    """
+    if total_segments <= 1:
+        return 0
+    return zlib.crc32(item_id.encode("utf-8")) % total_segments
+
+
+def with_fields(fields: Optional[Sequence[str]], *required: str) -> Optional[List[str]]:
+    """
+    Attributi da leggere per una proiezione: quelli richiesti più quelli
+    che servono al backend (es. item_id per le chiavi). None = tutti.
+    """
+    if fields is None:
+        return None
+    return list(dict.fromkeys([*required, *fields]))
+
+
+def project(item: Dict, fields: Optional[Sequence[str]]) -> Dict:
+    """Solo gli attributi indicati dell'item (tutti se fields è None)."""
+    if fields is None:
+        return item
+    return {name: item[name] for name in fields if name in item}
+
+
+def created_key(item: Dict) -> Tuple[str, str]:
+    """Chiave di ordinamento per data di creazione: (created_at, item_id)."""
+    return item.get('created_at') or "", item['item_id']
+
+
+def created_filter(
+    created_after: Optional[str],
+    created_before: Optional[str],
+    descending: bool,
+    exclusive_start_key: Optional[Dict]
+) -> Callable[[Dict], bool]:
+    """
+    Condizione di una pagina di query_by_created: created_at strettamente
+    tra created_after e created_before e chiave successiva a quella di
+    partenza nell'ordine richiesto.
+    """
+    start = None
+    if exclusive_start_key:
+        start = (exclusive_start_key['created_at'], exclusive_start_key['item_id'])
+
+    def accept(item: Dict) -> bool:
+        key = created_key(item)
+        if created_after is not None and key[0] <= created_after:
+            return False
+        if created_before is not None and key[0] >= created_before:
+            return False
+        if start is not None:
+            return key < start if descending else key > start
+        return True
+
+    return accept
+
+
+def created_page(
+    items: List[Dict],
+    limit: int,
+    more: bool = False
+) -> Tuple[List[Dict], Optional[Dict]]:
+    """
+    Prima pagina di items già filtrati e ordinati, con la chiave per
+    riprendere se ci sono altri items (o se more è True).
+    """
+    page = items[:limit]
+    if page and (more or len(items) > limit):
+        created_at, item_id = created_key(page[-1])
+        return page, {'created_at': created_at, 'item_id': item_id}
+    return page, None
+
+
+def intersect_pages(pages: Dict[str, List[str]], size: int) -> Tuple[List[str], Optional[str], bool]:
+    """
+    Candidati di una ricerca in AND da una pagina di ID per tag (ID
+    ordinati, letti dalla stessa posizione, al massimo `size` per tag).
+
+    Gli ID vengono dal tag con la lista più corta: una pagina incompleta è
+    tutto ciò che resta del tag (vince la più corta); tra pagine complete
+    quella che arriva più avanti ha gli ID più radi. Un candidato è
+    scartato se un altro tag ha già letto fin oltre quell'ID senza trovarlo.
+
+    Returns:
+        Tupla (candidati, ultimo ID letto dal tag scelto, True se quel
+        tag non ha altri ID)
+    """
+    def sparsity(tag: str):
+        page = pages[tag]
+        return (1, -len(page)) if len(page) < size else (0, page[-1])
+
+    driver = max(pages, key=sparsity)
+    page = pages[driver]
+    # Per gli altri tag: ID letti e ultimo ID (None se il tag è esaurito)
+    others = [
+        (set(ids), ids[-1] if len(ids) == size else None)
+        for tag, ids in pages.items() if tag != driver
+    ]
+    candidates = [
+        item_id for item_id in page
+        if all(item_id in ids or (last is not None and item_id > last) for ids, last in others)
+    ]
+    return candidates, page[-1] if page else None, len(page) < size
+
+
+class StorageBackend(ABC):
+    """
+    Operazioni sugli items richieste dall'applicazione.
+
+    I metodi sono sincroni e devono essere thread-safe: AsyncDynamoDBClient
+    li esegue su un pool di thread. Le chiavi di paginazione
+    (exclusive_start_key / last_evaluated_key) sono dizionari serializzabili
+    in JSON, opachi per il chiamante.
+
+    I metodi di lettura accettano `fields`: se indicato, gli items
+    restituiti contengono solo quegli attributi più item_id (ed eventuali
+    attributi necessari al backend), letti dallo storage quando possibile
+    (ProjectionExpression su DynamoDB).
+    """
+
+    @staticmethod
+    def build_item(item_data: dict) -> Dict:
+        """
+        Costruisce il record di un nuovo item:
+        genera l'ID univoco e aggiunge i timestamp.
+
+        L'ID è un UUIDv7 con lo stesso istante di created_at, quindi gli ID
+        sono ordinati per data di creazione; created_at ha sempre i
+        microsecondi, così l'ordine delle stringhe è quello temporale.
+
+        Args:
+            item_data: Dizionario con i dati dell'item (name, description, tags)
+
+        Returns:
+            Dizionario pronto per essere scritto
+        """
+        now = datetime.now(timezone.utc)
+        timestamp = now.replace(tzinfo=None).isoformat(timespec='microseconds')
+
+        return {
+            'item_id': uuid7(int(now.timestamp() * 1000)),
+            'name': item_data['name'],
+            'description': item_data.get('description'),
+            'tags': item_data.get('tags', []),
+            'created_at': timestamp,
+            'updated_at': timestamp
+        }
+
+    @abstractmethod
+    def create_item(self, item_data: dict) -> Dict:
+        """
+        Crea un nuovo item senza sovrascriverne uno esistente.
+
+        Returns:
+            L'item creato (incluso item_id)
+
+        Raises:
+            ItemAlreadyExistsException: Se esiste già un item con lo stesso ID
+        """
+
+    @abstractmethod
+    def write_batch(self, items: List[Dict], max_retries: int = 5) -> List[Dict]:
+        """
+        Scrive fino a BATCH_WRITE_MAX_ITEMS items completi (vedi build_item).
+
+        Returns:
+            Items non scritti (vuota se tutto ok)
+        """
+
+    @abstractmethod
+    def get_item(self, item_id: str, fields: Optional[List[str]] = None) -> Dict:
+        """
+        Recupera un item per ID.
+
+        Raises:
+            ItemNotFoundException: Se l'item non esiste
+        """
+
+    @abstractmethod
+    def get_batch(
+        self,
+        item_ids: List[str],
+        max_retries: int = 5,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, Dict], List[str]]:
+        """
+        Recupera fino a BATCH_GET_MAX_KEYS items per ID.
+
+        Returns:
+            Tupla (found, unprocessed): item_id -> item per gli items trovati
+            e ID non letti (da richiedere di nuovo)
+        """
+
+    @abstractmethod
+    def list_items(
+        self,
+        limit: int = 100,
+        exclusive_start_key: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], Optional[Dict]]:
+        """
+        Lista una pagina di items.
+
+        Returns:
+            Tupla (items, last_evaluated_key); last_evaluated_key è None
+            se non ci sono altre pagine
+        """
+
+    @abstractmethod
+    def scan_segment(
+        self,
+        segment: int,
+        total_segments: int,
+        limit: Optional[int] = None,
+        exclusive_start_key: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> SegmentScanResult:
+        """
+        Legge fino a `limit` items di un segmento (None = tutto il segmento).
+        last_evaluated_key del risultato è None se il segmento è finito.
+        """
+
+    # True se il backend mantiene un indice per tag (vedi tag_index_page)
+    has_tag_index = False
+
+    @abstractmethod
+    def tag_index_page(self, tag: str, after_id: str, limit: int) -> List[str]:
+        """
+        Legge l'indice dei tag: fino a `limit` ID di items con il tag,
+        in ordine crescente e maggiori di after_id ("" = dall'inizio).
+        query_by_tags lo chiama solo se has_tag_index è True.
+
+        Raises:
+            ValueError: Se il backend non ha l'indice dei tag
+        """
+
+    def query_by_tags(
+        self,
+        tags: List[str],
+        match_all: bool = True,
+        limit: int = 100,
+        exclusive_start_key: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], Optional[Dict]]:
+        """
+        Lista una pagina di items con i tag indicati, in ordine di ID.
+
+        Con l'indice dei tag vengono letti solo gli ID con i tag cercati:
+        in OR l'unione degli ID di tutti i tag, in AND gli ID del tag con
+        meno voci (scelto a ogni pagina, vedi intersect_pages). Gli items
+        candidati sono letti con get_batch e filtrati sui loro tag, quindi
+        le voci dell'indice senza item (es. scritture interrotte) sono
+        ignorate. Senza indice la tabella viene scansionata e filtrata.
+
+        Args:
+            tags: Tag da cercare (almeno uno)
+            match_all: True = l'item deve avere tutti i tag (AND),
+                False = almeno uno (OR)
+            limit: Numero massimo di items da restituire
+            exclusive_start_key: Chiave restituita dalla pagina precedente
+            fields: Attributi da restituire (None = tutti)
+
+        Returns:
+            Tupla (items, last_evaluated_key); last_evaluated_key è None
+            se non ci sono altre pagine
+        """
+        wanted = set(tags)
+        # I tag servono al filtro anche se non richiesti
+        read_fields = with_fields(fields, 'item_id', 'tags')
+
+        def matches(item: Dict) -> bool:
+            item_tags = set(item.get('tags') or [])
+            return wanted <= item_tags if match_all else bool(wanted & item_tags)
+
+        if not self.has_tag_index:
+            return self._scan_by_tags(matches, limit, exclusive_start_key, read_fields)
+
+        after = exclusive_start_key['item_id'] if exclusive_start_key else ""
+        found = []
+
+        while len(found) < limit:
+            wanted_ids = min(limit - len(found), BATCH_GET_MAX_KEYS)
+            pages = {tag: self.tag_index_page(tag, after, wanted_ids) for tag in dict.fromkeys(tags)}
+            if match_all:
+                candidates, last_id, exhausted = intersect_pages(pages, wanted_ids)
+            else:
+                # Ogni tag restituisce i suoi primi wanted_ids ID: i primi
+                # wanted_ids dell'unione sono quindi esatti
+                union = sorted(set().union(*pages.values()))
+                candidates = union[:wanted_ids]
+                last_id = candidates[-1] if candidates else None
+                exhausted = len(union) <= wanted_ids and all(
+                    len(page) < wanted_ids for page in pages.values()
+                )
+
+            if candidates:
+                items, unprocessed = self.get_batch(candidates, fields=read_fields)
+                for item_id in candidates:
+                    if item_id in unprocessed:
+                        # Letture limitate (throttling): pagina più corta,
+                        # la prossima riprende da qui
+                        return found, {'item_id': after}
+                    item = items.get(item_id)
+                    if item is not None and matches(item):
+                        found.append(item)
+                    after = item_id
+
+            if exhausted:
+                return found, None
+            after = last_id
+
+        return found, {'item_id': after}
+
+    def _scan_by_tags(
+        self,
+        matches,
+        limit: int,
+        exclusive_start_key: Optional[Dict],
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], Optional[Dict]]:
+        """Ricerca per tag senza indice: scansione filtrata (costo = tabella)."""
+        found = []
+        last_key = exclusive_start_key
+        while True:
+            result = self.scan_segment(
+                0, 1, limit=limit, exclusive_start_key=last_key, fields=fields
+            )
+            for item in result.items:
+                if matches(item):
+                    found.append(item)
+                    if len(found) == limit:
+                        return found, {'item_id': item['item_id']}
+            last_key = result.last_evaluated_key
+            if not last_key:
+                return found, None
+
+    def query_by_created(
+        self,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        descending: bool = True,
+        limit: int = 100,
+        exclusive_start_key: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], Optional[Dict]]:
+        """
+        Lista una pagina di items in ordine di creazione (created_at, poi
+        item_id), dal più recente se descending è True.
+
+        Questa implementazione legge e ordina tutta la tabella (costo =
+        dimensione della tabella); i backend con un indice per data di
+        creazione la sostituiscono con una lettura del solo intervallo.
+
+        Args:
+            created_after: Solo items con created_at successivo (ISO-8601 UTC)
+            created_before: Solo items con created_at precedente (ISO-8601 UTC)
+            descending: True = dal più recente, False = dal più vecchio
+            limit: Numero massimo di items da restituire
+            exclusive_start_key: Chiave restituita dalla pagina precedente
+            fields: Attributi da restituire (None = tutti)
+
+        Returns:
+            Tupla (items, last_evaluated_key); last_evaluated_key è None
+            se non ci sono altre pagine
+        """
+        accept = created_filter(created_after, created_before, descending, exclusive_start_key)
+        read_fields = with_fields(fields, 'item_id', 'created_at')
+        items = [
+            item
+            for page in self.iter_pages(fields=read_fields)
+            for item in page
+            if accept(item)
+        ]
+        items.sort(key=created_key, reverse=descending)
+        return created_page(items, limit)
+
+    def iter_pages(
+        self,
+        page_size: int = 1000,
+        segment: int = 0,
+        total_segments: int = 1,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[List[Dict]]:
+        """
+        Generatore sulle pagine di una scansione completa (o di un segmento).
+        Tiene in memoria una sola pagina alla volta.
+
+        Args:
+            page_size: Numero massimo di items per pagina
+            segment: Indice del segmento da leggere
+            total_segments: Numero totale di segmenti
+            fields: Attributi da leggere (None = tutti)
+
+        Yields:
+            Liste di items, una per pagina
+        """
+        last_key = None
+        while True:
+            result = self.scan_segment(
+                segment, total_segments, limit=page_size, exclusive_start_key=last_key,
+                fields=fields
+            )
+            if result.items:
+                yield result.items
+            last_key = result.last_evaluated_key
+            if not last_key:
+                return
+
+    @abstractmethod
+    def delete_item(self, item_id: str) -> Dict:
+        """
+        Elimina un item.
+
+        Returns:
+            L'item eliminato
+
+        Raises:
+            ItemNotFoundException: Se l'item non esiste
+        """
+
+    @abstractmethod
+    def health_check(self) -> bool:
+        """True se lo storage è raggiungibile e pronto."""
+
+    def close(self):
+        """Rilascia le risorse del backend (connessioni, file)."""
@@ -0,0 +1,249 @@
+"""
+Backend di storage in memoria.
+Utile per sviluppo locale, benchmark del livello API e come tier di
+cache/edge: nessuna latenza di rete, i dati si perdono al riavvio.
+"""
+import bisect
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.storage.base import (
+    BATCH_GET_MAX_KEYS,
+    BATCH_WRITE_MAX_ITEMS,
+    ItemAlreadyExistsException,
+    ItemNotFoundException,
+    SegmentScanResult,
+    StorageBackend,
+    created_key,
+    created_page,
+    segment_of,
+    with_fields,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _copy(item: Dict, fields: Optional[List[str]] = None) -> Dict:
+    # Le liste (es. tags) sono copiate: il chiamante non deve poter
+    # modificare gli items salvati
+    return {
+        key: list(value) if isinstance(value, list) else value
+        for key, value in item.items()
+        if fields is None or key in fields
+    }
+
+
+class InMemoryBackend(StorageBackend):
+    """
+    Items in un dizionario per ID, con indici ordinati per le scansioni,
+    per i tag e per data di creazione.
+
+    Per ogni numero di segmenti usato nelle scansioni viene mantenuta una
+    lista ordinata di ID per segmento (creata alla prima scansione e poi
+    aggiornata a ogni scrittura), quindi una pagina costa O(log n + pagina)
+    invece di una lettura completa. Allo stesso modo, per ogni tag c'è la
+    lista ordinata degli ID che lo hanno (indice dei tag) e una lista di
+    (created_at, item_id) ordinata per le query per data di creazione.
+    """
+
+    has_tag_index = True
+
+    def __init__(self):
+        self._items: Dict[str, Dict] = {}
+        # total_segments -> liste ordinate di ID, una per segmento
+        self._segments: Dict[int, List[List[str]]] = {}
+        # tag -> lista ordinata degli ID con quel tag
+        self._tags: Dict[str, List[str]] = {}
+        # (created_at, item_id) in ordine crescente
+        self._created: List[Tuple[str, str]] = []
+        self._lock = threading.RLock()
+
+        logger.info("InMemoryBackend inizializzato")
+
+    def _index(self, item_id: str):
+        bisect.insort(self._created, created_key(self._items[item_id]))
+        for tag in set(self._items[item_id].get('tags') or []):
+            ids = self._tags.setdefault(tag, [])
+            position = bisect.bisect_left(ids, item_id)
+            if position == len(ids) or ids[position] != item_id:
+                ids.insert(position, item_id)
+        for total_segments, segments in self._segments.items():
+            ids = segments[segment_of(item_id, total_segments)]
+            position = bisect.bisect_left(ids, item_id)
+            if position == len(ids) or ids[position] != item_id:
+                ids.insert(position, item_id)
+
+    def _unindex(self, item_id: str, item: Dict):
+        position = bisect.bisect_left(self._created, created_key(item))
+        if position < len(self._created) and self._created[position][1] == item_id:
+            del self._created[position]
+        for tag in set(item.get('tags') or []):
+            ids = self._tags.get(tag, [])
+            position = bisect.bisect_left(ids, item_id)
+            if position < len(ids) and ids[position] == item_id:
+                del ids[position]
+            if not ids:
+                self._tags.pop(tag, None)
+        for total_segments, segments in self._segments.items():
+            ids = segments[segment_of(item_id, total_segments)]
+            position = bisect.bisect_left(ids, item_id)
+            if position < len(ids) and ids[position] == item_id:
+                del ids[position]
+
+    def _segment_ids(self, segment: int, total_segments: int) -> List[str]:
+        total_segments = max(1, total_segments)
+        segments = self._segments.get(total_segments)
+        if segments is None:
+            segments = [[] for _ in range(total_segments)]
+            for item_id in sorted(self._items):
+                segments[segment_of(item_id, total_segments)].append(item_id)
+            self._segments[total_segments] = segments
+        return segments[segment]
+
+    def create_item(self, item_data: dict) -> Dict:
+        item = self.build_item(item_data)
+        with self._lock:
+            if item['item_id'] in self._items:
+                raise ItemAlreadyExistsException(f"Item con ID '{item['item_id']}' già esistente")
+            self._items[item['item_id']] = _copy(item)
+            self._index(item['item_id'])
+        logger.info(f"Item creato con successo: {item['item_id']}")
+        return item
+
+    def write_batch(self, items: List[Dict], max_retries: int = 5) -> List[Dict]:
+        if len(items) > BATCH_WRITE_MAX_ITEMS:
+            raise ValueError(f"Massimo {BATCH_WRITE_MAX_ITEMS} items per batch")
+        with self._lock:
+            for item in items:
+                previous = self._items.get(item['item_id'])
+                if previous is not None:
+                    # Sovrascrittura: i tag potrebbero essere cambiati
+                    self._unindex(item['item_id'], previous)
+                self._items[item['item_id']] = _copy(item)
+                self._index(item['item_id'])
+        logger.info(f"Batch scritto: {len(items)} items creati, 0 non processati")
+        return []
+
+    def get_item(self, item_id: str, fields: Optional[List[str]] = None) -> Dict:
+        fields = with_fields(fields, 'item_id')
+        with self._lock:
+            item = self._items.get(item_id)
+            if item is None:
+                logger.warning(f"Item non trovato: {item_id}")
+                raise ItemNotFoundException(f"Item con ID '{item_id}' non trovato")
+            return _copy(item, fields)
+
+    def get_batch(
+        self,
+        item_ids: List[str],
+        max_retries: int = 5,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, Dict], List[str]]:
+        if len(item_ids) > BATCH_GET_MAX_KEYS:
+            raise ValueError(f"Massimo {BATCH_GET_MAX_KEYS} chiavi per batch")
+        fields = with_fields(fields, 'item_id')
+        with self._lock:
+            found = {
+                item_id: _copy(self._items[item_id], fields)
+                for item_id in item_ids if item_id in self._items
+            }
+        return found, []
+
+    def list_items(
+        self,
+        limit: int = 100,
+        exclusive_start_key: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], Optional[Dict]]:
+        result = self.scan_segment(
+            0, 1, limit=limit, exclusive_start_key=exclusive_start_key, fields=fields
+        )
+        return result.items, result.last_evaluated_key
+
+    def scan_segment(
+        self,
+        segment: int,
+        total_segments: int,
+        limit: Optional[int] = None,
+        exclusive_start_key: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> SegmentScanResult:
+        start_time = time.perf_counter()
+        fields = with_fields(fields, 'item_id')
+        with self._lock:
+            ids = self._segment_ids(segment, total_segments)
+            start = 0
+            if exclusive_start_key:
+                start = bisect.bisect_right(ids, exclusive_start_key['item_id'])
+            end = len(ids) if limit is None else min(len(ids), start + limit)
+            items = [_copy(self._items[item_id], fields) for item_id in ids[start:end]]
+            more = end < len(ids)
+
+        return SegmentScanResult(
+            segment=segment,
+            items=items,
+            last_evaluated_key={'item_id': items[-1]['item_id']} if more and items else None,
+            pages=1,
+            duration_ms=round((time.perf_counter() - start_time) * 1000, 2)
+        )
+
+    def tag_index_page(self, tag: str, after_id: str, limit: int) -> List[str]:
+        with self._lock:
+            ids = self._tags.get(tag, [])
+            start = bisect.bisect_right(ids, after_id)
+            return ids[start:start + limit]
+
+    def query_by_created(
+        self,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        descending: bool = True,
+        limit: int = 100,
+        exclusive_start_key: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], Optional[Dict]]:
+        # Intervallo [start, end) della lista ordinata, poi una pagina
+        # da un estremo: O(log n + pagina)
+        fields = with_fields(fields, 'item_id', 'created_at')
+        start_key = None
+        if exclusive_start_key:
+            start_key = (exclusive_start_key['created_at'], exclusive_start_key['item_id'])
+
+        with self._lock:
+            keys = self._created
+            start = 0
+            end = len(keys)
+            if created_after is not None:
+                # Dopo tutte le chiavi con created_at == created_after
+                start = bisect.bisect_right(keys, (created_after, "\uffff"))
+            if created_before is not None:
+                end = bisect.bisect_left(keys, (created_before,))
+            if start_key is not None:
+                if descending:
+                    end = min(end, bisect.bisect_left(keys, start_key))
+                else:
+                    start = max(start, bisect.bisect_right(keys, start_key))
+
+            if descending:
+                selected = keys[max(start, end - limit - 1):end][::-1]
+            else:
+                selected = keys[start:min(end, start + limit + 1)]
+            items = [_copy(self._items[item_id], fields) for _, item_id in selected]
+
+        return created_page(items, limit)
+
+    def delete_item(self, item_id: str) -> Dict:
+        with self._lock:
+            item = self._items.pop(item_id, None)
+            if item is None:
+                logger.warning(f"Item non trovato: {item_id}")
+                raise ItemNotFoundException(f"Item con ID '{item_id}' non trovato")
+            self._unindex(item_id, item)
+        logger.info(f"Item eliminato con successo: {item_id}")
+        return item
+
+    def health_check(self) -> bool:
+        return True
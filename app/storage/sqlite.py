@@ -0,0 +1,299 @@
+"""
+Backend di storage su SQLite (file locale, journal WAL).
+Persistente e senza rete: adatto a sviluppo locale, benchmark e
+istanze singole.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from app.storage.base import (
+    BATCH_GET_MAX_KEYS,
+    BATCH_WRITE_MAX_ITEMS,
+    ItemAlreadyExistsException,
+    ItemNotFoundException,
+    SegmentScanResult,
+    StorageBackend,
+    created_page,
+    project,
+    with_fields,
+)
+
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    item_id TEXT PRIMARY KEY,
+    item_hash INTEGER NOT NULL,
+    data TEXT NOT NULL
+)
+"""
+
+# Indice per data di creazione: su un'espressione del JSON, quindi
+# funziona anche sui database esistenti senza migrazioni
+CREATED_AT = "json_extract(data, '$.created_at')"
+CREATED_INDEX = f"CREATE INDEX IF NOT EXISTS items_created_at ON items ({CREATED_AT}, item_id)"
+
+# Indice dei tag: una riga per coppia (tag, item)
+TAG_SCHEMA = """
+BEGIN;
+CREATE TABLE IF NOT EXISTS item_tags (
+    tag TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    PRIMARY KEY (tag, item_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS item_tags_item_id ON item_tags (item_id);
+INSERT OR IGNORE INTO item_tags (tag, item_id)
+    SELECT tags.value, items.item_id FROM items, json_each(items.data, '$.tags') AS tags;
+COMMIT;
+"""
+
+
+def _hash(item_id: str) -> int:
+    # Stesso hash di segment_of: item_hash % total_segments = segmento
+    return zlib.crc32(item_id.encode("utf-8"))
+
+
+def _tag_rows(item: Dict) -> List[Tuple[str, str]]:
+    return [(tag, item['item_id']) for tag in set(item.get('tags') or [])]
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Items in una tabella SQLite (item_id, hash dell'ID, JSON dell'item)
+    e indice dei tag nella tabella item_tags, aggiornato nella stessa
+    transazione di ogni scrittura. Un indice su (created_at, item_id)
+    serve le query per data di creazione.
+
+    Il database usa il journal WAL: le letture non bloccano le scritture e
+    viceversa. Ogni thread usa la propria connessione (come la resource
+    boto3 di DynamoDBClient), quindi il backend può essere condiviso dal
+    pool di thread di AsyncDynamoDBClient.
+    """
+
+    has_tag_index = True
+
+    def __init__(self, path: str, busy_timeout_seconds: float = 5.0):
+        """
+        Inizializza il backend e crea la tabella se non esiste.
+
+        Args:
+            path: Percorso del file del database
+            busy_timeout_seconds: Attesa massima se il database è occupato
+                da un'altra scrittura
+        """
+        self.path = path
+        self.busy_timeout_seconds = busy_timeout_seconds
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        with self.connection as conn:
+            conn.execute(SCHEMA)
+            conn.execute(CREATED_INDEX)
+            has_tags = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'item_tags'"
+            ).fetchone()
+        if not has_tags:
+            # Database creato prima dell'indice dei tag: lo costruisce dagli items
+            self.connection.executescript(TAG_SCHEMA)
+
+        logger.info(f"SQLiteBackend inizializzato: {path} (WAL)")
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connessione del thread corrente, creata alla prima richiesta."""
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            # check_same_thread=False solo per permettere a close() di chiudere
+            # le connessioni: ogni connessione è usata da un solo thread
+            conn = sqlite3.connect(
+                self.path, timeout=self.busy_timeout_seconds, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Con WAL, NORMAL è sicuro contro la corruzione e molto più veloce di FULL
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def create_item(self, item_data: dict) -> Dict:
+        item = self.build_item(item_data)
+        item_id = item['item_id']
+        try:
+            with self.connection as conn:
+                conn.execute(
+                    "INSERT INTO items (item_id, item_hash, data) VALUES (?, ?, ?)",
+                    (item_id, _hash(item_id), json.dumps(item))
+                )
+                conn.executemany(
+                    "INSERT INTO item_tags (tag, item_id) VALUES (?, ?)", _tag_rows(item)
+                )
+        except sqlite3.IntegrityError:
+            logger.error(f"Item già esistente: {item_id}")
+            raise ItemAlreadyExistsException(f"Item con ID '{item_id}' già esistente")
+        logger.info(f"Item creato con successo: {item_id}")
+        return item
+
+    def write_batch(self, items: List[Dict], max_retries: int = 5) -> List[Dict]:
+        if len(items) > BATCH_WRITE_MAX_ITEMS:
+            raise ValueError(f"Massimo {BATCH_WRITE_MAX_ITEMS} items per batch")
+        # Una sola transazione per tutto il batch
+        with self.connection as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO items (item_id, item_hash, data) VALUES (?, ?, ?)",
+                [(item['item_id'], _hash(item['item_id']), json.dumps(item)) for item in items]
+            )
+            # Items sovrascritti: i tag potrebbero essere cambiati
+            conn.executemany(
+                "DELETE FROM item_tags WHERE item_id = ?", [(item['item_id'],) for item in items]
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO item_tags (tag, item_id) VALUES (?, ?)",
+                [row for item in items for row in _tag_rows(item)]
+            )
+        logger.info(f"Batch scritto: {len(items)} items creati, 0 non processati")
+        return []
+
+    def get_item(self, item_id: str, fields: Optional[List[str]] = None) -> Dict:
+        row = self.connection.execute(
+            "SELECT data FROM items WHERE item_id = ?", (item_id,)
+        ).fetchone()
+        if row is None:
+            logger.warning(f"Item non trovato: {item_id}")
+            raise ItemNotFoundException(f"Item con ID '{item_id}' non trovato")
+        return project(json.loads(row[0]), with_fields(fields, 'item_id'))
+
+    def get_batch(
+        self,
+        item_ids: List[str],
+        max_retries: int = 5,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, Dict], List[str]]:
+        if len(item_ids) > BATCH_GET_MAX_KEYS:
+            raise ValueError(f"Massimo {BATCH_GET_MAX_KEYS} chiavi per batch")
+        if not item_ids:
+            return {}, []
+        placeholders = ",".join("?" * len(item_ids))
+        rows = self.connection.execute(
+            f"SELECT item_id, data FROM items WHERE item_id IN ({placeholders})",
+            list(item_ids)
+        ).fetchall()
+        fields = with_fields(fields, 'item_id')
+        return {item_id: project(json.loads(data), fields) for item_id, data in rows}, []
+
+    def list_items(
+        self,
+        limit: int = 100,
+        exclusive_start_key: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], Optional[Dict]]:
+        result = self.scan_segment(
+            0, 1, limit=limit, exclusive_start_key=exclusive_start_key, fields=fields
+        )
+        return result.items, result.last_evaluated_key
+
+    def scan_segment(
+        self,
+        segment: int,
+        total_segments: int,
+        limit: Optional[int] = None,
+        exclusive_start_key: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> SegmentScanResult:
+        start_time = time.perf_counter()
+
+        query = "SELECT item_id, data FROM items WHERE item_id > ?"
+        params = [exclusive_start_key['item_id'] if exclusive_start_key else ""]
+        if total_segments > 1:
+            query += " AND item_hash % ? = ?"
+            params.extend([total_segments, segment])
+        query += " ORDER BY item_id"
+        if limit is not None:
+            # Una riga in più per sapere se il segmento continua
+            query += " LIMIT ?"
+            params.append(limit + 1)
+
+        rows = self.connection.execute(query, params).fetchall()
+        more = limit is not None and len(rows) > limit
+        if more:
+            rows = rows[:limit]
+        fields = with_fields(fields, 'item_id')
+
+        return SegmentScanResult(
+            segment=segment,
+            items=[project(json.loads(data), fields) for _, data in rows],
+            last_evaluated_key={'item_id': rows[-1][0]} if more and rows else None,
+            pages=1,
+            duration_ms=round((time.perf_counter() - start_time) * 1000, 2)
+        )
+
+    def tag_index_page(self, tag: str, after_id: str, limit: int) -> List[str]:
+        rows = self.connection.execute(
+            "SELECT item_id FROM item_tags WHERE tag = ? AND item_id > ? ORDER BY item_id LIMIT ?",
+            (tag, after_id, limit)
+        ).fetchall()
+        return [item_id for item_id, in rows]
+
+    def query_by_created(
+        self,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        descending: bool = True,
+        limit: int = 100,
+        exclusive_start_key: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], Optional[Dict]]:
+        conditions = []
+        params = []
+        if created_after is not None:
+            conditions.append(f"{CREATED_AT} > ?")
+            params.append(created_after)
+        if created_before is not None:
+            conditions.append(f"{CREATED_AT} < ?")
+            params.append(created_before)
+        if exclusive_start_key:
+            conditions.append(f"({CREATED_AT}, item_id) {'<' if descending else '>'} (?, ?)")
+            params.extend([exclusive_start_key['created_at'], exclusive_start_key['item_id']])
+
+        order = "DESC" if descending else "ASC"
+        query = "SELECT data FROM items"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        # Una riga in più per sapere se ci sono altre pagine
+        query += f" ORDER BY {CREATED_AT} {order}, item_id {order} LIMIT ?"
+        params.append(limit + 1)
+
+        rows = self.connection.execute(query, params).fetchall()
+        fields = with_fields(fields, 'item_id', 'created_at')
+        return created_page([project(json.loads(data), fields) for data, in rows], limit)
+
+    def delete_item(self, item_id: str) -> Dict:
+        with self.connection as conn:
+            row = conn.execute(
+                "DELETE FROM items WHERE item_id = ? RETURNING data", (item_id,)
+            ).fetchone()
+            conn.execute("DELETE FROM item_tags WHERE item_id = ?", (item_id,))
+        if row is None:
+            logger.warning(f"Item non trovato: {item_id}")
+            raise ItemNotFoundException(f"Item con ID '{item_id}' non trovato")
+        logger.info(f"Item eliminato con successo: {item_id}")
+        return json.loads(row[0])
+
+    def health_check(self) -> bool:
+        self.connection.execute("SELECT 1").fetchone()
+        return True
+
+    def close(self):
+        """Chiude le connessioni di tutti i thread."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
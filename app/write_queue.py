@@ -0,0 +1,171 @@
+"""
+Coda di scrittura con micro-batching (write-behind).
+Le creazioni concorrenti vengono raggruppate in richieste BatchWriteItem.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from botocore.exceptions import ClientError
+
+
+logger = logging.getLogger(__name__)
+
+# Segnale di chiusura per il flusher
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """
+    Raggruppa le scritture in batch.
+
+    Ogni scrittura entra in una coda limitata; un flusher in background
+    la raccoglie in un batch che viene scritto quando raggiunge
+    max_batch_size items o quando scade la finestra flush_interval_ms
+    dal primo item. Ogni chiamante attende l'esito della propria scrittura.
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[Dict]], Awaitable[List[Dict]]],
+        max_batch_size: int = 25,
+        flush_interval_ms: float = 10.0,
+        max_queue_size: int = 1000,
+        max_concurrent_flushes: int = 4
+    ):
+        """
+        Inizializza la coda.
+
+        Args:
+            write_batch: Funzione async che scrive un batch e restituisce
+                gli items non scritti
+            max_batch_size: Items massimi per batch
+            flush_interval_ms: Attesa massima prima di scrivere un batch incompleto
+            max_queue_size: Items massimi in attesa; oltre, submit() attende
+            max_concurrent_flushes: Batch scritti in parallelo
+        """
+        self._write_batch = write_batch
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_queue_size = max_queue_size
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+        self._flush_slots: Optional[asyncio.Semaphore] = None
+        self._max_concurrent_flushes = max_concurrent_flushes
+        self._closed = False
+
+    async def submit(self, item: Dict) -> Dict:
+        """
+        Accoda un item e attende che sia scritto.
+
+        Args:
+            item: Record completo da scrivere
+
+        Returns:
+            L'item scritto
+
+        Raises:
+            ClientError: Se la scrittura fallisce o l'item non viene processato
+            RuntimeError: Se la coda è stata chiusa
+        """
+        if self._closed:
+            raise RuntimeError("Coda di scrittura chiusa")
+        self._start()
+
+        future = asyncio.get_running_loop().create_future()
+        # Se la coda è piena il chiamante attende (backpressure)
+        await self._queue.put((item, future))
+        await future
+        return item
+
+    async def drain(self):
+        """
+        Chiude la coda e attende la scrittura di tutti gli items accodati.
+        Da chiamare allo shutdown.
+        """
+        self._closed = True
+        if self._flusher is None:
+            return
+
+        await self._queue.put(_STOP)
+        await self._flusher
+        # I submit in attesa con la coda piena possono accodare dopo _STOP,
+        # quando il flusher è già terminato: quegli items li scrive drain
+        while not self._queue.empty():
+            batch = []
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._flush_slots.acquire()
+            await self._flush(batch)
+            # Lascia accodare i submit svegliati dallo spazio liberato
+            await asyncio.sleep(0)
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        logger.info("Coda di scrittura svuotata")
+
+    def _start(self):
+        if self._flusher is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._flush_slots = asyncio.Semaphore(self._max_concurrent_flushes)
+            self._flusher = asyncio.create_task(self._run())
+            logger.info(
+                f"Coda di scrittura avviata: batch da {self.max_batch_size} items, "
+                f"finestra {self.flush_interval * 1000:.0f}ms"
+            )
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            entry = await self._queue.get()
+            if entry is _STOP:
+                break
+
+            batch = [entry]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            await self._flush_slots.acquire()
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List):
+        try:
+            items = [item for item, _ in batch]
+            try:
+                unprocessed = await self._write_batch(items)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            failed_ids = {item['item_id'] for item in unprocessed}
+            for item, future in batch:
+                if future.done():
+                    continue
+                if item['item_id'] in failed_ids:
+                    future.set_exception(ClientError(
+                        {'Error': {'Code': 'UnprocessedItem',
+                                   'Message': 'Item non scritto dopo tutti i tentativi'}},
+                        'BatchWriteItem'
+                    ))
+                else:
+                    future.set_result(item)
+        finally:
+            self._flush_slots.release()
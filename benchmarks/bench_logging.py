@@ -0,0 +1,111 @@
+"""
+Micro-benchmark dei formatter JSON dei log.
+
+Confronta CustomJsonFormatter (python-json-logger) con FastJsonFormatter
+(stesso output e formato compatto, con orjson se installato) su record
+tipici dell'applicazione, dopo aver verificato che l'output coincida
+(nel formato compatto: stessi campi nello stesso ordine).
+
+Uso:
+    python benchmarks/bench_logging.py [--records 50000] [--repeat 5]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.logging_config import CustomJsonFormatter, FastJsonFormatter, orjson  # noqa: E402
+
+
+def make_records():
+    """Record rappresentativi: messaggio semplice, riga del middleware, campi sensibili, eccezione."""
+    def record(level, msg, args=(), extra=None, exc_info=None):
+        rec = logging.LogRecord("app.main", level, __file__, 42, msg, args, exc_info, func="handler")
+        for key, value in (extra or {}).items():
+            setattr(rec, key, value)
+        return rec
+
+    try:
+        raise ValueError("item non valido")
+    except ValueError:
+        exc_info = sys.exc_info()
+
+    return [
+        record(logging.INFO, "Item %s creato", ("7f3c2a9e",)),
+        record(logging.INFO, "Richiesta completata", extra={
+            "method": "GET",
+            "path": "/items/7f3c2a9e",
+            "query_params": "",
+            "client_host": "10.0.0.1",
+            "status_code": 200,
+            "duration_ms": 3.27,
+        }),
+        record(logging.WARNING, "Configurazione caricata", extra={
+            "api_key": "valore-segreto",
+            "token": "valore-segreto",
+            "region": "eu-west-1",
+        }),
+        record(logging.ERROR, "Errore durante la richiesta", extra={"path": "/items"}, exc_info=exc_info),
+    ]
+
+
+def check_output(reference, formatter, records, exact):
+    """Verifica che formatter produca gli stessi campi, nello stesso ordine, di reference."""
+    for record in records:
+        expected = reference.format(record)
+        actual = formatter.format(record)
+        if exact:
+            assert actual == expected, f"output diverso:\n{expected}\n{actual}"
+        else:
+            assert list(json.loads(actual).items()) == list(json.loads(expected).items()), \
+                f"output diverso:\n{expected}\n{actual}"
+
+
+def bench(formatter, records, total, repeat):
+    """Record formattati al secondo (migliore di repeat esecuzioni)."""
+    rounds = max(1, total // len(records))
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for record in records:
+                formatter.format(record)
+        elapsed = time.perf_counter() - start
+        best = max(best, rounds * len(records) / elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=50000, help="Record per esecuzione")
+    parser.add_argument("--repeat", type=int, default=5, help="Esecuzioni per formatter")
+    args = parser.parse_args()
+
+    records = make_records()
+    reference = CustomJsonFormatter('%(timestamp)s %(level)s %(name)s %(message)s', timestamp=True)
+
+    candidates = [("CustomJsonFormatter", reference)]
+    candidates.append(("FastJsonFormatter", FastJsonFormatter()))
+    if orjson is not None:
+        candidates.append(("FastJsonFormatter (compatto, orjson)", FastJsonFormatter(compact=True)))
+    else:
+        print("orjson non installato: formato compatto con la libreria standard\n")
+        candidates.append(("FastJsonFormatter (compatto, json)", FastJsonFormatter(compact=True)))
+
+    for name, formatter in candidates[1:]:
+        check_output(reference, formatter, records, exact=not formatter.compact)
+
+    baseline = None
+    print(f"{'formatter':<36} {'record/s':>12} {'speedup':>8}")
+    for name, formatter in candidates:
+        rate = bench(formatter, records, args.records, args.repeat)
+        baseline = baseline or rate
+        print(f"{name:<36} {rate:>12,.0f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark della serializzazione delle liste di items.
+
+Confronta il percorso attuale (un ItemResponse per riga, serializzazione
+di FastAPI tramite response_model) con le modalità validate e trust di
+ItemSerializer, su pagine da 1k e 10k items. Le richieste passano per
+un'app FastAPI in-process con lo stesso response_model di GET /items,
+dopo aver verificato che il JSON restituito sia identico.
+
+Uso:
+    python benchmarks/bench_serialization.py [--sizes 1000 10000] [--repeat 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.models import ItemsListResponse  # noqa: E402
+from app.serialization import SERIALIZATION_MODES, ItemSerializer, orjson  # noqa: E402
+
+
+def make_rows(count):
+    """Righe come restituite da DynamoDB."""
+    return [
+        {
+            "item_id": str(uuid.uuid4()),
+            "name": f"Laptop Dell XPS {i}",
+            "description": "Laptop per sviluppo con 16GB RAM",
+            "tags": ["elettronica", "computer", "lavoro"],
+            "created_at": "2025-02-12T10:30:00.000000",
+            "updated_at": "2025-02-12T10:30:00.000000",
+        }
+        for i in range(count)
+    ]
+
+
+def make_app(rows):
+    """App con un endpoint GET /items/<modalità> per ogni modalità."""
+    app = FastAPI()
+
+    for mode in SERIALIZATION_MODES:
+        serializer = ItemSerializer(mode)
+
+        async def list_items(serializer=serializer):
+            return serializer.page(ItemsListResponse, rows, count=len(rows), next_token=None)
+
+        app.add_api_route(f"/items/{mode}", list_items, response_model=ItemsListResponse)
+
+    return app
+
+
+def bench(client, path, repeat):
+    """Millisecondi per richiesta (mediana e minimo)."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(path)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    return statistics.median(timings), min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="Items per risposta")
+    parser.add_argument("--repeat", type=int, default=20, help="Richieste per modalità")
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("orjson non installato: la modalità trust usa json della libreria standard\n")
+
+    print(f"{'items':>6} {'modalità':<10} {'mediana ms':>11} {'min ms':>9} {'speedup':>8}")
+    for size in args.sizes:
+        client = TestClient(make_app(make_rows(size)))
+
+        bodies = {mode: client.get(f"/items/{mode}").content for mode in SERIALIZATION_MODES}
+        assert len(set(bodies.values())) == 1, "JSON diverso tra le modalità"
+
+        baseline = None
+        for mode in SERIALIZATION_MODES:
+            median, best = bench(client, f"/items/{mode}", args.repeat)
+            baseline = baseline or median
+            print(f"{size:>6} {mode:<10} {median:>11.2f} {best:>9.2f} {baseline / median:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
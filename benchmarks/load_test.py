@@ -0,0 +1,273 @@
+"""
+Load test riproducibile dell'API.
+
+Avvia l'app FastAPI di app/main.py in-process (httpx + ASGITransport,
+lifespan incluso) contro DynamoDB e Secrets Manager simulati in memoria
+da moto: nessuna chiamata ad AWS, funziona offline.
+
+Per ogni scenario (POST /items, GET /items, GET /items/{item_id}) e per
+ogni livello di concorrenza misura throughput e latenze p50/p95/p99 e
+salva i risultati in JSON. Con --baseline confronta il run con uno
+precedente e termina con codice 1 se uno scenario è peggiorato oltre
+--max-regression.
+
+Uso:
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/load_test.py --concurrency 1 16 64 --requests 2000
+    python benchmarks/load_test.py --baseline benchmarks/results/load-prima.json
+    python benchmarks/load_test.py --env FAST_SERIALIZATION=trust --env ITEM_CACHE_ENABLED=true
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+SCENARIOS = ("create", "list", "get")
+TABLE_NAME = "fastapi-tutorial-items"
+REGION = "eu-west-1"
+
+
+def percentile(sorted_values, p):
+    """Percentile con il metodo nearest-rank."""
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, elapsed):
+    """Statistiche di uno scenario (latenze in millisecondi)."""
+    latencies = sorted(latencies)
+    count = len(latencies)
+    return {
+        "requests": count + errors,
+        "errors": errors,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(count / elapsed, 1) if elapsed else None,
+        "mean_ms": round(sum(latencies) / count, 3) if count else None,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": latencies[-1] if count else None,
+    }
+
+
+async def run_scenario(client, make_request, total, concurrency):
+    """
+    Esegue total richieste con concurrency worker concorrenti.
+
+    Returns:
+        (latenze in ms delle richieste riuscite, numero di errori, durata in s)
+    """
+    latencies = []
+    errors = 0
+    remaining = total
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, url, body = make_request()
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body)
+                ok = response.status_code < 400
+            except Exception:
+                ok = False
+            duration_ms = (time.perf_counter() - start) * 1000
+            if ok:
+                latencies.append(round(duration_ms, 3))
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def make_requests(scenario, rng, item_ids, page_size):
+    """Funzione che genera la prossima richiesta (metodo, url, body) dello scenario."""
+    counter = iter(range(10 ** 9))
+
+    if scenario == "create":
+        def make():
+            n = next(counter)
+            return "POST", "/items", {
+                "name": f"Item di benchmark {n}",
+                "description": "Creato dal load test",
+                "tags": ["benchmark", f"gruppo-{n % 10}"],
+            }
+    elif scenario == "list":
+        def make():
+            return "GET", f"/items?limit={page_size}", None
+    else:
+        def make():
+            return "GET", f"/items/{rng.choice(item_ids)}", None
+    return make
+
+
+async def run(args):
+    import httpx
+    from app.main import app
+
+    logging.getLogger().setLevel(args.log_level)
+
+    rng = random.Random(args.seed)
+    results = []
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            # Dati iniziali per le letture
+            seed = make_requests("create", rng, [], args.page_size)
+            item_ids = []
+            for _ in range(args.seed_items):
+                method, url, body = seed()
+                response = await client.request(method, url, json=body)
+                response.raise_for_status()
+                item_ids.append(response.json()["item_id"])
+
+            for scenario in args.scenarios:
+                for concurrency in args.concurrency:
+                    make = make_requests(scenario, rng, item_ids, args.page_size)
+                    if args.warmup:
+                        await run_scenario(client, make, args.warmup, concurrency)
+                    latencies, errors, elapsed = await run_scenario(
+                        client, make, args.requests, concurrency
+                    )
+                    stats = summarize(latencies, errors, elapsed)
+                    results.append({"scenario": scenario, "concurrency": concurrency, **stats})
+                    print(
+                        f"{scenario:<7} c={concurrency:<4} {stats['throughput_rps']:>9} req/s  "
+                        f"p50 {stats['p50_ms']:>8} ms  p95 {stats['p95_ms']:>8} ms  "
+                        f"p99 {stats['p99_ms']:>8} ms  errori {errors}"
+                    )
+
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, max_regression):
+    """
+    Confronta throughput e p95 con un run precedente.
+
+    Returns:
+        Lista delle regressioni oltre la soglia
+    """
+    with open(baseline_path) as f:
+        baseline = {(r["scenario"], r["concurrency"]): r for r in json.load(f)["results"]}
+
+    regressions = []
+    print(f"\nConfronto con {baseline_path}")
+    for result in results:
+        before = baseline.get((result["scenario"], result["concurrency"]))
+        if not before or not before["throughput_rps"] or not before["p95_ms"]:
+            continue
+        rps_change = result["throughput_rps"] / before["throughput_rps"] - 1
+        p95_change = result["p95_ms"] / before["p95_ms"] - 1
+        flag = ""
+        if rps_change < -max_regression or p95_change > max_regression:
+            flag = "  REGRESSIONE"
+            regressions.append(result)
+        print(
+            f"{result['scenario']:<7} c={result['concurrency']:<4} "
+            f"throughput {rps_change:+.1%}  p95 {p95_change:+.1%}{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64],
+                        help="Richieste concorrenti (uno scenario per valore)")
+    parser.add_argument("--requests", type=int, default=1000, help="Richieste misurate per scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="Richieste di riscaldamento non misurate")
+    parser.add_argument("--seed-items", type=int, default=500, help="Items creati prima delle letture")
+    parser.add_argument("--page-size", type=int, default=100, help="limit di GET /items")
+    parser.add_argument("--seed", type=int, default=42, help="Seed per le richieste casuali")
+    parser.add_argument("--env", action="append", default=[], metavar="CHIAVE=VALORE",
+                        help="Variabile di configurazione dell'app (ripetibile)")
+    parser.add_argument("--log-level", default="WARNING", help="Livello di log dell'app durante il test")
+    parser.add_argument("--output", help="File JSON dei risultati (default: benchmarks/results/load-<data>.json)")
+    parser.add_argument("--baseline", help="Risultati di un run precedente da confrontare")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Peggioramento massimo tollerato di throughput/p95 (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # Credenziali fittizie: moto intercetta tutte le chiamate boto3
+    for key, value in (
+        ("AWS_ACCESS_KEY_ID", "testing"),
+        ("AWS_SECRET_ACCESS_KEY", "testing"),
+        ("AWS_SESSION_TOKEN", "testing"),
+        ("AWS_DEFAULT_REGION", REGION),
+    ):
+        os.environ[key] = value
+    os.environ["AWS_REGION"] = REGION
+    os.environ["DYNAMODB_TABLE_NAME"] = TABLE_NAME
+    env = dict(item.split("=", 1) for item in args.env)
+    os.environ.update(env)
+
+    import boto3
+    from moto import mock_aws
+
+    with mock_aws():
+        boto3.client("dynamodb", region_name=REGION).create_table(
+            TableName=TABLE_NAME,
+            AttributeDefinitions=[{"AttributeName": "item_id", "AttributeType": "S"}],
+            KeySchema=[{"AttributeName": "item_id", "KeyType": "HASH"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        results = asyncio.run(run(args))
+
+    report = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "seed_items": args.seed_items,
+            "page_size": args.page_size,
+            "seed": args.seed,
+            "env": env,
+        },
+        "results": results,
+    }
+
+    output = args.output or os.path.join(
+        ROOT, "benchmarks", "results",
+        f"load-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nRisultati salvati in {output}")
+
+    if args.baseline and compare(results, args.baseline, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
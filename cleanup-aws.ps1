@@ -27,6 +27,7 @@ if (-not $AWS_ACCOUNT_ID) {
     exit 1
 }
 if (-not $TABLE_NAME) { $TABLE_NAME = "fastapi-tutorial-items" }
+if (-not $TAG_TABLE_NAME) { $TAG_TABLE_NAME = "fastapi-tutorial-item-tags" }
 if (-not $SECRET_NAME) { $SECRET_NAME = "fastapi-tutorial-secrets" }
 if (-not $KMS_KEY_ALIAS) { $KMS_KEY_ALIAS = "alias/fastapi-tutorial-key" }
 if (-not $ECR_REPO_NAME) { $ECR_REPO_NAME = "fastapi-docker-example" }
@@ -43,6 +44,7 @@ Write-Host "Questo script eliminera' TUTTE le seguenti risorse:" -ForegroundColo
 Write-Host "  - App Runner Service: $APP_RUNNER_SERVICE_NAME"
 Write-Host "  - ECR Repository: $ECR_REPO_NAME (e tutte le immagini)"
 Write-Host "  - DynamoDB Table: $TABLE_NAME (e tutti i dati)"
+Write-Host "  - DynamoDB Table: $TAG_TABLE_NAME (indice dei tag)"
 Write-Host "  - Secret: $SECRET_NAME"
 Write-Host "  - KMS Key: $KMS_KEY_ALIAS (scheduled deletion)"
 Write-Host "  - IAM Role: $IAM_ROLE_NAME"
@@ -106,6 +108,18 @@ try {
 } catch {
     Write-Host "  AVVISO Errore durante eliminazione DynamoDB Table" -ForegroundColor Yellow
 }
+try {
+    $TAG_TABLE_EXISTS = aws dynamodb describe-table --table-name $TAG_TABLE_NAME --region $AWS_REGION --profile $AWS_PROFILE --query 'Table.TableName' --output text 2>$null
+    
+    if ($TAG_TABLE_EXISTS -and $TAG_TABLE_EXISTS -ne "") {
+        aws dynamodb delete-table --table-name $TAG_TABLE_NAME --region $AWS_REGION --profile $AWS_PROFILE | Out-Null
+        Write-Host "  OK DynamoDB Table indice dei tag eliminata" -ForegroundColor Green
+    } else {
+        Write-Host "  AVVISO DynamoDB Table indice dei tag non trovata" -ForegroundColor Yellow
+    }
+} catch {
+    Write-Host "  AVVISO Errore durante eliminazione DynamoDB Table indice dei tag" -ForegroundColor Yellow
+}
 
 # 4. Elimina Secret
 Write-Host "[4/8] Eliminazione Secret..." -ForegroundColor Yellow
@@ -25,6 +25,7 @@ if [ -z "$AWS_ACCOUNT_ID" ]; then
     exit 1
 fi
 TABLE_NAME=${TABLE_NAME:-fastapi-tutorial-items}
+TAG_TABLE_NAME=${TAG_TABLE_NAME:-fastapi-tutorial-item-tags}
 SECRET_NAME=${SECRET_NAME:-fastapi-tutorial-secrets}
 KMS_KEY_ALIAS=${KMS_KEY_ALIAS:-alias/fastapi-tutorial-key}
 ECR_REPO_NAME=${ECR_REPO_NAME:-fastapi-docker-example}
@@ -41,6 +42,7 @@ echo -e "${YELLOW}Questo script eliminerà TUTTE le seguenti risorse:${NC}"
 echo "  - App Runner Service: $APP_RUNNER_SERVICE_NAME"
 echo "  - ECR Repository: $ECR_REPO_NAME (e tutte le immagini)"
 echo "  - DynamoDB Table: $TABLE_NAME (e tutti i dati)"
+echo "  - DynamoDB Table: $TAG_TABLE_NAME (indice dei tag)"
 echo "  - Secret: $SECRET_NAME"
 echo "  - KMS Key: $KMS_KEY_ALIAS (scheduled deletion)"
 echo "  - IAM Role: $IAM_ROLE_NAME"
@@ -114,6 +116,22 @@ else
     echo -e "${YELLOW}⚠${NC}  DynamoDB Table non trovata"
 fi
 
+TAG_TABLE_EXISTS=$(aws dynamodb describe-table \
+  --table-name $TAG_TABLE_NAME \
+  --region $AWS_REGION \
+  --profile $AWS_PROFILE \
+  --query 'Table.TableName' --output text 2>/dev/null || echo "")
+
+if [ -n "$TAG_TABLE_EXISTS" ]; then
+    aws dynamodb delete-table \
+      --table-name $TAG_TABLE_NAME \
+      --region $AWS_REGION \
+      --profile $AWS_PROFILE > /dev/null
+    echo -e "${GREEN}✓${NC} DynamoDB Table indice dei tag eliminata"
+else
+    echo -e "${YELLOW}⚠${NC}  DynamoDB Table indice dei tag non trovata"
+fi
+
 # 4. Elimina Secret
 echo -e "${YELLOW}[4/7]${NC} Eliminazione Secret..."
 SECRET_EXISTS=$(aws secretsmanager describe-secret \
@@ -28,6 +28,8 @@ if (-not $AWS_ACCOUNT_ID) {
     exit 1
 }
 if (-not $TABLE_NAME) { $TABLE_NAME = "fastapi-tutorial-items" }
+if (-not $TAG_TABLE_NAME) { $TAG_TABLE_NAME = "fastapi-tutorial-item-tags" }
+if (-not $CREATED_INDEX_NAME) { $CREATED_INDEX_NAME = "created-at-index" }
 if (-not $SECRET_NAME) { $SECRET_NAME = "fastapi-tutorial-secrets" }
 if (-not $KMS_KEY_ALIAS) { $KMS_KEY_ALIAS = "alias/fastapi-tutorial-key" }
 if (-not $ECR_REPO_NAME) { $ECR_REPO_NAME = "fastapi-docker-example" }
@@ -124,7 +126,8 @@ try {
 
 if ([string]::IsNullOrWhiteSpace($TABLE_EXISTS)) {
     Write-Host "Creazione tabella DynamoDB..."
-    aws dynamodb create-table --table-name $TABLE_NAME --attribute-definitions AttributeName=item_id,AttributeType=S --key-schema AttributeName=item_id,KeyType=HASH --billing-mode PAY_PER_REQUEST --region $AWS_REGION --profile $AWS_PROFILE | Out-Null
+    # GSI per data di creazione: partizione created_shard, ordinamento created_at
+    aws dynamodb create-table --table-name $TABLE_NAME --attribute-definitions AttributeName=item_id,AttributeType=S AttributeName=created_shard,AttributeType=N AttributeName=created_at,AttributeType=S --key-schema AttributeName=item_id,KeyType=HASH --global-secondary-indexes "IndexName=$CREATED_INDEX_NAME,KeySchema=[{AttributeName=created_shard,KeyType=HASH},{AttributeName=created_at,KeyType=RANGE}],Projection={ProjectionType=ALL}" --billing-mode PAY_PER_REQUEST --region $AWS_REGION --profile $AWS_PROFILE | Out-Null
     
     Write-Host "Attesa che la tabella sia attiva..."
     aws dynamodb wait table-exists --table-name $TABLE_NAME --region $AWS_REGION --profile $AWS_PROFILE
@@ -134,6 +137,24 @@ if ([string]::IsNullOrWhiteSpace($TABLE_EXISTS)) {
 else {
     Write-Host "AVVISO Tabella DynamoDB gia esistente: $TABLE_NAME" -ForegroundColor Yellow
 }
+
+# Indice dei tag per GET /items?tag=... (una riga per coppia tag, item_id)
+try {
+    $TAG_TABLE_EXISTS = aws dynamodb describe-table --table-name $TAG_TABLE_NAME --region $AWS_REGION --profile $AWS_PROFILE --query 'Table.TableName' --output text 2>$null
+} catch {
+    $TAG_TABLE_EXISTS = $null
+}
+
+if ([string]::IsNullOrWhiteSpace($TAG_TABLE_EXISTS)) {
+    Write-Host "Creazione tabella indice dei tag..."
+    aws dynamodb create-table --table-name $TAG_TABLE_NAME --attribute-definitions AttributeName=tag,AttributeType=S AttributeName=item_id,AttributeType=S --key-schema AttributeName=tag,KeyType=HASH AttributeName=item_id,KeyType=RANGE --billing-mode PAY_PER_REQUEST --region $AWS_REGION --profile $AWS_PROFILE | Out-Null
+    aws dynamodb wait table-exists --table-name $TAG_TABLE_NAME --region $AWS_REGION --profile $AWS_PROFILE
+    
+    Write-Host "OK Tabella indice dei tag creata: $TAG_TABLE_NAME" -ForegroundColor Green
+}
+else {
+    Write-Host "AVVISO Tabella indice dei tag gia esistente: $TAG_TABLE_NAME" -ForegroundColor Yellow
+}
 Write-Host ""
 
 # Step 4: Crea IAM Policy
@@ -157,11 +178,18 @@ if ([string]::IsNullOrWhiteSpace($POLICY_EXISTS)) {
       "Action": [
         "dynamodb:PutItem",
         "dynamodb:GetItem",
+        "dynamodb:BatchGetItem",
         "dynamodb:Scan",
         "dynamodb:DeleteItem",
+        "dynamodb:BatchWriteItem",
+        "dynamodb:Query",
         "dynamodb:DescribeTable"
       ],
-      "Resource": "arn:aws:dynamodb:${AWS_REGION}:${AWS_ACCOUNT_ID}:table/${TABLE_NAME}"
+      "Resource": [
+        "arn:aws:dynamodb:${AWS_REGION}:${AWS_ACCOUNT_ID}:table/${TABLE_NAME}",
+        "arn:aws:dynamodb:${AWS_REGION}:${AWS_ACCOUNT_ID}:table/${TABLE_NAME}/index/*",
+        "arn:aws:dynamodb:${AWS_REGION}:${AWS_ACCOUNT_ID}:table/${TAG_TABLE_NAME}"
+      ]
     },
     {
       "Effect": "Allow",
@@ -318,6 +346,8 @@ if ([string]::IsNullOrWhiteSpace($SERVICE_EXISTS)) {
         "RuntimeEnvironmentVariables": {
           "AWS_REGION": "${AWS_REGION}",
           "DYNAMODB_TABLE_NAME": "${TABLE_NAME}",
+          "DYNAMODB_TAG_TABLE_NAME": "${TAG_TABLE_NAME}",
+          "DYNAMODB_CREATED_INDEX_NAME": "${CREATED_INDEX_NAME}",
           "SECRET_NAME": "${SECRET_NAME}",
           "APP_NAME": "FastAPI AWS Tutorial",
           "DEBUG": "false"
@@ -373,6 +403,7 @@ Write-Host "Risorse create:"
 Write-Host "  OK KMS Key: $KMS_KEY_ALIAS"
 Write-Host "  OK Secret: $SECRET_NAME"
 Write-Host "  OK DynamoDB Table: $TABLE_NAME"
+Write-Host "  OK DynamoDB Table (indice tag): $TAG_TABLE_NAME"
 Write-Host "  OK IAM Policy: $IAM_POLICY_NAME"
 Write-Host "  OK IAM Role: $IAM_ROLE_NAME"
 Write-Host "  OK ECR Repository: $ECR_REPO_NAME"
@@ -27,6 +27,8 @@ if [ -z "$AWS_ACCOUNT_ID" ]; then
     exit 1
 fi
 TABLE_NAME=${TABLE_NAME:-fastapi-tutorial-items}
+TAG_TABLE_NAME=${TAG_TABLE_NAME:-fastapi-tutorial-item-tags}
+CREATED_INDEX_NAME=${CREATED_INDEX_NAME:-created-at-index}
 SECRET_NAME=${SECRET_NAME:-fastapi-tutorial-secrets}
 KMS_KEY_ALIAS=${KMS_KEY_ALIAS:-alias/fastapi-tutorial-key}
 ECR_REPO_NAME=${ECR_REPO_NAME:-fastapi-docker-example}
@@ -134,10 +136,13 @@ TABLE_EXISTS=$(aws dynamodb describe-table \
 
 if [ -z "$TABLE_EXISTS" ]; then
     echo "Creazione tabella DynamoDB..."
+    # GSI per data di creazione: partizione created_shard, ordinamento created_at
     aws dynamodb create-table \
       --table-name $TABLE_NAME \
       --attribute-definitions AttributeName=item_id,AttributeType=S \
+        AttributeName=created_shard,AttributeType=N AttributeName=created_at,AttributeType=S \
       --key-schema AttributeName=item_id,KeyType=HASH \
+      --global-secondary-indexes "IndexName=${CREATED_INDEX_NAME},KeySchema=[{AttributeName=created_shard,KeyType=HASH},{AttributeName=created_at,KeyType=RANGE}],Projection={ProjectionType=ALL}" \
       --billing-mode PAY_PER_REQUEST \
       --region $AWS_REGION \
       --profile $AWS_PROFILE > /dev/null
@@ -152,6 +157,33 @@ if [ -z "$TABLE_EXISTS" ]; then
 else
     echo -e "${YELLOW}⚠${NC}  Tabella DynamoDB già esistente: $TABLE_NAME"
 fi
+
+# Indice dei tag per GET /items?tag=... (una riga per coppia tag, item_id)
+TAG_TABLE_EXISTS=$(aws dynamodb describe-table \
+  --table-name $TAG_TABLE_NAME \
+  --region $AWS_REGION \
+  --profile $AWS_PROFILE \
+  --query 'Table.TableName' --output text 2>/dev/null || echo "")
+
+if [ -z "$TAG_TABLE_EXISTS" ]; then
+    echo "Creazione tabella indice dei tag..."
+    aws dynamodb create-table \
+      --table-name $TAG_TABLE_NAME \
+      --attribute-definitions AttributeName=tag,AttributeType=S AttributeName=item_id,AttributeType=S \
+      --key-schema AttributeName=tag,KeyType=HASH AttributeName=item_id,KeyType=RANGE \
+      --billing-mode PAY_PER_REQUEST \
+      --region $AWS_REGION \
+      --profile $AWS_PROFILE > /dev/null
+    
+    aws dynamodb wait table-exists \
+      --table-name $TAG_TABLE_NAME \
+      --region $AWS_REGION \
+      --profile $AWS_PROFILE
+    
+    echo -e "${GREEN}✓${NC} Tabella indice dei tag creata: $TAG_TABLE_NAME"
+else
+    echo -e "${YELLOW}⚠${NC}  Tabella indice dei tag già esistente: $TAG_TABLE_NAME"
+fi
 echo ""
 
 # Step 4: Crea IAM Policy
@@ -172,11 +204,18 @@ if [ -z "$POLICY_EXISTS" ]; then
       "Action": [
         "dynamodb:PutItem",
         "dynamodb:GetItem",
+        "dynamodb:BatchGetItem",
         "dynamodb:Scan",
         "dynamodb:DeleteItem",
+        "dynamodb:BatchWriteItem",
+        "dynamodb:Query",
         "dynamodb:DescribeTable"
       ],
-      "Resource": "arn:aws:dynamodb:${AWS_REGION}:${AWS_ACCOUNT_ID}:table/${TABLE_NAME}"
+      "Resource": [
+        "arn:aws:dynamodb:${AWS_REGION}:${AWS_ACCOUNT_ID}:table/${TABLE_NAME}",
+        "arn:aws:dynamodb:${AWS_REGION}:${AWS_ACCOUNT_ID}:table/${TABLE_NAME}/index/*",
+        "arn:aws:dynamodb:${AWS_REGION}:${AWS_ACCOUNT_ID}:table/${TAG_TABLE_NAME}"
+      ]
     },
     {
       "Effect": "Allow",
@@ -362,6 +401,8 @@ if [ -z "$SERVICE_EXISTS" ]; then
         "RuntimeEnvironmentVariables": {
           "AWS_REGION": "${AWS_REGION}",
           "DYNAMODB_TABLE_NAME": "${TABLE_NAME}",
+          "DYNAMODB_TAG_TABLE_NAME": "${TAG_TABLE_NAME}",
+          "DYNAMODB_CREATED_INDEX_NAME": "${CREATED_INDEX_NAME}",
           "SECRET_NAME": "${SECRET_NAME}",
           "APP_NAME": "FastAPI AWS Tutorial",
           "DEBUG": "false"
@@ -428,6 +469,7 @@ echo "Risorse create:"
 echo "  ✓ KMS Key: $KMS_KEY_ALIAS"
 echo "  ✓ Secret: $SECRET_NAME"
 echo "  ✓ DynamoDB Table: $TABLE_NAME"
+echo "  ✓ DynamoDB Table (indice tag): $TAG_TABLE_NAME"
 echo "  ✓ IAM Policy: $IAM_POLICY_NAME"
 echo "  ✓ IAM Role: $IAM_ROLE_NAME"
 echo "  ✓ ECR Repository: $ECR_REPO_NAME"